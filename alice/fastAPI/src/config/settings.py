@@ -32,9 +32,22 @@ class Settings(BaseSettings):
     UPLOAD_DIR: Path = Path("./uploads")
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
 
+    # 스트리밍 분석 (/analyze/stream) 설정
+    SSE_KEEPALIVE_SECONDS: float = 15.0  # 이벤트가 없을 때 keep-alive 주석 전송 간격 (LB 유휴 타임아웃보다 짧게)
+
+    # 비동기 분석 작업 (/analyze/jobs) 설정
+    ANALYZE_MAX_WORKERS: int = 2  # 동시에 실행할 분석 파이프라인 수
+    ANALYZE_JOB_TTL_SECONDS: int = 3600  # 완료된 작업 결과 보관 시간
+
     # 스토리지 설정
     STORAGE_MODE: str = "csv"  # "csv" or "oracle"
 
+    # 분석 디버그 산출물 (추출 텍스트 덤프, 결과 CSV/JSON) 저장 방식
+    # "disabled" (운영 권장) | "background" (기존 위치에 백그라운드 저장) | "archive" (분석 1회당 zip 1개)
+    ARTIFACT_SINK: str = "background"
+    ARTIFACT_DIR: Path = Path("./artifacts")  # archive 모드 저장 경로
+    ARTIFACT_MAX_PENDING: int = 8  # 대기 중인 저장 요청 상한 (초과 시 해당 분석의 산출물은 저장 생략)
+
     # Oracle 설정 (필요시)
     ORACLE_USER: Optional[str] = None
     ORACLE_PASSWORD: Optional[str] = None
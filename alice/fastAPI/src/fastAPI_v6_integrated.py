@@ -4,7 +4,9 @@ import httpx
 load_dotenv()
 
 
+import asyncio
 import json
+import threading
 import uuid
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel # ChatRequest, ResumeRequest 정의를 위해 필요
@@ -20,7 +22,7 @@ project_root = Path(__file__).resolve().parent.parent.parent.parent
 sys.path.append(str(project_root))
 
 from fastapi import FastAPI, File, Form, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.concurrency import run_in_threadpool
 from typing import List
 from fastapi.middleware.cors import CORSMiddleware
@@ -51,6 +53,13 @@ from config import get_settings
 
 # v6_rag_real 모듈 import (프로덕션 전용)
 from v6_rag_real import create_batch_graph
+from v6_rag_real.artifacts import create_artifact_sink
+from v6_rag_real.blobs import blob_store, release_file_blobs
+from v6_rag_real.embeddings import warmup_query_embeddings
+from v6_rag_real.page_images import release_page_images
+from v6_rag_real.progress import summarize_node_update
+from v6_rag_real.jobs import AnalysisJobManager, analysis_job_key
+from v6_rag_real.vectordb import project_analysis_lock, project_collection_name, release_collection
 
 load_dotenv()
 settings = get_settings()
@@ -62,7 +71,15 @@ DB_PATH = str(NEW_DB_PATH)
 
 # 그래프 생성 (설계도만 가져옴)
 proposal_graph = create_proposal_graph()
-batch_app = create_batch_graph()
+# 디버그 산출물은 Settings.ARTIFACT_SINK에 따라 백그라운드 저장 또는 생략 (응답을 막지 않음)
+artifact_sink = create_artifact_sink(settings.ARTIFACT_SINK, settings.ARTIFACT_DIR, settings.ARTIFACT_MAX_PENDING)
+batch_app = create_batch_graph(artifact_sink=artifact_sink)
+
+# /analyze/jobs 비동기 분석 작업 큐 (동시 분석 수 제한 + 중복 요청 제거)
+analysis_jobs = AnalysisJobManager(
+    max_workers=settings.ANALYZE_MAX_WORKERS,
+    ttl_seconds=settings.ANALYZE_JOB_TTL_SECONDS
+)
 
 # Request 모델들
 class ResumeRequest(BaseModel):
@@ -107,6 +124,144 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.on_event("startup")
+async def warmup_analysis_queries():
+    """Feature/양식/목차 고정 쿼리 임베딩을 1회 배치로 선계산 (분석 요청마다 재호출 방지)"""
+    await run_in_threadpool(warmup_query_embeddings)
+
+
+@app.on_event("shutdown")
+async def shutdown_analysis_jobs():
+    """대기 중인 분석 작업 취소 (실행 중인 작업은 끝까지 진행) + 업로드 원본 저장소 정리 + 남은 산출물 기록"""
+    analysis_jobs.shutdown(wait=False)
+    blob_store.close()
+    artifact_sink.close()
+
+
+# ========================================
+# /analyze 공통 헬퍼
+# ========================================
+
+async def _read_uploaded_files(files: List[UploadFile], folders: List[str]) -> List[Dict[str, Any]]:
+    """
+    업로드 파일 → LangGraph 입력용 파일 리스트 (원본은 업로드 저장소에, State에는 핸들만)
+
+    Backend가 이미 파일을 저장했으므로, FastAPI는 분석 중에만 쓰는 원본을
+    업로드 저장소(blob_store)에 두고 SHA-256 핸들을 LangGraph로 전달
+    (원본은 목차 추출 후 release_file_payloads 노드 또는 요청 종료 시 해제)
+
+    Backend가 보낸 files[i]와 folders[i]는 1:1 매칭됨
+    예시:
+      files[0] = UploadFile("공고.pdf")      folders[0] = "1"
+      files[1] = UploadFile("붙임1.hwp")     folders[1] = "2"
+      files[2] = UploadFile("붙임2.xlsx")    folders[2] = "2"
+    """
+    if len(files) != len(folders):
+        raise ValueError(
+            f"파일 개수({len(files)})와 폴더 개수({len(folders)})가 일치하지 않습니다."
+        )
+
+    saved_files = []
+    try:
+        for i, file in enumerate(files):
+            folder_id = int(folders[i])  # "1" → 1, "2" → 2
+
+            # UploadFile → 업로드 저장소 (스트림을 블록 단위로 기록, 전체 bytes를 메모리에 올리지 않음)
+            handle = await run_in_threadpool(blob_store.put_stream, file.file)
+
+            saved_files.append({
+                "blob": handle,              # 업로드 저장소 핸들 (SHA-256)
+                "filename": file.filename,   # 원본 파일명
+                "folder": folder_id          # 1=공고, 2=첨부서류
+            })
+
+            folder_type = "공고" if folder_id == 1 else "첨부서류"
+            file_size_kb = blob_store.size(handle) / 1024
+            print(f"  [{i}] {file.filename} → 폴더 {folder_id} ({folder_type}) - {file_size_kb:.1f}KB")
+    except Exception:
+        # 일부만 저장된 경우 저장분 해제 후 에러 전달
+        release_file_blobs(saved_files)
+        raise
+
+    print(f"✅ 파일 변환 완료: {len(saved_files)}개")
+    return saved_files
+
+
+def _build_analysis_state(saved_files: List[Dict[str, Any]], userid: str, projectidx: int) -> Dict[str, Any]:
+    """LangGraph 분석 초기 상태"""
+    return {
+        "files": saved_files,
+        "user_id": userid,
+        "project_idx": projectidx,
+        "documents": [],
+        "all_chunks": [],
+        "chunk_duplicates": {},
+        "all_embeddings": None,
+        "embedding_model": None,
+        "embedding_cache_stats": {},
+        "chroma_client": None,
+        "chroma_collection": None,
+        "vector_db_path": "",
+        "vector_collection_name": project_collection_name(projectidx),
+        "extracted_features": [],
+        "attachment_templates": [],
+        "csv_paths": None,
+        "analysis_id": f"{projectidx}_{uuid.uuid4().hex[:12]}",
+        "oracle_ids": None,
+        "response_data": {},
+        "status": "initialized",
+        "errors": []
+    }
+
+
+def _create_draft_file(userid: str, projectidx: int) -> str:
+    """
+    초안 파일(빈 JSON) 생성 후 프론트에서 사용할 API 경로 반환
+    """
+    # 1. BASE_DIR: 프로젝트 최상위 root(final) 계산
+    BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+
+    # 2. 실제 생성 경로
+    real_dir = os.path.join(BASE_DIR, "backend", "documents", str(userid), str(projectidx))
+    real_path = os.path.join(real_dir, "초안.json")
+
+    # 3. 폴더 생성
+    os.makedirs(real_dir, exist_ok=True)
+
+    # 4. 파일 생성 (빈 JSON)
+    with open(real_path, "w", encoding="utf-8") as f:
+        json.dump({}, f, ensure_ascii=False, indent=2)
+
+    # 5. API 응답용 URL 경로 (프론트에서 사용)
+    api_path = f"/documents/{userid}/{projectidx}/초안.json"
+
+    print('api_path: ', api_path)
+    return api_path
+
+
+def _invoke_analysis(state: Dict[str, Any]) -> Dict[str, Any]:
+    """batch_app.invoke (persistent 모드는 같은 프로젝트 분석을 직렬화)"""
+    with project_analysis_lock(state['project_idx']):
+        return batch_app.invoke(state)
+
+
+def _release_analysis_resources(state: Optional[Dict[str, Any]], result: Optional[Dict[str, Any]] = None) -> None:
+    """
+    요청 단위 자원 해제 (Vision API용 페이지 이미지 캐시, memory 모드 VectorDB 컬렉션, 남은 업로드 원본)
+
+    분석 성공/실패와 관계없이 finally에서 호출 (실패하면 result 없이 초기 state의 컬렉션 이름/업로드 핸들로 해제)
+    """
+    if not state:
+        return
+    result = result or {}
+    doc_keys = {doc['file_hash'] for doc in result.get('documents', []) if doc.get('file_hash')}
+    doc_keys.update(file_info['blob'] for file_info in state.get('files', []) if file_info.get('blob'))
+    release_page_images(doc_keys)
+    release_collection(state.get('vector_collection_name'))
+    release_file_blobs(state.get('files', []))
+
+
 # ========================================
 # API 엔드포인트
 # ========================================
@@ -143,68 +298,22 @@ async def analyze_documents(
 
 
 
+    saved_files: List[Dict[str, Any]] = []
+    state: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
     try:
         # ========================================
         # 1단계: Backend에서 받은 데이터 검증
         # ========================================
-        if len(files) != len(folders):
-            raise ValueError(
-                f"파일 개수({len(files)})와 폴더 개수({len(folders)})가 일치하지 않습니다."
-            )
-
         print(f"📥 수신 데이터: userid={userid}, projectidx={projectidx}")
         print(f"📁 파일 개수: {len(files)}개")
 
         # ========================================
-        # 2단계: 파일 바이트 변환 (디스크 저장 없이 메모리에서 처리)
+        # 2단계: 업로드 파일 → 업로드 저장소 핸들 (State에는 원본 bytes를 넣지 않음)
         # ========================================
-        # Backend가 이미 파일을 저장했으므로, FastAPI는 저장하지 않고
-        # 바이트 데이터만 추출하여 LangGraph로 전달
-        #
-        # Backend가 보낸 files[i]와 folders[i]는 1:1 매칭됨
-        # 예시:
-        #   files[0] = UploadFile("공고.pdf")      folders[0] = "1"
-        #   files[1] = UploadFile("붙임1.hwp")     folders[1] = "2"
-        #   files[2] = UploadFile("붙임2.xlsx")    folders[2] = "2"
-
-        saved_files = []
-        for i, file in enumerate(files):
-            folder_id = int(folders[i])  # "1" → 1, "2" → 2
+        saved_files = await _read_uploaded_files(files, folders)
 
-            # UploadFile → 바이트 데이터 변환
-            file_bytes = await file.read()
-
-            saved_files.append({
-                "bytes": file_bytes,         # 파일 바이너리 데이터
-                "filename": file.filename,   # 원본 파일명
-                "folder": folder_id          # 1=공고, 2=첨부서류
-            })
-
-            folder_type = "공고" if folder_id == 1 else "첨부서류"
-            file_size_kb = len(file_bytes) / 1024
-            print(f"  [{i}] {file.filename} → 폴더 {folder_id} ({folder_type}) - {file_size_kb:.1f}KB")
-
-        print(f"✅ 파일 변환 완료: {len(saved_files)}개")
-
-        state = {
-            "files": saved_files,
-            "user_id": userid,
-            "project_idx": projectidx,
-            "documents": [],
-            "all_chunks": [],
-            "all_embeddings": None,
-            "embedding_model": None,
-            "chroma_client": None,
-            "chroma_collection": None,
-            "vector_db_path": "",
-            "extracted_features": [],
-            "attachment_templates": [],
-            "csv_paths": None,
-            "oracle_ids": None,
-            "response_data": {},
-            "status": "initialized",
-            "errors": []
-        }
+        state = _build_analysis_state(saved_files, userid, projectidx)
 
         # ========================================
         # 4단계: LangGraph AI 분석 실행
@@ -214,33 +323,14 @@ async def analyze_documents(
         # 2. folder=2 파일들 → 첨부서류 분석 (양식 추출)
         # 3. 사용자 입력 폼 자동 생성
         print(f"🚀 LangGraph 분석 시작: project_idx={projectidx}")
-        result = await run_in_threadpool(batch_app.invoke, state)
+        result = await run_in_threadpool(_invoke_analysis, state)
         print(f"✅ LangGraph 분석 완료")
 
         # ========================================
         # 5단계 LLM 호출 → JSON Plan 생성 [분리함]
         # ========================================
+        api_path = _create_draft_file(userid, projectidx)
 
-        # 1. BASE_DIR: 프로젝트 최상위 root(final) 계산
-        BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
-
-        # 2. 실제 생성 경로
-        real_dir = os.path.join(BASE_DIR, "backend", "documents", str(userid), str(projectidx))
-        real_path = os.path.join(real_dir, "초안.json")
-
-        # 3. 폴더 생성
-        os.makedirs(real_dir, exist_ok=True)
-
-        # 4. 파일 생성 (빈 JSON)
-        with open(real_path, "w", encoding="utf-8") as f:
-            json.dump({}, f, ensure_ascii=False, indent=2)
-
-        # 5. API 응답용 URL 경로 (프론트에서 사용)
-        api_path = f"/documents/{userid}/{projectidx}/초안.json"
-
-        print('api_path: ', api_path)
-
-       
         # ========================================
         # 6단계: 분석 결과 반환
         # ========================================
@@ -262,6 +352,243 @@ async def analyze_documents(
                 "detail": str(e)
             }
         )
+    finally:
+        # 성공/실패와 관계없이 요청 단위 자원 해제 (이미 해제된 원본은 건너뜀, state 생성 전 실패면 업로드만 해제)
+        _release_analysis_resources(state, result)
+        release_file_blobs(saved_files)
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def _analysis_event_stream(state: Dict[str, Any], userid: str, projectidx: int):
+    """
+    batch_app.stream() 진행 상황 → SSE 이벤트
+
+    이벤트 종류:
+    - progress: 노드 완료 요약 (추출 문서/페이지 수, 청크 수, 임베딩 캐시, Feature k/N, 목차 출처 등)
+    - result: 최종 응답 (/analyze 응답과 동일 + filePath)
+    - error: 분석 실패
+    이벤트가 없는 동안에는 keep-alive 주석을 보내 로드밸런서 유휴 연결 종료를 방지
+    클라이언트 연결이 끊기면 (GeneratorExit/CancelledError) 다음 스트림 청크에서 그래프 실행을 중단
+    요청 단위 자원(업로드 원본 등)은 그래프 워커가 끝난 뒤에만 해제 (연결 종료 시에는 워커가 해제)
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+    release_lock = threading.Lock()
+    worker_finished = False
+    final_state: Dict[str, Any] = {}  # 워커 스레드만 갱신, 생성기는 워커 종료 후 읽음
+
+    def run_graph():
+        # 동기 그래프를 스레드에서 실행하고 스트림 청크를 이벤트 루프로 전달
+        nonlocal worker_finished
+        try:
+            with project_analysis_lock(state['project_idx']):
+                for mode, chunk in batch_app.stream(state, stream_mode=["updates", "custom"]):
+                    if cancelled.is_set():
+                        # 진행 중이던 노드까지만 실행하고 중단 (이후 노드의 OpenAI 호출 생략)
+                        print(f"⏹️  클라이언트 연결 종료 → 분석 중단: project_idx={projectidx}")
+                        break
+                    if mode == "updates":
+                        for update in chunk.values():
+                            if isinstance(update, dict):
+                                final_state.update(update)
+                    loop.call_soon_threadsafe(queue.put_nowait, (mode, chunk))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, ("error", e))
+        finally:
+            # 생성기가 먼저 끝났으면 (연결 종료) 그래프가 멈춘 지금 해제, 아니면 생성기 finally에서 해제
+            with release_lock:
+                worker_finished = True
+                release_here = cancelled.is_set()
+            if release_here:
+                _release_analysis_resources(state, final_state)
+            loop.call_soon_threadsafe(queue.put_nowait, ("done", None))
+
+    print(f"🚀 LangGraph 분석 시작 (스트리밍): project_idx={projectidx}")
+    worker = loop.run_in_executor(None, run_graph)
+
+    failed = False
+    try:
+        while True:
+            try:
+                mode, chunk = await asyncio.wait_for(queue.get(), timeout=settings.SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if mode == "updates":
+                for node, update in chunk.items():
+                    yield _sse_event("progress", summarize_node_update(node, update))
+            elif mode == "custom":
+                yield _sse_event("progress", chunk)
+            elif mode == "error":
+                failed = True
+                print(f"❌ 에러 발생: {str(chunk)}")
+                yield _sse_event("error", {
+                    "status": "error",
+                    "message": "서버 내부 오류가 발생했습니다.",
+                    "detail": str(chunk)
+                })
+            elif mode == "done":
+                break
+
+        await worker
+
+        if not failed:
+            print(f"✅ LangGraph 분석 완료")
+            api_path = await run_in_threadpool(_create_draft_file, userid, projectidx)
+            yield _sse_event("result", {
+                **final_state.get('response_data', {}),
+                "filePath": api_path
+            })
+    except Exception as e:
+        print(f"❌ 에러 발생: {str(e)}")
+        yield _sse_event("error", {
+            "status": "error",
+            "message": "서버 내부 오류가 발생했습니다.",
+            "detail": str(e)
+        })
+    finally:
+        # 정상 종료면 이미 끝난 그래프에는 영향 없음, 연결 종료면 워커가 다음 청크에서 중단
+        # 워커가 아직 실행 중이면 노드가 업로드 원본을 쓰고 있으므로 해제는 워커 finally에 맡김
+        with release_lock:
+            cancelled.set()
+            release_here = worker_finished
+        if release_here:
+            _release_analysis_resources(state, final_state)
+
+
+@app.post("/analyze/stream")
+async def analyze_documents_stream(
+    files: List[UploadFile] = File(...),
+    folders: List[str] = Form(...),
+    userid: str = Form(...),
+    projectidx: int = Form(...)
+):
+    """
+    /analyze 스트리밍 버전 (Server-Sent Events)
+
+    입력은 /analyze와 동일하며, 노드가 끝날 때마다 progress 이벤트를,
+    분석이 끝나면 /analyze 응답과 같은 내용의 result 이벤트를 전송한다.
+    """
+    try:
+        print(f"📥 수신 데이터 (스트리밍): userid={userid}, projectidx={projectidx}")
+        saved_files = await _read_uploaded_files(files, folders)
+    except Exception as e:
+        print(f"❌ 에러 발생: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": "서버 내부 오류가 발생했습니다.",
+                "detail": str(e)
+            }
+        )
+
+    state = _build_analysis_state(saved_files, userid, projectidx)
+    return StreamingResponse(
+        _analysis_event_stream(state, userid, projectidx),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx 버퍼링 비활성화 (이벤트 즉시 전달)
+        }
+    )
+
+def _run_analysis_job(state: Dict[str, Any], userid: str, projectidx: int) -> Dict[str, Any]:
+    """작업 큐 워커에서 실행되는 분석 (결과는 /analyze 응답과 동일)"""
+    print(f"🚀 LangGraph 분석 시작 (작업): project_idx={projectidx}")
+    result = None
+    try:
+        result = _invoke_analysis(state)
+    finally:
+        _release_analysis_resources(state, result)
+    print(f"✅ LangGraph 분석 완료")
+
+    api_path = _create_draft_file(userid, projectidx)
+    return {
+        **result['response_data'],
+        "filePath": api_path
+    }
+
+
+@app.post("/analyze/jobs")
+async def submit_analysis_job(
+    files: List[UploadFile] = File(...),
+    folders: List[str] = Form(...),
+    userid: str = Form(...),
+    projectidx: int = Form(...)
+):
+    """
+    /analyze 비동기 버전: 분석 작업 등록 후 job_id 즉시 반환
+
+    - 같은 projectidx + userid + 같은 파일(SHA-256)/폴더 요청이 진행 중/완료 후 TTL 이내면 기존 job_id 반환
+    - 결과 조회: GET /analyze/{job_id}
+
+    Returns:
+    - job_id, status ('queued' | 'running' | 'succeeded'), deduplicated
+    """
+    try:
+        print(f"📥 수신 데이터 (작업): userid={userid}, projectidx={projectidx}")
+        saved_files = await _read_uploaded_files(files, folders)
+
+        job_key = await run_in_threadpool(analysis_job_key, projectidx, saved_files, userid)
+        state = _build_analysis_state(saved_files, userid, projectidx)
+        job_id, created = analysis_jobs.submit(job_key, _run_analysis_job, state, userid, projectidx)
+
+        if not created:
+            print(f"♻️  동일 분석 작업 재사용: {job_id}")
+            release_file_blobs(saved_files)  # 기존 작업이 자기 원본으로 분석하므로 이번 업로드는 바로 해제
+
+        job = analysis_jobs.get(job_id)
+        return JSONResponse(
+            status_code=202,
+            content={
+                "job_id": job_id,
+                "status": job['status'] if job else "queued",
+                "deduplicated": not created
+            }
+        )
+
+    except Exception as e:
+        print(f"❌ 에러 발생: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": "서버 내부 오류가 발생했습니다.",
+                "detail": str(e)
+            }
+        )
+
+
+@app.get("/analyze/{job_id}")
+async def get_analysis_job(job_id: str):
+    """
+    분석 작업 상태/결과 조회
+
+    Returns:
+    - status: 'queued' | 'running' | 'succeeded' | 'failed'
+    - result: 성공 시 /analyze 응답과 동일한 내용
+    - error: 실패 시 에러 메시지
+    """
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "status": "error",
+                "message": "분석 작업을 찾을 수 없습니다. (만료되었거나 존재하지 않는 job_id)",
+                "job_id": job_id
+            }
+        )
+
+    return JSONResponse(status_code=200, content=job)
+
 
 @app.get("/health")
 async def health_check():
@@ -0,0 +1,187 @@
+"""
+디버그 산출물 저장 (추출 텍스트 덤프, 분석 결과 CSV/JSON)
+
+✅ 핵심 기능: 개발/디버깅용 로컬 파일 쓰기를 요청 처리 경로에서 분리
+📌 특징:
+  - 노드는 (상대 경로, 내용) 목록만 만들어 sink에 넘기고 바로 다음 단계로 진행
+  - ARTIFACT_SINK (config.Settings, create_batch_graph(artifact_sink=...)로 전달)
+      disabled: 저장하지 않음 (운영 권장, save_to_csv 노드도 그래프에서 제외)
+      background: 기존과 같은 위치(./extracted_texts, ./parsed_results/v6_rag)에
+                  백그라운드 스레드 1개가 순서대로 기록
+      archive: 분석 1회당 압축 파일 1개 ({ARTIFACT_DIR}/{analysis_id}.zip)에 백그라운드로 추가
+  - 쓰기 실패는 로그만 남기고 분석 결과에는 영향 없음
+  - 대기 중인 저장 요청은 최대 max_pending개 (ARTIFACT_MAX_PENDING), 가득 차면 이번 산출물은 버리고 로그만 남김
+    (요청마다 문서 전체 텍스트를 들고 있으므로 부하 시 메모리가 무한히 늘지 않도록)
+  - close(): 대기 중인 쓰기를 모두 마친 뒤 종료 (서버 종료 시)
+"""
+
+import threading
+import uuid
+import zipfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+Artifact = Tuple[str, Union[str, bytes]]  # (상대 경로, 내용)
+
+ARTIFACT_SINK_MODES = ('disabled', 'background', 'archive')
+DEFAULT_MAX_PENDING = 8  # 대기 중인 저장 요청 상한 (submit 1회 = 1개)
+
+
+def analysis_artifact_id(state: Dict[str, Any]) -> str:
+    """분석 1회를 구분하는 ID (state['analysis_id'], 없으면 생성해서 기록)"""
+    if not state.get('analysis_id'):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        state['analysis_id'] = f"{state.get('project_idx', 0)}_{timestamp}_{uuid.uuid4().hex[:6]}"
+    return state['analysis_id']
+
+
+def _encode(content: Union[str, bytes]) -> bytes:
+    return content.encode('utf-8') if isinstance(content, str) else content
+
+
+class ArtifactSink:
+    """저장하지 않는 sink (disabled)"""
+
+    enabled = False
+    mode = 'disabled'
+
+    def submit(self, analysis_id: str, artifacts: List[Artifact]) -> Dict[str, str]:
+        """
+        산출물 저장 요청 (즉시 반환)
+
+        Returns:
+            {상대 경로: 저장 위치} (disabled는 빈 dict)
+        """
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class _BackgroundSink(ArtifactSink, ABC):
+    """
+    단일 백그라운드 스레드에서 순서대로 쓰는 sink 공통 부분
+
+    Args:
+        max_pending: 대기/기록 중인 저장 요청 상한 (초과 시 버림)
+    """
+
+    enabled = True
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='artifact-writer')
+        self._pending = threading.BoundedSemaphore(max(1, max_pending))
+
+    def submit(self, analysis_id: str, artifacts: List[Artifact]) -> Dict[str, str]:
+        if not artifacts:
+            return {}
+        if not self._pending.acquire(blocking=False):
+            print(f"  ⚠️  산출물 저장 대기열 가득 참 → {len(artifacts)}개 산출물 저장 생략 ({analysis_id})")
+            return {}
+        try:
+            self._executor.submit(self._write_logged, analysis_id, artifacts)
+        except Exception:
+            self._pending.release()
+            raise
+        return {name: self._location(analysis_id, name) for name, _ in artifacts}
+
+    def _write_logged(self, analysis_id: str, artifacts: List[Artifact]) -> None:
+        try:
+            self._write(analysis_id, artifacts)
+        except Exception as e:
+            print(f"  ⚠️  산출물 저장 실패 ({analysis_id}): {e}")
+        finally:
+            self._pending.release()
+
+    @abstractmethod
+    def _write(self, analysis_id: str, artifacts: List[Artifact]) -> None:
+        """산출물 기록 (백그라운드 스레드에서 호출)"""
+
+    @abstractmethod
+    def _location(self, analysis_id: str, name: str) -> str:
+        """상대 경로 → 저장 위치 표시 문자열"""
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class DirectoryArtifactSink(_BackgroundSink):
+    """
+    기존 디렉토리 구조 그대로 백그라운드 기록 (background)
+
+    Args:
+        root: 상대 경로 기준 디렉토리 (기본: 현재 작업 디렉토리)
+        max_pending: 대기 중인 저장 요청 상한
+    """
+
+    mode = 'background'
+
+    def __init__(self, root: Union[str, Path] = '.', max_pending: int = DEFAULT_MAX_PENDING):
+        super().__init__(max_pending)
+        self.root = Path(root)
+
+    def _location(self, analysis_id: str, name: str) -> str:
+        return str(self.root / name)
+
+    def _write(self, analysis_id: str, artifacts: List[Artifact]) -> None:
+        for name, content in artifacts:
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(_encode(content))
+
+
+class ArchiveArtifactSink(_BackgroundSink):
+    """
+    분석 1회당 zip 1개에 추가 (archive)
+
+    Args:
+        directory: 압축 파일 저장 디렉토리
+        max_pending: 대기 중인 저장 요청 상한
+    """
+
+    mode = 'archive'
+
+    def __init__(self, directory: Union[str, Path], max_pending: int = DEFAULT_MAX_PENDING):
+        super().__init__(max_pending)
+        self.directory = Path(directory)
+
+    def _archive_path(self, analysis_id: str) -> Path:
+        return self.directory / f"{analysis_id}.zip"
+
+    def _location(self, analysis_id: str, name: str) -> str:
+        return f"{self._archive_path(analysis_id)}:{name}"
+
+    def _write(self, analysis_id: str, artifacts: List[Artifact]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(self._archive_path(analysis_id), 'a', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, content in artifacts:
+                archive.writestr(name, _encode(content))
+
+
+def create_artifact_sink(
+    mode: str = 'background',
+    directory: Optional[Union[str, Path]] = None,
+    max_pending: int = DEFAULT_MAX_PENDING
+) -> ArtifactSink:
+    """
+    ARTIFACT_SINK 설정값 → sink
+
+    Args:
+        mode: "disabled" | "background" | "archive"
+        directory: archive 모드 압축 파일 저장 디렉토리 (기본 ./artifacts)
+        max_pending: 대기 중인 저장 요청 상한 (ARTIFACT_MAX_PENDING)
+
+    Raises:
+        ValueError: 알 수 없는 mode
+    """
+    mode = (mode or 'disabled').lower()
+    if mode == 'disabled':
+        return ArtifactSink()
+    if mode == 'background':
+        return DirectoryArtifactSink(max_pending=max_pending)
+    if mode == 'archive':
+        return ArchiveArtifactSink(directory or './artifacts', max_pending=max_pending)
+    raise ValueError(f"알 수 없는 ARTIFACT_SINK: {mode} (사용 가능: {', '.join(ARTIFACT_SINK_MODES)})")
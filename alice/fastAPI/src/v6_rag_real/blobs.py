@@ -0,0 +1,195 @@
+"""
+업로드 파일 저장소 (State에는 원본 bytes 대신 핸들만 전달)
+
+✅ 핵심 기능: 업로드 원본을 분석 내내 메모리에 들고 다니지 않고, 마지막 사용 노드가 끝나면 해제
+📌 특징:
+  - 핸들 = 파일 SHA-256 (추출 캐시/페이지 이미지 캐시 키와 동일 → 해시 재계산 불필요)
+  - BLOB_STORE_MODE
+      disk: 업로드 스트림을 청크 단위로 해시하며 디스크에 기록 → 노드에는 파일 경로 전달
+            (pdfplumber / pdf2image가 경로에서 직접 읽으므로 원본 bytes가 프로세스 메모리에 올라가지 않음)
+      memory: bytes를 저장소에 보관 (기존 동작과 같은 메모리 사용, 해제 시점만 앞당김)
+  - 참조 카운트: 같은 파일을 동시에 분석해도 저장본은 1개, 마지막 release에서 삭제
+  - 프로세스별 하위 디렉토리 → 여러 워커 프로세스가 같은 BLOB_STORE_DIR를 써도 서로 지우지 않음
+  - release_file_blobs(): files의 'blob' 키를 꺼내며 해제 → 여러 번 호출해도 안전 (노드 + 요청 종료 시)
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Union
+
+from .config import BLOB_STORE_MODE, BLOB_STORE_DIR
+
+_READ_BLOCK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    """
+    참조 카운트 기반 업로드 파일 저장소
+
+    Args:
+        directory: disk 모드 저장 경로 (프로세스 ID 하위 디렉토리 사용)
+        mode: "disk" 또는 "memory"
+    """
+
+    SUFFIX = '.bin'
+
+    def __init__(self, directory: Union[str, Path], mode: str = 'disk'):
+        self.mode = mode
+        self.directory = Path(directory) / str(os.getpid())
+        self._refcounts: Dict[str, int] = {}
+        self._sizes: Dict[str, int] = {}
+        self._data: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, handle: str) -> Path:
+        return self.directory / f"{handle}{self.SUFFIX}"
+
+    def _acquire(self, handle: str, size: int) -> bool:
+        """참조 카운트 증가 (이미 저장된 파일이면 True)"""
+        with self._lock:
+            exists = handle in self._refcounts
+            self._refcounts[handle] = self._refcounts.get(handle, 0) + 1
+            self._sizes[handle] = size
+            return exists
+
+    def put(self, data: bytes) -> str:
+        """bytes 저장 후 핸들 반환"""
+        handle = hashlib.sha256(data).hexdigest()
+        if self.mode == 'memory':
+            with self._lock:
+                self._data.setdefault(handle, bytes(data))
+            self._acquire(handle, len(data))
+            return handle
+
+        with self._lock:
+            if handle in self._refcounts:
+                self._refcounts[handle] += 1
+                return handle
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(handle))
+            self._refcounts[handle] = 1
+            self._sizes[handle] = len(data)
+        return handle
+
+    def put_stream(self, stream: BinaryIO) -> str:
+        """
+        파일 객체를 블록 단위로 읽어 저장 (disk 모드는 전체 bytes를 메모리에 올리지 않음)
+
+        Args:
+            stream: 읽기 가능한 바이너리 파일 객체 (UploadFile.file 등)
+        """
+        if self.mode == 'memory':
+            return self.put(stream.read())
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for block in iter(lambda: stream.read(_READ_BLOCK_SIZE), b''):
+                    digest.update(block)
+                    f.write(block)
+                    size += len(block)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        handle = digest.hexdigest()
+        with self._lock:
+            if handle in self._refcounts:
+                Path(tmp_path).unlink(missing_ok=True)
+                self._refcounts[handle] += 1
+            else:
+                os.replace(tmp_path, self._path(handle))
+                self._refcounts[handle] = 1
+                self._sizes[handle] = size
+        return handle
+
+    def source(self, handle: str) -> Union[Path, bytes]:
+        """
+        pdfplumber / pdf2image 입력 (disk: 파일 경로, memory: bytes)
+
+        Raises:
+            KeyError: 이미 해제된 핸들
+        """
+        with self._lock:
+            if handle not in self._refcounts:
+                raise KeyError(f"해제된 파일 핸들: {handle[:12]}...")
+            if self.mode == 'memory':
+                return self._data[handle]
+        return self._path(handle)
+
+    def size(self, handle: str) -> int:
+        """저장된 파일 크기 (바이트)"""
+        return self._sizes.get(handle, 0)
+
+    def release(self, handle: Optional[str]) -> None:
+        """참조 카운트 감소, 0이 되면 저장본 삭제"""
+        if not handle:
+            return
+        with self._lock:
+            count = self._refcounts.get(handle)
+            if count is None:
+                return
+            if count > 1:
+                self._refcounts[handle] = count - 1
+                return
+            del self._refcounts[handle]
+            self._sizes.pop(handle, None)
+            self._data.pop(handle, None)
+            if self.mode != 'memory':
+                self._path(handle).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """저장본 전부 삭제 (프로세스 종료 시)"""
+        with self._lock:
+            self._refcounts.clear()
+            self._sizes.clear()
+            self._data.clear()
+        if self.mode != 'memory':
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+blob_store = BlobStore(BLOB_STORE_DIR, BLOB_STORE_MODE)
+
+
+def file_source(file_info: Dict[str, Any]) -> Optional[Any]:
+    """
+    파일 정보 → PDF 입력 (저장소 핸들 > bytes > 경로 순)
+
+    Returns:
+        파일 경로(Path/str) 또는 bytes, 해제되었거나 정보가 없으면 None
+    """
+    handle = file_info.get('blob')
+    if handle:
+        try:
+            return blob_store.source(handle)
+        except KeyError:
+            return None
+    return file_info.get('bytes') or file_info.get('path')
+
+
+def release_file_blobs(files: Iterable[Dict[str, Any]]) -> int:
+    """
+    files의 원본 참조 해제 ('blob'은 저장소에서 해제, 'bytes'는 State에서 제거)
+
+    Returns:
+        해제한 파일 수
+    """
+    released = 0
+    for file_info in files:
+        handle = file_info.pop('blob', None)
+        payload = file_info.pop('bytes', None)
+        if handle:
+            blob_store.release(handle)
+        if handle or payload is not None:
+            released += 1
+    return released
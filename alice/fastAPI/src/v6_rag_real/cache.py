@@ -0,0 +1,261 @@
+"""
+디스크 캐시 유틸리티
+
+✅ 핵심 기능:
+  1. DiskCache: 파일 해시(SHA-256) 기반 결과 캐시 (동일 공고 재업로드 시 재파싱 생략,
+     같은 양식 재업로드 시 Vision 목차 추출 생략)
+  2. EmbeddingCache: (모델, 정규화 텍스트 해시) → float32 벡터 캐시 (SQLite)
+
+📌 특징:
+  - 프로세스 재시작 후에도 유지되는 영속 캐시
+  - 용량/개수 상한 초과 시 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+  - 동시 분석 요청에도 안전 (원자적 파일 교체, SQLite WAL)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from .config import (
+    EXTRACTION_CACHE_DIR,
+    EXTRACTION_CACHE_MAX_BYTES,
+    EXTRACTION_CACHE_ENABLED,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_ENABLED,
+    TOC_CACHE_DIR,
+    TOC_CACHE_MAX_BYTES,
+    TOC_CACHE_ENABLED,
+)
+
+
+def sha256_of(source: Union[bytes, bytearray, memoryview, str, Path]) -> str:
+    """바이트 데이터 또는 파일 경로의 SHA-256 hex digest"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+
+    digest = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    용량 제한이 있는 JSON 디스크 캐시 (LRU)
+
+    Args:
+        directory: 캐시 파일 저장 경로
+        max_bytes: 캐시 디렉토리 최대 용량 (바이트)
+        enabled: False이면 get/put 모두 no-op
+    """
+
+    SUFFIX = '.json.gz'
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int, enabled: bool = True):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 손상된 경우 None)"""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 손상된 캐시 파일은 삭제 후 miss 처리
+            path.unlink(missing_ok=True)
+            return None
+
+        # LRU: 조회 시각을 mtime에 기록
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """캐시 저장 후 용량 상한 초과분 정리"""
+        if not self.enabled:
+            return
+
+        tmp_path = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            print(f"    ⚠️  캐시 저장 실패 ({key[:12]}...): {e}")
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """max_bytes를 넘으면 mtime이 오래된 항목부터 삭제"""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.directory.glob(f"*{self.SUFFIX}"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            for _, size, path in sorted(entries):
+                path.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+
+class EmbeddingCache:
+    """
+    임베딩 벡터 영속 캐시 (SQLite, float32 BLOB)
+
+    키: (모델명, 정규화 텍스트의 SHA-256)
+    - 요청마다 커넥션을 새로 열어 스레드 간 공유 문제 없음
+    - accessed_at 기준 LRU로 max_entries 초과분 정리
+
+    Args:
+        path: SQLite 파일 경로
+        max_entries: 최대 보관 벡터 수
+        enabled: False이면 get_many/put_many 모두 no-op
+    """
+
+    # SQLite 바인딩 변수 개수 제한 회피용
+    _QUERY_BATCH = 500
+
+    def __init__(self, path: Union[str, Path], max_entries: int, enabled: bool = True):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS embeddings (
+                            model TEXT NOT NULL,
+                            text_hash TEXT NOT NULL,
+                            dim INTEGER NOT NULL,
+                            vector BLOB NOT NULL,
+                            accessed_at REAL NOT NULL,
+                            PRIMARY KEY (model, text_hash)
+                        )
+                        """
+                    )
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings (accessed_at)"
+                    )
+                    conn.commit()
+                    self._initialized = True
+        return conn
+
+    def get_many(self, model: str, text_hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """캐시된 벡터 조회 → {text_hash: float32 벡터}"""
+        if not self.enabled:
+            return {}
+
+        hashes = list(dict.fromkeys(text_hashes))
+        found: Dict[str, np.ndarray] = {}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connect()
+            try:
+                for i in range(0, len(hashes), self._QUERY_BATCH):
+                    batch = hashes[i:i + self._QUERY_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = conn.execute(
+                        f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                        [model, *batch]
+                    ).fetchall()
+                    for text_hash, blob in rows:
+                        found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+
+                if found:
+                    now = time.time()
+                    conn.executemany(
+                        "UPDATE embeddings SET accessed_at = ? WHERE model = ? AND text_hash = ?",
+                        [(now, model, text_hash) for text_hash in found]
+                    )
+                    conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"    ⚠️  임베딩 캐시 조회 실패: {e}")
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]) -> None:
+        """벡터 저장 후 max_entries 초과분 정리"""
+        if not self.enabled or not vectors:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connect()
+            try:
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (model, text_hash, len(vector), np.asarray(vector, dtype=np.float32).tobytes(), now)
+                        for text_hash, vector in vectors.items()
+                    ]
+                )
+                (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM embeddings WHERE rowid IN "
+                        "(SELECT rowid FROM embeddings ORDER BY accessed_at LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"    ⚠️  임베딩 캐시 저장 실패: {e}")
+
+
+# 텍스트 추출 결과 캐시 (page_texts, tables, page_count)
+extraction_cache = DiskCache(EXTRACTION_CACHE_DIR, EXTRACTION_CACHE_MAX_BYTES, EXTRACTION_CACHE_ENABLED)
+
+# 양식 목차 캐시 (양식 파일 SHA-256 + TOC_PROMPT_VERSION → Vision 추출 섹션)
+toc_cache = DiskCache(TOC_CACHE_DIR, TOC_CACHE_MAX_BYTES, TOC_CACHE_ENABLED)
+
+# 청크/쿼리 임베딩 캐시
+embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES, EMBEDDING_CACHE_ENABLED)
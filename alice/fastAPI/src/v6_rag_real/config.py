@@ -2,6 +2,7 @@
 설정 및 상수
 """
 
+import os
 from pathlib import Path
 
 # ========================================
@@ -13,6 +14,144 @@ CSV_OUTPUT_DIR = BASE_DIR / "parsed_results" / "v6_rag"
 # 디렉토리 생성
 CSV_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# ========================================
+# 텍스트 추출 설정
+# ========================================
+# 프로세스 풀 워커 수 (0 이하: CPU 코어 수, 1: 기존 직렬 추출)
+EXTRACT_MAX_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", "0"))
+if EXTRACT_MAX_WORKERS <= 0:
+    EXTRACT_MAX_WORKERS = os.cpu_count() or 1
+# 전체 페이지 수가 이 값 미만이면 프로세스 생성 비용이 더 크므로 직렬 추출
+EXTRACT_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACT_PARALLEL_MIN_PAGES", "16"))
+# 워커 1개가 한 번에 처리하는 최소 페이지 수 (샤드 크기 하한)
+EXTRACT_PAGES_PER_TASK = int(os.getenv("EXTRACT_PAGES_PER_TASK", "8"))
+
+# 추출 결과 캐시 (파일 SHA-256 기반, 동일 공고 재업로드 시 pdfplumber 생략)
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+EXTRACTION_CACHE_DIR = Path(os.getenv("EXTRACTION_CACHE_DIR", str(BASE_DIR / "cache" / "extraction")))
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # 512MB
+# 추출/정규화 로직이 바뀌면 올려서 기존 캐시 무효화
+EXTRACTION_CACHE_VERSION = "1"
+
+# 반복 머리말/꼬리말 제거: 페이지 위/아래 가장자리 줄 중 여러 페이지에 반복되는 줄(기관명, 쪽 번호 등)
+# (추출 캐시에는 원문 저장, 제거는 캐시 복원 후 적용)
+STRIP_REPEATED_PAGE_LINES = os.getenv("STRIP_REPEATED_PAGE_LINES", "true").lower() == "true"
+REPEATED_LINE_EDGE_LINES = 3  # 페이지 위/아래에서 검사할 줄 수
+REPEATED_LINE_MIN_RATIO = 0.5  # 전체 페이지 중 이 비율 이상에 나오면 머리말/꼬리말
+REPEATED_LINE_MIN_PAGES = 4  # 이보다 페이지가 적은 문서는 검사하지 않음
+
+# ========================================
+# 업로드 파일 저장소 설정
+# ========================================
+# 업로드 원본은 State에 bytes로 두지 않고 저장소 핸들(SHA-256)로 전달
+#   disk: BLOB_STORE_DIR/<pid>/에 파일로 저장, 노드에는 경로 전달 (메모리에 원본을 올리지 않음)
+#   memory: 프로세스 메모리에 보관 (디스크를 쓸 수 없는 환경용)
+BLOB_STORE_MODE = os.getenv("BLOB_STORE_MODE", "disk").lower()
+BLOB_STORE_DIR = Path(os.getenv("BLOB_STORE_DIR", str(BASE_DIR / "cache" / "blobs")))
+
+# ========================================
+# 임베딩 설정
+# ========================================
+EMBEDDING_MODEL = "text-embedding-3-small"  # 1536 차원, $0.02/1M tokens
+EMBEDDING_DIM = 1536
+EMBEDDING_BATCH_SIZE = 2048  # OpenAI API 최대 2048개/요청
+
+# 임베딩 캐시 (모델 + 정규화 텍스트 해시 → float32 벡터, SQLite)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", str(BASE_DIR / "cache" / "embeddings.sqlite3")))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000"))  # 약 3GB (1536 x 4B)
+
+# 고정 RAG 쿼리 (요청마다 동일 → 프로세스당 1회만 임베딩)
+TEMPLATE_DETECTION_QUERY = "양식 서식 작성예시 작성방법 입력칸"  # detect_proposal_templates
+TOC_CONTEXT_QUERY = "제출서류 작성항목 구성 목차 제안서 계획서 사업계획서 운영계획"  # prepare_announcement_context
+
+# ========================================
+# 청킹 설정
+# ========================================
+# 청크 길이 단위: chars (문자 수, 기존 동작) / tokens (임베딩 모델 토크나이저 기준, tiktoken 필요)
+# tokens: 청크를 목표 토큰 수에 가깝게 채워 청크 수/임베딩 요청 수 감소
+CHUNK_LENGTH_UNIT = os.getenv("CHUNK_LENGTH_UNIT", "chars").lower()
+CHUNK_MAX_CHARS = 1000
+CHUNK_OVERLAP_CHARS = 200
+CHUNK_TARGET_TOKENS = int(os.getenv("CHUNK_TARGET_TOKENS", "700"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "100"))
+CHUNK_MIN_CHARS = 50  # 빈 페이지/짧은 조각 제거 기준
+# 청크 중복 제거 (MinHash): 공고/첨부에 반복되는 상용구 청크를 임베딩 전에 제거
+CHUNK_DEDUP_ENABLED = os.getenv("CHUNK_DEDUP_ENABLED", "true").lower() == "true"
+CHUNK_DEDUP_THRESHOLD = float(os.getenv("CHUNK_DEDUP_THRESHOLD", "0.9"))  # 추정 Jaccard 유사도
+CHUNK_DEDUP_SHINGLE_SIZE = 5  # 문자 n-gram 길이
+CHUNK_DEDUP_NUM_PERM = 64  # MinHash 해시 함수 수
+CHUNK_DEDUP_BANDS = 16  # LSH 밴드 수 (밴드당 4행)
+# 청킹 범위: page (페이지별 청킹, 기존 동작) / document (페이지를 이어 붙여 섹션 감지 → 페이지 경계를 넘는 섹션 유지)
+CHUNK_SCOPE = os.getenv("CHUNK_SCOPE", "page").lower()
+
+# ========================================
+# VectorDB 설정
+# ========================================
+# chroma: Chroma 컬렉션에 저장 후 검색 (기존 동작)
+# numpy: state['all_embeddings']를 그대로 쓰는 프로세스 내 인덱스 (Chroma 저장 생략, 분석 1회용)
+VECTOR_STORE = os.getenv("VECTOR_STORE", "chroma").lower()
+# persistent: 디스크(VECTOR_DB_DIR)에 컬렉션 저장 / memory: EphemeralClient (분석 종료 시 삭제)
+VECTOR_DB_MODE = os.getenv("VECTOR_DB_MODE", "persistent").lower()
+VECTOR_DB_DIR = Path(os.getenv("VECTOR_DB_DIR", "./chroma_db"))
+# 증분 재분석: 기존 프로젝트 컬렉션과 비교하여 새/변경 문서 청크만 임베딩·추가하고 사라진 청크 삭제
+# (persistent 모드에서만 동작, memory 모드는 항상 새 컬렉션)
+VECTOR_DB_INCREMENTAL = os.getenv("VECTOR_DB_INCREMENTAL", "true").lower() == "true"
+# 청크 ID/청킹/임베딩 방식이 바뀌면 올려서 기존 컬렉션 전체 재구축
+# (2: 청크 ID에 청크 텍스트 해시 추가)
+VECTOR_INDEX_VERSION = "2"
+# Feature RAG 검색 결과 수
+# [2025-11-19 수정] 7 → 10으로 증가: 텍스트 추출 방식 변경으로 청킹이 더 세분화되어
+# 관련 정보가 더 많은 청크에 분산될 수 있음
+FEATURE_SEARCH_N_RESULTS = 10
+
+# ========================================
+# LLM 호출 설정
+# ========================================
+# extract_features_rag 동시 실행 Feature 수 (1: 기존 직렬 실행)
+FEATURE_EXTRACTION_CONCURRENCY = max(1, int(os.getenv("FEATURE_EXTRACTION_CONCURRENCY", "6")))
+# 429/타임아웃/5xx 응답 시 재시도 횟수 (지수 백오프 + jitter, retry-after 헤더 우선)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = 1.0
+LLM_BACKOFF_MAX_SECONDS = 30.0
+
+# Vision API 입력 페이지 이미지 캐시 (문서 SHA-256 + DPI + 페이지 → base64 PNG)
+PAGE_IMAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_IMAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # 256MB
+# pdf2image 1회 변환 페이지 수 (PIL 이미지는 이 개수만큼만 동시에 메모리에 올라감)
+RENDER_CHUNK_PAGES = int(os.getenv("RENDER_CHUNK_PAGES", "5"))
+
+# 핵심 정보 Feature: 사용자에게 우선 표시되므로 Vision API로 먼저 추출
+CORE_FEATURE_KEYS = [
+    'project_name',           # 사업명
+    'announcement_date',      # 공고일
+    'application_period',     # 접수기간
+    'project_period',         # 사업기간
+    'support_scale',          # 지원규모
+    'announcing_agency',      # 공고기관 (핵심 정보)
+    'evaluation_criteria',    # 평가기준 (항목별 배점 포함)
+]
+# 핵심 정보 Vision 추출 통합 모드 (이미지 1세트로 전체 핵심 정보 1회 호출, found=false 항목만 개별 재시도)
+VISION_COMBINED_CORE_EXTRACTION = os.getenv("VISION_COMBINED_CORE_EXTRACTION", "true").lower() == "true"
+
+# 양식 목차 선행 추출: 파일명 키워드 + 표 구조로 고른 양식 후보의 목차를 Feature 추출과 병렬로 Vision 추출
+# (감지 결과가 다른 양식이거나 양식이 없으면 선행 결과는 버림)
+TOC_SPECULATIVE_PREFETCH = os.getenv("TOC_SPECULATIVE_PREFETCH", "true").lower() == "true"
+SPECULATIVE_TEMPLATE_KEYWORDS = ['계획서', '제안서', '신청서']
+
+# 목차 페이지 범위: 양식 page_texts로 먼저 판별하고, 텍스트로 판별할 수 없는 페이지만 이미지 변환 + Vision 호출
+TOC_TEXT_FIRST_DETECTION = os.getenv("TOC_TEXT_FIRST_DETECTION", "true").lower() == "true"
+# 작성요령 탐색: 목차 이후 페이지 중 텍스트에 목차 항목 제목/작성요령 문구가 없는 페이지는 이미지 변환 생략
+# (텍스트 레이어가 없는 페이지는 그대로 포함)
+TOC_DESCRIPTION_TEXT_FILTER = os.getenv("TOC_DESCRIPTION_TEXT_FILTER", "true").lower() == "true"
+
+# 양식 목차 캐시 (양식 파일 SHA-256 + 프롬프트 버전 → Vision 추출 섹션, description 포함)
+# 여러 공고가 같은 표준 양식을 공유하므로 한 번 추출한 목차를 재사용 (gpt-4o 이미지 호출 생략)
+TOC_CACHE_ENABLED = os.getenv("TOC_CACHE_ENABLED", "true").lower() == "true"
+TOC_CACHE_DIR = Path(os.getenv("TOC_CACHE_DIR", str(BASE_DIR / "cache" / "toc")))
+TOC_CACHE_MAX_BYTES = int(os.getenv("TOC_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB
+# toc_util의 Vision 목차/작성요령 프롬프트, 모델, 목차/작성요령 페이지 선택 방식이 바뀌면 올려서 기존 캐시 무효화
+TOC_PROMPT_VERSION = "3"
+
 # ========================================
 # Feature 정의 (정부 R&D 공고문 기준)
 # ========================================
@@ -0,0 +1,60 @@
+"""
+문서 텍스트 표현
+
+✅ 핵심 기능: 문서 텍스트를 버퍼 1개로 보관 (page_texts와 full_text가 같은 문자열을 공유)
+📌 특징:
+  - PageTexts: {페이지 번호: 텍스트} Mapping, 내부적으로는 full_text 버퍼 + 페이지별 (시작, 끝) 위치
+  - 페이지 텍스트는 조회 시점에 버퍼에서 잘라서 반환 (페이지 문자열을 따로 보관하지 않음)
+  - full_text는 버퍼 자체 → 문서 텍스트가 메모리에 두 번 올라가지 않음
+  - dict와 같은 방식(items/keys/[]/get/len)으로 사용 가능하므로 기존 노드 수정 불필요
+"""
+
+from typing import Dict, Iterator, Mapping, Tuple
+
+
+class PageTexts(Mapping):
+    """
+    full_text 버퍼 위의 페이지별 텍스트 뷰
+
+    full_text 형식: "\\n[페이지 1]\\n{텍스트}\\n[페이지 2]\\n{텍스트}..." (기존 extract_all_texts와 동일)
+    """
+
+    __slots__ = ('_buffer', '_offsets')
+
+    def __init__(self, page_texts: Mapping[int, str]):
+        parts = []
+        offsets: Dict[int, Tuple[int, int]] = {}
+        position = 0
+        for page_num, text in page_texts.items():
+            text = text or ''
+            marker = f"\n[페이지 {page_num}]\n"
+            position += len(marker)
+            offsets[page_num] = (position, position + len(text))
+            position += len(text)
+            parts.append(marker)
+            parts.append(text)
+
+        self._buffer = "".join(parts)
+        self._offsets = offsets
+
+    @property
+    def full_text(self) -> str:
+        """문서 전체 텍스트 (페이지 구분 마커 포함, 복사 없이 버퍼 반환)"""
+        return self._buffer
+
+    def page_range(self, page_num: int) -> Tuple[int, int]:
+        """full_text 안에서 페이지 텍스트의 (시작, 끝) 위치"""
+        return self._offsets[page_num]
+
+    def __getitem__(self, page_num: int) -> str:
+        start, end = self._offsets[page_num]
+        return self._buffer[start:end]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __repr__(self) -> str:
+        return f"PageTexts(pages={len(self._offsets)}, chars={len(self._buffer):,})"
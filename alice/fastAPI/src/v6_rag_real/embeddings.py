@@ -0,0 +1,209 @@
+"""
+임베딩 생성 유틸리티
+
+✅ 핵심 기능: OpenAI Embedding API 호출 + 영속 임베딩 캐시
+📌 특징:
+  - 캐시 키: (모델명, 정규화 텍스트 SHA-256)
+  - 캐시 miss 텍스트만 API로 배치 전송 (동일 공고를 공유하는 프로젝트 간 재사용)
+  - 요청 내 중복 텍스트도 한 번만 임베딩
+  - float32 전용: API 응답을 base64로 받아 np.frombuffer로 바로 디코딩 (float 리스트 생성 없음),
+    결과는 미리 할당한 (N, D) float32 행렬 1개에 채움
+  - 고정 쿼리(FEATURES 쿼리 + 양식/목차 쿼리): 첫 사용 시 1회 배치 호출 후 프로세스 내 메모이즈
+"""
+
+import base64
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from openai import OpenAI
+from dotenv import load_dotenv
+
+from .cache import embedding_cache
+from .config import (
+    FEATURES,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIM,
+    EMBEDDING_BATCH_SIZE,
+    TEMPLATE_DETECTION_QUERY,
+    TOC_CONTEXT_QUERY,
+)
+
+# OpenAI 클라이언트 초기화
+load_dotenv()
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_embedding_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 압축)"""
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFC', text or '')).strip()
+
+
+def embedding_text_hash(text: str) -> str:
+    """정규화 텍스트의 SHA-256"""
+    return hashlib.sha256(normalize_embedding_text(text).encode('utf-8')).hexdigest()
+
+
+def _decode_embedding(embedding: Any) -> np.ndarray:
+    """API 응답 임베딩 → float32 벡터 (base64면 복사 없이 버퍼 해석)"""
+    if isinstance(embedding, str):
+        return np.frombuffer(base64.b64decode(embedding), dtype='<f4')
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def embed_texts(
+    texts: List[str],
+    model: str = EMBEDDING_MODEL,
+    errors: Optional[List[str]] = None
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    텍스트 리스트 임베딩 (캐시 우선, miss만 API 호출)
+
+    Args:
+        texts: 임베딩할 텍스트 리스트
+        model: 임베딩 모델명
+        errors: 배치 실패 메시지를 추가할 리스트 (state['errors'])
+
+    Returns:
+        (입력 순서대로의 (N, EMBEDDING_DIM) float32 행렬, 캐시 통계)
+        - 캐시 통계: {'hits': 캐시에서 가져온 텍스트 수, 'misses': API로 임베딩한 텍스트 수, 'api_calls': 배치 요청 수}
+        - 실패한 배치는 0 벡터로 채움 (캐시에 저장하지 않음)
+    """
+    text_hashes = [embedding_text_hash(text) for text in texts]
+    cached = embedding_cache.get_many(model, text_hashes)
+
+    # 요청 내 중복 제거: 해시별 첫 번째 텍스트만 API로 전송
+    miss_texts: Dict[str, str] = {}
+    for text, text_hash in zip(texts, text_hashes):
+        if text_hash not in cached and text_hash not in miss_texts:
+            miss_texts[text_hash] = text
+
+    stats = {
+        'hits': sum(1 for text_hash in text_hashes if text_hash in cached),
+        'misses': sum(1 for text_hash in text_hashes if text_hash not in cached),
+        'api_calls': 0,
+    }
+
+    miss_items = list(miss_texts.items())
+    total_batches = (len(miss_items) + EMBEDDING_BATCH_SIZE - 1) // EMBEDDING_BATCH_SIZE
+    fresh: Dict[str, np.ndarray] = {}
+
+    for i in range(0, len(miss_items), EMBEDDING_BATCH_SIZE):
+        batch_num = i // EMBEDDING_BATCH_SIZE + 1
+        batch = miss_items[i:i + EMBEDDING_BATCH_SIZE]
+
+        print(f"    ⏳ 배치 {batch_num}/{total_batches} 처리 중... ({i+1}-{i+len(batch)}/{len(miss_items)} 캐시 miss 텍스트)")
+
+        try:
+            response = client.embeddings.create(
+                model=model,
+                input=[text for _, text in batch],
+                encoding_format="base64"
+            )
+            stats['api_calls'] += 1
+            batch_vectors = {
+                text_hash: _decode_embedding(item.embedding)
+                for (text_hash, _), item in zip(batch, response.data)
+            }
+            fresh.update(batch_vectors)
+            embedding_cache.put_many(model, batch_vectors)
+
+        except Exception as e:
+            print(f"    ❌ 배치 {batch_num} 임베딩 실패: {str(e)}")
+            if errors is not None:
+                errors.append(f"임베딩 배치 {batch_num} 실패: {str(e)}")
+
+    # 실패한 배치 행은 0 벡터로 남음
+    vectors = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for row, text_hash in enumerate(text_hashes):
+        vector = cached.get(text_hash)
+        if vector is None:
+            vector = fresh.get(text_hash)
+        if vector is not None:
+            vectors[row] = vector
+    return vectors, stats
+
+
+# ========================================
+# 고정 쿼리 임베딩 (프로세스 단위 메모이즈)
+# ========================================
+
+def get_feature_keywords(feature_def: Dict[str, Any]) -> List[str]:
+    """
+    Feature 키워드 목록 (우선순위: primary → secondary → related)
+    """
+    keywords = feature_def['keywords']
+    if isinstance(keywords, dict):
+        # 새로운 구조: primary/secondary/related
+        all_keywords = []
+        all_keywords.extend(keywords.get('primary', []))
+        all_keywords.extend(keywords.get('secondary', []))
+        all_keywords.extend(keywords.get('related', []))
+        return all_keywords
+    # 이전 구조 호환 (리스트)
+    return list(keywords)
+
+
+def build_feature_query_text(feature_def: Dict[str, Any]) -> str:
+    """Feature RAG 검색 쿼리 텍스트 (Feature명 + 상위 5개 키워드)"""
+    keywords_str = " ".join(get_feature_keywords(feature_def)[:5])
+    return f"{feature_def['feature_type']} {keywords_str}"
+
+
+_query_embeddings: Dict[str, np.ndarray] = {}
+_query_lock = threading.Lock()
+
+
+def _static_query_texts() -> List[str]:
+    """config에서 파생되는 고정 쿼리 전체 (FEATURES + 양식 감지 + 목차 컨텍스트)"""
+    texts = [build_feature_query_text(feature_def) for feature_def in FEATURES]
+    texts.extend([TEMPLATE_DETECTION_QUERY, TOC_CONTEXT_QUERY])
+    return list(dict.fromkeys(texts))
+
+
+def get_query_embeddings(query_texts: List[str]) -> List[np.ndarray]:
+    """
+    쿼리 임베딩 조회 (프로세스 내 메모이즈)
+
+    처음 호출될 때 고정 쿼리 전체를 요청된 쿼리와 함께 한 번의 배치로 임베딩하므로
+    이후 Feature 추출/양식 감지/목차 컨텍스트 검색은 API를 호출하지 않는다.
+
+    Raises:
+        RuntimeError: 임베딩 API 실패로 벡터를 얻지 못한 경우 (실패 결과는 메모이즈하지 않음)
+    """
+    with _query_lock:
+        missing = [text for text in query_texts if text not in _query_embeddings]
+        if missing:
+            if not _query_embeddings:
+                missing = list(dict.fromkeys(missing + _static_query_texts()))
+
+            vectors, _ = embed_texts(missing)
+            for text, vector in zip(missing, vectors):
+                if np.any(vector):  # 실패 배치는 0 벡터
+                    _query_embeddings[text] = vector
+
+        failed = [text for text in query_texts if text not in _query_embeddings]
+        if failed:
+            raise RuntimeError(f"쿼리 임베딩 실패: {failed[0]}")
+
+        return [_query_embeddings[text] for text in query_texts]
+
+
+def get_query_embedding(query_text: str) -> np.ndarray:
+    """단일 쿼리 임베딩 (get_query_embeddings 참고)"""
+    return get_query_embeddings([query_text])[0]
+
+
+def warmup_query_embeddings() -> None:
+    """고정 쿼리 임베딩 선계산 (서버 시작 시 호출)"""
+    try:
+        get_query_embeddings(_static_query_texts())
+        print(f"✅ 고정 쿼리 임베딩 준비 완료: {len(_query_embeddings)}개")
+    except Exception as e:
+        print(f"⚠️ 고정 쿼리 임베딩 선계산 실패 (첫 분석 시 재시도): {e}")
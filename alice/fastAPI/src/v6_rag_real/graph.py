@@ -8,66 +8,93 @@ LangGraph 구성
     ↓
   2. chunk_all_documents (섹션 기반 청킹) ✅ 필수
     ↓
+  2-1. deduplicate_chunks (MinHash 중복 청크 제거) ⚠️ 선택 (CHUNK_DEDUP_ENABLED)
+    ↓
   3. embed_all_chunks (임베딩 생성) ✅ 필수
     ↓
   4. init_and_store_vectordb (VectorDB 저장) ✅ 필수
     ↓
   5. extract_features_rag (RAG 기반 Feature 추출) ✅ 필수
-    ↓
+     ∥ prefetch_template_toc (양식 후보 목차 Vision 선행 추출, 병렬) ⚠️ 선택 (TOC_SPECULATIVE_PREFETCH)
+    ↓ (두 노드 모두 완료 후)
   6. detect_templates (첨부 양식 감지) ✅ 필수
     ↓
   7. 조건부 라우팅 (TOC_ROUTER) ⚡
     ├─ extract_toc_from_template (양식 O) ✅
     └─ extract_toc_from_announcement_and_attachments (양식 X) ✅
     ↓
-  8. save_to_csv (로컬 저장 - 개발용) ⚠️ 선택
+  7-1. release_file_payloads (업로드 원본 해제, 이후 노드는 추출 결과만 사용) ✅ 필수
+    ↓
+  8. save_to_csv (로컬 저장 - 개발용) ⚠️ 선택 (ARTIFACT_SINK=disabled면 그래프에서 제외)
     ↓
   9. build_response (최종 응답 + Backend API 호출) ✅ 필수
     ↓
   END
 """
 
+from functools import partial
+from typing import Optional
+
 from langgraph.graph import StateGraph, START, END
 from .state_types import BatchState
+from .artifacts import ArtifactSink, create_artifact_sink
 from . import nodes
 
 
-def create_batch_graph():
+def create_batch_graph(artifact_sink: Optional[ArtifactSink] = None):
     """
     LangGraph 생성 및 컴파일
 
     ✅ 9단계 분석 파이프라인 구성
     📌 조건부 라우팅: 양식 유무에 따라 목차 추출 방식 자동 선택
+    📌 디버그 산출물(추출 텍스트 덤프, 결과 CSV/JSON)은 artifact_sink로 기록 (응답 경로와 분리)
+
+    Args:
+        artifact_sink: 산출물 sink (None이면 background, FastAPI는 Settings.ARTIFACT_SINK로 생성)
 
     Returns:
         compiled graph (LangGraph 실행 가능 객체)
     """
+    if artifact_sink is None:
+        artifact_sink = create_artifact_sink('background')
+
     # 그래프 생성
     graph = StateGraph(BatchState)
 
     # 노드 추가
-    graph.add_node("extract_all_texts", nodes.extract_all_texts)
+    graph.add_node("extract_all_texts", partial(nodes.extract_all_texts, artifact_sink=artifact_sink))
     graph.add_node("chunk_all_documents", nodes.chunk_all_documents)
+    graph.add_node("deduplicate_chunks", nodes.deduplicate_chunks)
     graph.add_node("embed_all_chunks", nodes.embed_all_chunks)
     graph.add_node("init_and_store_vectordb", nodes.init_and_store_vectordb)
     graph.add_node("extract_features_rag", nodes.extract_features_rag)  # Feature 추출
+    graph.add_node("prefetch_template_toc", nodes.prefetch_template_toc)  # ⚡ 양식 목차 선행 추출 (병렬)
     graph.add_node("detect_templates", nodes.detect_proposal_templates)  # ✨ 양식 감지
 
     # ✨ 조건부 목차 추출 노드 (라우팅 기반)
     graph.add_node("extract_toc_from_template", nodes.extract_toc_from_template)  # 양식 기반
     graph.add_node("extract_toc_from_announcement_and_attachments", nodes.extract_toc_from_announcement_and_attachments)  # 공고+첨부 기반
 
-    # ✨ 저장 노드: CSV (개발/테스트용)
-    graph.add_node("save_to_csv", nodes.save_to_csv)
+    # 업로드 원본 해제 (원본을 쓰는 마지막 노드 = 목차 추출)
+    graph.add_node("release_file_payloads", nodes.release_file_payloads)
+
+    # ✨ 저장 노드: CSV (개발/테스트용, sink가 disabled면 노드 자체를 생략)
+    if artifact_sink.enabled:
+        graph.add_node("save_to_csv", partial(nodes.save_to_csv, artifact_sink=artifact_sink))
     graph.add_node("build_response", nodes.build_response)
 
     # 엣지 추가 (순차 실행)
     graph.add_edge(START, "extract_all_texts")
     graph.add_edge("extract_all_texts", "chunk_all_documents")
-    graph.add_edge("chunk_all_documents", "embed_all_chunks")
+    graph.add_edge("chunk_all_documents", "deduplicate_chunks")
+    graph.add_edge("deduplicate_chunks", "embed_all_chunks")
     graph.add_edge("embed_all_chunks", "init_and_store_vectordb")
     graph.add_edge("init_and_store_vectordb", "extract_features_rag")
-    graph.add_edge("extract_features_rag", "detect_templates")  # Feature → 양식 감지
+
+    # ⚡ 목차 Vision 추출은 Feature 결과와 무관 → Feature 추출과 같은 단계에서 병렬 실행
+    # (두 노드가 모두 끝나야 양식 감지 진행, 선행 결과는 extract_toc_from_template에서 재사용)
+    graph.add_edge("init_and_store_vectordb", "prefetch_template_toc")
+    graph.add_edge(["extract_features_rag", "prefetch_template_toc"], "detect_templates")  # Feature → 양식 감지
 
     # ✨ 조건부 엣지: 양식 유무에 따라 라우팅
     graph.add_conditional_edges(
@@ -79,12 +106,16 @@ def create_batch_graph():
         }
     )
 
-    # 두 목차 추출 노드 모두 save_to_csv로 연결
-    graph.add_edge("extract_toc_from_template", "save_to_csv")
-    graph.add_edge("extract_toc_from_announcement_and_attachments", "save_to_csv")
+    # 두 목차 추출 노드 모두 원본 해제 후 save_to_csv로 연결
+    graph.add_edge("extract_toc_from_template", "release_file_payloads")
+    graph.add_edge("extract_toc_from_announcement_and_attachments", "release_file_payloads")
+    # save_to_csv → build_response → END (save_to_csv 생략 시 바로 build_response)
+    if artifact_sink.enabled:
+        graph.add_edge("release_file_payloads", "save_to_csv")
+        graph.add_edge("save_to_csv", "build_response")
+    else:
+        graph.add_edge("release_file_payloads", "build_response")
 
-    # save_to_csv → build_response → END
-    graph.add_edge("save_to_csv", "build_response")
     graph.add_edge("build_response", END)
 
     # 컴파일
@@ -104,14 +135,20 @@ def create_batch_graph():
     print(f"\n📊 노드 구성:")
     print(f"  1. extract_all_texts (텍스트 + 표 구조 추출)")
     print(f"  2. chunk_all_documents (섹션 기반 청킹)")
+    print(f"     └─ deduplicate_chunks (MinHash 중복 청크 제거)")
     print(f"  3. embed_all_chunks (임베딩 생성)")
     print(f"  4. init_and_store_vectordb (Chroma VectorDB 저장)")
     print(f"  5. extract_features_rag (RAG 기반 Feature 추출)")
+    print(f"     ∥ prefetch_template_toc (양식 목차 선행 추출, 병렬)")
     print(f"  6. detect_templates (첨부 양식 감지) ✨ MVP1")
     print(f"  7. 조건부 라우팅 ⚡ TOC_ROUTER")
     print(f"     ├─ extract_toc_from_template (양식 O) ✨ MVP1")
     print(f"     └─ extract_toc_from_announcement_and_attachments (양식 X, 공고+첨부) ✨ MVP1")
-    print(f"  8. save_to_csv (개발/테스트 - CSV 로컬 저장)")
+    print(f"     └─ release_file_payloads (업로드 원본 해제)")
+    if artifact_sink.enabled:
+        print(f"  8. save_to_csv (개발/테스트 - CSV 로컬 저장, {artifact_sink.mode})")
+    else:
+        print(f"  8. save_to_csv (생략 - ARTIFACT_SINK=disabled)")
     print(f"  9. build_response (최종 응답 생성 + Backend API 호출) ✨ MVP1")
 
     return batch_app
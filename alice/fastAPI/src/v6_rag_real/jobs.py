@@ -0,0 +1,138 @@
+"""
+분석 작업 큐 (/analyze/jobs 비동기 모드)
+
+✅ 핵심 기능: 분석 요청을 즉시 job_id로 응답하고, 제한된 워커 풀에서 배치 그래프 실행
+📌 특징:
+  - 워커 수 제한 (동시 분석 수 = max_workers, 나머지는 queued 상태로 대기)
+  - 중복 제거: 같은 (project_idx, userid, 파일 SHA-256 + 폴더 목록) 요청이 진행 중이거나
+    완료 후 TTL 이내이면 기존 job_id 반환 (더블클릭 시 파이프라인 1회만 실행)
+  - 실패한 작업은 중복 제거 대상에서 제외 (재요청 시 새로 실행)
+  - 완료 후 TTL이 지난 작업은 조회 시점에 정리
+"""
+
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from .cache import sha256_of
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+
+def analysis_job_key(project_idx: int, files: Iterable[Dict[str, Any]], user_id: str = '') -> Tuple[int, str, Tuple[Tuple[str, int], ...]]:
+    """
+    중복 제거 키: (project_idx, user_id, 정렬된 (파일 SHA-256, 폴더) 목록)
+
+    - 폴더 포함: 같은 파일이라도 공고/첨부서류 역할이 바뀌면 다른 분석
+    - user_id 포함: 결과의 filePath(초안 파일)는 요청 사용자 기준이므로 다른 사용자와 공유하지 않음
+
+    Args:
+        files: BatchState['files'] 형식 ({"blob": ...}, {"bytes": ...} 또는 {"path": ...}, + "folder")
+            (blob 핸들은 이미 SHA-256이므로 재계산하지 않음)
+        user_id: 요청 사용자 ID
+    """
+    entries = sorted(
+        (
+            file_info['blob'] if file_info.get('blob') else
+            sha256_of(file_info['bytes'] if file_info.get('bytes') is not None else file_info['path']),
+            int(file_info.get('folder') or 0)
+        )
+        for file_info in files
+    )
+    return (project_idx, str(user_id or ''), tuple(entries))
+
+
+class AnalysisJobManager:
+    """
+    분석 작업 실행/조회 관리자
+
+    Args:
+        max_workers: 동시에 실행할 분석 수
+        ttl_seconds: 완료된 작업 결과 보관 시간 (초)
+    """
+
+    def __init__(self, max_workers: int, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._job_ids_by_key: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, fn: Callable[..., Dict[str, Any]], *args, **kwargs) -> Tuple[str, bool]:
+        """
+        작업 등록 (같은 키의 유효한 작업이 있으면 재사용)
+
+        Returns:
+            (job_id, 새로 생성 여부)
+        """
+        with self._lock:
+            self._prune()
+
+            job_id = self._job_ids_by_key.get(key)
+            if job_id is not None and self._jobs[job_id]['status'] != JOB_FAILED:
+                return job_id, False
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': JOB_QUEUED,
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+                '_key': key,
+            }
+            self._job_ids_by_key[key] = job_id
+
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id, True
+
+    def _run(self, job_id: str, fn: Callable[..., Dict[str, Any]], args: tuple, kwargs: dict) -> None:
+        self._update(job_id, status=JOB_RUNNING, started_at=time.time())
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            print(f"❌ 분석 작업 실패 ({job_id}): {e}")
+            traceback.print_exc()
+            self._update(job_id, status=JOB_FAILED, error=str(e), finished_at=time.time())
+            return
+        self._update(job_id, status=JOB_SUCCEEDED, result=result, finished_at=time.time())
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회 (없거나 만료된 경우 None)"""
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {k: v for k, v in job.items() if not k.startswith('_')}
+
+    def _prune(self) -> None:
+        """완료 후 TTL이 지난 작업 삭제 (self._lock 보유 상태에서 호출)"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] is not None and now - job['finished_at'] > self.ttl_seconds
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if self._job_ids_by_key.get(job['_key']) == job_id:
+                del self._job_ids_by_key[job['_key']]
+
+    def shutdown(self, wait: bool = False) -> None:
+        """워커 풀 종료 (서버 종료 시)"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -2,7 +2,7 @@
 노드 모듈
 """
 
-from .extract import extract_all_texts
+from .extract import extract_all_texts, release_file_payloads
 from .processing import (
     chunk_all_documents,
     embed_all_chunks,
@@ -11,9 +11,11 @@ from .processing import (
     # [2025-01-10 suyeon] match_cross_references import 제거 (함수 삭제됨)
     save_to_csv,
 )
+from .dedup import deduplicate_chunks
 from .template_detection import detect_proposal_templates
 from .toc_extraction import (
     route_toc_extraction,
+    prefetch_template_toc,
     extract_toc_from_template,
     extract_toc_from_announcement_and_attachments
 )
@@ -22,6 +24,7 @@ from .response import build_response
 __all__ = [
     'extract_all_texts',
     'chunk_all_documents',
+    'deduplicate_chunks',
     'embed_all_chunks',
     'init_and_store_vectordb',
     'extract_features_rag',
@@ -29,7 +32,9 @@ __all__ = [
     'save_to_csv',
     'detect_proposal_templates',
     'route_toc_extraction',
+    'prefetch_template_toc',
     'extract_toc_from_template',
     'extract_toc_from_announcement_and_attachments',
+    'release_file_payloads',
     'build_response',
 ]
@@ -0,0 +1,169 @@
+"""
+청크 중복 제거 모듈
+임베딩 전에 거의 같은 청크(담당자 연락처, 법적 고지, 반복 머리말/꼬리말 등)를 MinHash로 제거
+
+✅ 핵심 기능: 문서 안에서 반복되는 상용구 청크를 한 번만 임베딩/저장
+📌 특징:
+  - 정규화 텍스트의 문자 n-gram(shingle) → MinHash 서명 (numpy 벡터 연산)
+  - LSH 밴딩으로 후보 쌍만 비교 → 청크 수에 대해 거의 선형
+  - 추정 Jaccard 유사도가 CHUNK_DEDUP_THRESHOLD 이상이면 중복
+  - 제거는 같은 문서(document_id) 안에서만: 문서 안에서 먼저 나온 청크를 대표로 남김
+  - 다른 문서의 중복은 제거하지 않고 state['chunk_duplicates']에 서로의 출처로만 기록
+    (공고문 부록에 양식이 다시 실려도 첨부 양식 파일의 청크가 VectorDB에 남아야
+     detect_proposal_templates의 file_name 필터 검색이 동작)
+  - 문서 간 대표는 공고문 청크 우선 (업로드 순서와 무관), 그다음 청크 순서
+  - chunks_used 근거가 제거/연결된 모든 출처 페이지를 가리킴
+"""
+
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..state_types import BatchState
+from ..config import (
+    CHUNK_DEDUP_ENABLED,
+    CHUNK_DEDUP_THRESHOLD,
+    CHUNK_DEDUP_SHINGLE_SIZE,
+    CHUNK_DEDUP_NUM_PERM,
+    CHUNK_DEDUP_BANDS,
+)
+from ..embeddings import normalize_embedding_text
+
+# MinHash 해시 함수 계수 (고정 시드 → 실행마다 같은 서명, 증분 재분석 시 같은 대표 청크)
+_rng = np.random.default_rng(20250110)
+_HASH_A = _rng.integers(1, 2**63, size=CHUNK_DEDUP_NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, 2**63, size=CHUNK_DEDUP_NUM_PERM, dtype=np.uint64)
+
+
+def _shingle_hashes(text: str, size: int = CHUNK_DEDUP_SHINGLE_SIZE) -> np.ndarray:
+    """정규화 텍스트의 문자 n-gram CRC32 해시 (중복 제거된 uint64 배열)"""
+    normalized = normalize_embedding_text(text)
+    if len(normalized) <= size:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """
+    MinHash 서명 (CHUNK_DEDUP_NUM_PERM개 uint32)
+
+    해시 함수: h(x) = (a * x + b) >> 32 (uint64 곱셈-시프트, 오버플로는 2^64 모듈러)
+    """
+    shingles = _shingle_hashes(text)
+    hashed = (_HASH_A[:, np.newaxis] * shingles[np.newaxis, :] + _HASH_B[:, np.newaxis]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def _duplicate_source(chunk: Dict[str, Any], removed: bool) -> Dict[str, Any]:
+    """
+    같은 내용 청크의 출처 정보 (근거 표시용)
+
+    Args:
+        removed: True면 같은 문서 중복으로 제거됨, False면 다른 문서 청크 (인덱스에 유지)
+    """
+    return {
+        'removed': removed,
+        'chunk_id': chunk['chunk_id'],
+        'document_id': chunk['document_id'],
+        'document_type': chunk['document_type'],
+        'file_name': chunk['file_name'],
+        'section': chunk['section'],
+        'page': chunk['page'],
+        'page_end': chunk.get('page_end', chunk['page']),
+    }
+
+
+def deduplicate_chunks(state: BatchState) -> BatchState:
+    """
+    거의 같은 청크 제거 (chunk_all_documents → embed_all_chunks 사이)
+
+    Returns:
+        state['all_chunks']: 같은 문서 중복을 제거한 리스트 (순서 유지, 다른 문서 중복은 유지)
+        state['chunk_duplicates']: {chunk_id: [같은 내용의 다른 청크 출처 (removed 여부 포함), ...]}
+    """
+    all_chunks = state['all_chunks']
+    state['chunk_duplicates'] = {}
+
+    if not CHUNK_DEDUP_ENABLED or len(all_chunks) < 2:
+        return state
+
+    print(f"\n{'='*60}")
+    print(f"🧹 청크 중복 제거 (MinHash, 임계값 {CHUNK_DEDUP_THRESHOLD}, 문서 내)")
+    print(f"{'='*60}")
+
+    signatures = np.stack([minhash_signature(chunk['text']) for chunk in all_chunks])
+    rows_per_band = CHUNK_DEDUP_NUM_PERM // CHUNK_DEDUP_BANDS
+
+    # 공고문 청크를 먼저 처리 → 문서 간 대표는 공고문 쪽 (같은 타입이면 청크 순서)
+    order = sorted(
+        range(len(all_chunks)),
+        key=lambda i: (all_chunks[i]['document_type'] != 'ANNOUNCEMENT', i)
+    )
+
+    # LSH: 밴드 하나라도 완전히 같은 청크끼리만 후보 → 남긴 청크와 비교
+    buckets: Dict[tuple, List[int]] = {}
+    removed_into: Dict[int, int] = {}  # 같은 문서 중복: 제거된 청크 → 대표 청크
+    linked_to: Dict[int, int] = {}  # 다른 문서 중복: 유지된 청크 → 문서 간 대표 청크
+
+    for i in order:
+        signature = signatures[i]
+        document_id = all_chunks[i]['document_id']
+        bands = [
+            (band, signature[band * rows_per_band:(band + 1) * rows_per_band].tobytes())
+            for band in range(CHUNK_DEDUP_BANDS)
+        ]
+
+        candidates = []
+        for key in bands:
+            candidates.extend(buckets.get(key, ()))
+
+        cross_match = None
+        for candidate in dict.fromkeys(candidates):
+            similarity = float(np.mean(signatures[candidate] == signature))
+            if similarity < CHUNK_DEDUP_THRESHOLD:
+                continue
+            if all_chunks[candidate]['document_id'] == document_id:
+                removed_into[i] = candidate
+                break
+            if cross_match is None:
+                cross_match = candidate
+
+        if i in removed_into:
+            continue
+
+        if cross_match is not None:
+            linked_to[i] = linked_to.get(cross_match, cross_match)
+
+        # 남긴 청크만 버킷에 등록 (중복의 중복이 다른 대표로 이어지지 않도록)
+        for key in bands:
+            buckets.setdefault(key, []).append(i)
+
+    duplicates: Dict[str, List[Dict[str, Any]]] = {}
+    removed_by_doc: Dict[str, int] = {}
+    for i, canonical in removed_into.items():
+        chunk = all_chunks[i]
+        duplicates.setdefault(all_chunks[canonical]['chunk_id'], []).append(_duplicate_source(chunk, removed=True))
+        removed_by_doc[chunk['document_id']] = removed_by_doc.get(chunk['document_id'], 0) + 1
+    for i, primary in linked_to.items():
+        duplicates.setdefault(all_chunks[primary]['chunk_id'], []).append(_duplicate_source(all_chunks[i], removed=False))
+        duplicates.setdefault(all_chunks[i]['chunk_id'], []).append(_duplicate_source(all_chunks[primary], removed=False))
+
+    kept_chunks = [chunk for i, chunk in enumerate(all_chunks) if i not in removed_into]
+
+    for doc in state.get('documents', []):
+        doc['duplicate_chunk_count'] = removed_by_doc.get(doc['document_id'], 0)
+
+    state['all_chunks'] = kept_chunks
+    state['chunk_duplicates'] = duplicates
+
+    print(f"  ✅ {len(all_chunks)}개 → {len(kept_chunks)}개 청크 (문서 내 중복 {len(removed_into)}개 제거, "
+          f"다른 문서와 중복 {len(linked_to)}개는 유지)")
+
+    return state
@@ -6,17 +6,40 @@
   - pdfplumber 사용: 텍스트 + 표 구조 동시 추출
   - 메모리 기반: 바이트 스트림에서 직접 처리 (디스크 I/O 불필요)
   - 공고문/첨부 동일한 품질 보장
+  - 병렬 추출: 대용량 공고/첨부는 페이지 단위로 프로세스 풀에 분산
+  - 추출 캐시: 파일 SHA-256이 같으면 pdfplumber를 열지 않고 디스크 캐시에서 복원
+  - 문서 텍스트는 PageTexts 버퍼 1개로 보관 (full_text = 버퍼, page_texts = 페이지별 위치)
+  - 반복 머리말/꼬리말 제거: 여러 페이지 가장자리에 반복되는 줄을 page_texts/full_text에서 제거
+    (제거한 줄은 doc['removed_boilerplate']에 기록)
+  - 업로드 원본은 저장소 핸들로 받고, 마지막 사용 노드(목차 추출) 뒤 release_file_payloads에서 해제
 """
 
 import pdfplumber
 import io
 import json
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 from ..state_types import BatchState
+from ..config import (
+    EXTRACT_MAX_WORKERS,
+    EXTRACT_PARALLEL_MIN_PAGES,
+    EXTRACT_PAGES_PER_TASK,
+    EXTRACTION_CACHE_VERSION,
+    STRIP_REPEATED_PAGE_LINES,
+    REPEATED_LINE_EDGE_LINES,
+    REPEATED_LINE_MIN_RATIO,
+    REPEATED_LINE_MIN_PAGES,
+)
+from ..artifacts import Artifact, ArtifactSink, analysis_artifact_id
+from ..blobs import file_source, release_file_blobs
+from ..cache import extraction_cache, sha256_of
+from ..documents import PageTexts
 from ..utils import extract_attachment_number
 
 
@@ -46,16 +69,12 @@ def _normalize_page_text(text: str) -> str:
     return normalized.strip()
 
 
-def export_documents_to_txt(documents: List[Dict[str, Any]], output_dir: str = "./extracted_texts") -> Path:
+def document_artifacts(documents: List[Dict[str, Any]], output_dir: str = "extracted_texts") -> List[Artifact]:
     """
-    documents 리스트의 full_text / page_texts / tables를 txt/json로 저장
+    documents 리스트의 full_text / page_texts / tables → (상대 경로, 내용) 목록 (파일 쓰기 없음)
     """
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-
-    print(f"\n{'='*60}")
-    print(f"📄 documents → txt/json 저장")
-    print(f"{'='*60}")
+    artifacts: List[Artifact] = []
+    extracted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
     for idx, doc in enumerate(documents, start=1):
         file_name = doc.get('file_name', f"document_{idx}")
@@ -64,50 +83,297 @@ def export_documents_to_txt(documents: List[Dict[str, Any]], output_dir: str = "
         tables = doc.get('tables', [])
         safe_filename = _sanitize_filename(file_name)
 
-        print(f"\n  [{idx}/{len(documents)}] {file_name} ({doc_type})")
-
         full_text = doc.get('full_text')
         if full_text:
-            full_text_path = output_path / f"{idx}_{safe_filename}_FULL.txt"
-            with open(full_text_path, 'w', encoding='utf-8') as f:
-                f.write(f"파일명: {file_name}\n")
-                f.write(f"문서 타입: {doc_type}\n")
-                f.write(f"페이지 수: {doc.get('page_count', 0)}\n")
-                f.write(f"표 개수: {len(tables)}\n")
-                f.write(f"추출 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(full_text)
-            print(f"    ✓ 전체 텍스트 저장: {full_text_path.name}")
-
-        if page_texts:
-            pages_dir = output_path / f"{idx}_{safe_filename}_pages"
-            pages_dir.mkdir(exist_ok=True)
-            for page_num, page_text in page_texts.items():
-                page_file = pages_dir / f"page_{page_num:03d}.txt"
-                with open(page_file, 'w', encoding='utf-8') as f:
-                    f.write(f"파일명: {file_name}\n")
-                    f.write(f"페이지: {page_num}\n")
-                    f.write(f"문서 타입: {doc_type}\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(page_text or "")
-            print(f"    ✓ 페이지별 텍스트 저장: {pages_dir.name} (총 {len(page_texts)}개)")
+            header = (
+                f"파일명: {file_name}\n"
+                f"문서 타입: {doc_type}\n"
+                f"페이지 수: {doc.get('page_count', 0)}\n"
+                f"표 개수: {len(tables)}\n"
+                f"추출 시간: {extracted_at}\n"
+                + "=" * 80 + "\n\n"
+            )
+            artifacts.append((f"{output_dir}/{idx}_{safe_filename}_FULL.txt", header + full_text))
+
+        for page_num, page_text in page_texts.items():
+            header = (
+                f"파일명: {file_name}\n"
+                f"페이지: {page_num}\n"
+                f"문서 타입: {doc_type}\n"
+                + "=" * 80 + "\n\n"
+            )
+            artifacts.append((f"{output_dir}/{idx}_{safe_filename}_pages/page_{page_num:03d}.txt", header + (page_text or "")))
 
         if tables:
-            tables_path = output_path / f"{idx}_{safe_filename}_tables.json"
-            with open(tables_path, 'w', encoding='utf-8') as f:
-                json.dump(tables, f, ensure_ascii=False, indent=2)
-            print(f"    ✓ 표 데이터 저장: {tables_path.name} ({len(tables)}개)")
+            artifacts.append((
+                f"{output_dir}/{idx}_{safe_filename}_tables.json",
+                json.dumps(tables, ensure_ascii=False, indent=2)
+            ))
+
+    return artifacts
+
+
+def export_documents_to_txt(documents: List[Dict[str, Any]], output_dir: str = "./extracted_texts") -> Path:
+    """
+    documents 리스트의 full_text / page_texts / tables를 txt/json로 즉시 저장 (수동 디버깅용)
+
+    분석 그래프에서는 artifact sink가 document_artifacts()를 백그라운드로 기록
+    """
+    output_path = Path(output_dir)
+    for name, content in document_artifacts(documents, output_dir=output_path.name):
+        path = output_path.parent / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
 
     print(f"\n  ✅ 저장 완료: {output_path.resolve()}")
     return output_path
 
 
-def extract_all_texts(state: BatchState) -> BatchState:
+def _open_pdf(source):
+    """바이트 데이터 또는 파일 경로에서 pdfplumber 문서 열기"""
+    if isinstance(source, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+
+def _extract_page(page, page_num: int) -> Dict[str, Any]:
+    """단일 페이지에서 정규화된 텍스트와 표 추출"""
+    text = _normalize_page_text(page.extract_text() or "")
+
+    tables = []
+    for table_idx, table in enumerate(page.extract_tables() or []):
+        tables.append({
+            'page_number': page_num,
+            'table_index': table_idx,
+            'data': table,
+            'rows': len(table),
+            'cols': len(table[0]) if table else 0
+        })
+
+    return {'page_number': page_num, 'text': text, 'tables': tables}
+
+
+def _extract_pages(source, page_numbers: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """
+    PDF의 지정된 페이지들 추출 (프로세스 풀 워커 진입점)
+
+    Args:
+        source: PDF 바이트 데이터 또는 파일 경로
+        page_numbers: 추출할 페이지 번호 (1-based), None이면 전체 페이지
+
+    Returns:
+        페이지 순서대로 [{'page_number', 'text', 'tables'}, ...]
+    """
+    with _open_pdf(source) as pdf:
+        if page_numbers is None:
+            page_numbers = range(1, len(pdf.pages) + 1)
+        return [_extract_page(pdf.pages[page_num - 1], page_num) for page_num in page_numbers]
+
+
+def _count_pages(source) -> int:
+    """PDF 페이지 수 확인 (샤드 분할용)"""
+    with _open_pdf(source) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pages_parallel(sources: Dict[int, Any], page_counts: Dict[int, int], max_workers: int) -> Dict[int, Any]:
+    """
+    여러 파일의 페이지를 샤드로 나눠 프로세스 풀에서 병렬 추출
+
+    바이트 데이터는 샤드마다 워커로 복사(pickle)되지 않도록 임시 파일로 한 번만 기록하고
+    워커에는 경로만 전달한다.
+
+    Args:
+        sources: {file_idx: PDF 바이트 또는 경로}
+        page_counts: {file_idx: 페이지 수}
+        max_workers: 프로세스 풀 워커 수
+
+    Returns:
+        {file_idx: 페이지 결과 리스트 또는 해당 파일의 Exception}
+    """
+    results: Dict[int, Any] = {}
+    temp_paths = []
+
+    try:
+        shards = []  # (file_idx, 경로, page_numbers)
+        for file_idx, page_count in page_counts.items():
+            source = sources[file_idx]
+            if isinstance(source, (bytes, bytearray)):
+                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+                    tmp.write(source)
+                temp_paths.append(tmp.name)
+                source = tmp.name
+
+            # 코어 수만큼 고르게 나누되, 샤드가 너무 잘게 쪼개지지 않도록 하한 적용
+            pages_per_task = max(EXTRACT_PAGES_PER_TASK, -(-page_count // max_workers))
+            for start in range(1, page_count + 1, pages_per_task):
+                end = min(start + pages_per_task, page_count + 1)
+                shards.append((file_idx, source, list(range(start, end))))
+            results[file_idx] = []
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_extract_pages, source, page_numbers): file_idx
+                for file_idx, source, page_numbers in shards
+            }
+            for future in as_completed(futures):
+                file_idx = futures[future]
+                try:
+                    pages = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    results[file_idx] = e
+                    continue
+                if not isinstance(results[file_idx], Exception):
+                    results[file_idx].extend(pages)
+    finally:
+        for temp_path in temp_paths:
+            Path(temp_path).unlink(missing_ok=True)
+
+    # 샤드 완료 순서와 무관하게 페이지 순서 복원
+    for pages in results.values():
+        if not isinstance(pages, Exception):
+            pages.sort(key=lambda p: p['page_number'])
+
+    return results
+
+
+_SPACES_RE = re.compile(r'\s+')
+# 쪽 번호 줄: "3", "- 3 -", "3 / 20", "(3)", "p. 3", "Page 3 of 20", "3쪽", "페이지 3"
+_PAGE_NUMBER_LINE_RE = re.compile(
+    r'^[-–—\s(\[]*(?:page|p\.|페이지)?\s*(\d+)\s*(?:(?:/|of)\s*\d+)?\s*(?:쪽|페이지)?[-–—\s)\]]*$',
+    re.IGNORECASE
+)
+
+
+def _repeated_line_key(line: str) -> str:
+    """머리말/꼬리말 비교용 줄 정규화 (공백 압축, 원문 그대로 비교)"""
+    return _SPACES_RE.sub(' ', line.strip())
+
+
+def _edge_line_indices(lines: List[str]) -> List[int]:
+    """
+    페이지 위/아래 가장자리의 비어 있지 않은 줄 번호
+
+    각각 최대 REPEATED_LINE_EDGE_LINES개, 짧은 페이지는 본문을 건드리지 않도록 줄 수의 1/4까지만
+    """
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    edge = min(REPEATED_LINE_EDGE_LINES, max(1, len(non_empty) // 4))
+    if len(non_empty) < 2:
+        return []
+    return sorted(set(non_empty[:edge] + non_empty[-edge:]))
+
+
+def _outermost_page_numbers(page_num: int, lines: List[str]) -> Dict[str, Tuple[int, int]]:
+    """
+    페이지 맨 위/맨 아래 비어 있지 않은 줄이 쪽 번호 형식이면 {'top'|'bottom': (줄 번호, 번호 - 페이지 번호)}
+
+    쪽 번호 여부는 strip_repeated_page_lines에서 여러 페이지의 (번호 - 페이지 번호)가 같은지로 판단
+    """
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    if len(non_empty) < 2:
+        return {}
+    found = {}
+    for position, i in (('top', non_empty[0]), ('bottom', non_empty[-1])):
+        match = _PAGE_NUMBER_LINE_RE.match(lines[i].strip())
+        if match:
+            found[position] = (i, int(match.group(1)) - page_num)
+    return found
+
+
+def strip_repeated_page_lines(page_texts: Dict[int, str]) -> Tuple[Dict[int, str], List[Dict[str, Any]]]:
+    """
+    여러 페이지 가장자리에 반복되는 줄(머리말/꼬리말/쪽 번호) 제거
+
+    - 머리말/꼬리말: 가장자리 줄을 원문(공백 압축) 그대로 비교, REPEATED_LINE_MIN_RATIO 이상 페이지에 나오면 제거
+    - 쪽 번호: 맨 위/맨 아래 줄만 검사, 숫자가 페이지 순서를 따를 때(번호 = 페이지 번호 + k, k가 여러 페이지에서 같음)만 제거
+      (표 금액/연도/배점처럼 가장자리에 걸린 숫자는 페이지 순서를 따르지 않으므로 유지)
+
+    Args:
+        page_texts: {페이지 번호: 텍스트}
+
+    Returns:
+        (정리된 page_texts, 제거된 줄 정보 [{'line': 첫 번째 원문 또는 '<쪽 번호 ...>', 'pages': 제거된 페이지 수}])
+    """
+    if len(page_texts) < REPEATED_LINE_MIN_PAGES:
+        return page_texts, []
+
+    page_lines = {page_num: text.split('\n') for page_num, text in page_texts.items()}
+    min_pages = max(2, int(len(page_texts) * REPEATED_LINE_MIN_RATIO + 0.999))
+
+    # 쪽 번호: 위치(맨 위/맨 아래)별로 (번호 - 페이지 번호)가 가장 많이 겹치는 offset
+    page_numbers = {page_num: _outermost_page_numbers(page_num, lines) for page_num, lines in page_lines.items()}
+    page_number_offsets: Dict[str, int] = {}
+    for position in ('top', 'bottom'):
+        offset_counts: Dict[int, int] = {}
+        for found in page_numbers.values():
+            if position in found:
+                offset = found[position][1]
+                offset_counts[offset] = offset_counts.get(offset, 0) + 1
+        if offset_counts:
+            offset, count = max(offset_counts.items(), key=lambda item: item[1])
+            if count >= min_pages:
+                page_number_offsets[position] = offset
+
+    page_number_lines: Dict[int, Dict[int, str]] = {}  # {페이지 번호: {줄 번호: 위치}}
+    for page_num, found in page_numbers.items():
+        for position, (i, offset) in found.items():
+            if page_number_offsets.get(position) == offset:
+                page_number_lines.setdefault(page_num, {})[i] = position
+
+    # 머리말/꼬리말: 가장자리 줄이 몇 페이지에 나오는지 (페이지당 1회, 쪽 번호로 판단한 줄 제외)
+    page_counts: Dict[str, int] = {}
+    for page_num, lines in page_lines.items():
+        skip = page_number_lines.get(page_num, {})
+        for key in {_repeated_line_key(lines[i]) for i in _edge_line_indices(lines) if i not in skip}:
+            page_counts[key] = page_counts.get(key, 0) + 1
+
+    repeated = {key for key, count in page_counts.items() if count >= min_pages}
+    if not repeated and not page_number_lines:
+        return page_texts, []
+
+    cleaned: Dict[int, str] = {}
+    removed: Dict[str, Dict[str, Any]] = {}
+    for page_num, lines in page_lines.items():
+        drop = set()
+        for i, position in page_number_lines.get(page_num, {}).items():
+            drop.add(i)
+            offset = page_number_offsets[position]
+            label = f"<쪽 번호: {'맨 위' if position == 'top' else '맨 아래'}, 페이지 {offset:+d}>"
+            info = removed.setdefault(label, {'line': label, 'pages': 0})
+            info['pages'] += 1
+        for i in _edge_line_indices(lines):
+            if i in drop:
+                continue
+            key = _repeated_line_key(lines[i])
+            if key in repeated:
+                drop.add(i)
+                info = removed.setdefault(key, {'line': lines[i].strip(), 'pages': 0})
+                info['pages'] += 1
+        if drop:
+            cleaned[page_num] = '\n'.join(line for i, line in enumerate(lines) if i not in drop).strip()
+        else:
+            cleaned[page_num] = page_texts[page_num]
+
+    return cleaned, list(removed.values())
+
+
+def _extraction_cache_key(file_hash: str) -> str:
+    """추출 로직 버전을 포함한 캐시 키"""
+    return f"v{EXTRACTION_CACHE_VERSION}_{file_hash}"
+
+
+def extract_all_texts(state: BatchState, artifact_sink: Optional[ArtifactSink] = None) -> BatchState:
     """
     모든 파일에서 텍스트 추출 (통합 방식)
     - pdfplumber 사용: 텍스트 + 표 구조 추출
     - 공고문/첨부 구분 없이 동일한 품질 보장
     - 메모리 기반: 바이트 스트림에서 직접 추출 (파일 경로 불필요)
+    - 병렬 모드: 페이지(및 파일)를 샤드로 나눠 프로세스 풀에서 추출 후 페이지 순서대로 재조립
+      (EXTRACT_MAX_WORKERS=1 이거나 총 페이지 수가 적으면 기존 직렬 방식)
+    - 추출 캐시: 파일 SHA-256으로 이전 추출 결과(page_texts, tables, page_count)를 먼저 조회
+    - 디버그 덤프(./extracted_texts): artifact_sink가 있으면 백그라운드 저장 요청만 하고 반환
     """
     files = state['files']
     documents = []
@@ -116,9 +382,54 @@ def extract_all_texts(state: BatchState) -> BatchState:
     print(f"📄 {len(files)}개 파일 텍스트 추출 시작 (메모리 기반 pdfplumber)")
     print(f"{'='*60}")
 
+    # 업로드 저장소 핸들, 바이트 데이터 또는 파일 경로 지원 (하위 호환성)
+    sources: Dict[int, Any] = {}
+    file_hashes: Dict[int, str] = {}
+    for file_idx, file_info in enumerate(files):
+        source = file_source(file_info)
+        if source:
+            sources[file_idx] = source
+            if file_info.get('blob'):
+                file_hashes[file_idx] = file_info['blob']  # 핸들 = SHA-256
+                continue
+            try:
+                file_hashes[file_idx] = sha256_of(source)
+            except OSError:
+                pass  # 경로를 읽을 수 없으면 캐시 없이 진행 (추출 단계에서 에러 기록)
+
+    # ========== 추출 캐시 조회 (파일 해시 기반) ==========
+    extracted: Dict[int, Any] = {}
+    for file_idx, file_hash in file_hashes.items():
+        cached = extraction_cache.get(_extraction_cache_key(file_hash))
+        if cached is not None:
+            extracted[file_idx] = cached['pages']
+    cache_hits = set(extracted)
+    if cache_hits:
+        print(f"\n  ⚡ 추출 캐시 적중: {len(cache_hits)}/{len(sources)}개 파일")
+
+    pending = {file_idx: source for file_idx, source in sources.items() if file_idx not in cache_hits}
+
+    # ========== 병렬 추출 (프로세스 풀) ==========
+    if EXTRACT_MAX_WORKERS > 1 and pending:
+        page_counts = {}
+        for file_idx, source in pending.items():
+            try:
+                page_counts[file_idx] = _count_pages(source)
+            except Exception:
+                pass  # 열 수 없는 파일은 직렬 경로에서 에러 기록
+
+        total_pages = sum(page_counts.values())
+        try:
+            if total_pages >= EXTRACT_PARALLEL_MIN_PAGES:
+                workers = min(EXTRACT_MAX_WORKERS, total_pages)
+                print(f"\n  ⚡ 병렬 추출: 총 {total_pages}페이지, 워커 {workers}개")
+                extracted.update(_extract_pages_parallel(pending, page_counts, workers))
+        except Exception as e:
+            # 프로세스 풀 생성/직렬화 실패 시 기존 직렬 방식으로 fallback
+            print(f"\n  ⚠️  병렬 추출 실패 → 직렬 추출로 전환: {e}")
+            extracted = {file_idx: extracted[file_idx] for file_idx in cache_hits}
+
     for file_idx, file_info in enumerate(files):
-        # 바이트 데이터 또는 파일 경로 지원 (하위 호환성)
-        file_bytes = file_info.get('bytes')
         file_path = file_info.get('path')
         filename = file_info['filename']
         folder = file_info['folder']
@@ -131,54 +442,62 @@ def extract_all_texts(state: BatchState) -> BatchState:
         try:
             doc_id = f"doc_{state['project_idx']}_{file_idx+1}"
 
+            if file_idx not in sources:
+                raise ValueError(f"파일 정보 부족: blob, bytes 또는 path 필요")
+
             # ========== 모든 문서: pdfplumber 사용 (표 + 텍스트) ==========
-            if file_bytes:
-                # 바이트 스트림에서 직접 열기 (메모리 기반)
-                print(f"    📊 방식: pdfplumber (메모리 스트림)")
-                pdf_stream = io.BytesIO(file_bytes)
-                pdf_file = pdfplumber.open(pdf_stream)
-            elif file_path:
-                # 파일 경로에서 열기 (하위 호환성)
-                print(f"    📊 방식: pdfplumber (파일 경로)")
-                pdf_file = pdfplumber.open(file_path)
+            # 추출 결과는 문서 생성 후 바로 해제 (페이지 텍스트를 중복 보관하지 않음)
+            pages = extracted.pop(file_idx, None)
+            if isinstance(pages, Exception):
+                raise pages
+            if file_idx in cache_hits:
+                print(f"    📊 방식: 추출 캐시 (sha256 {file_hashes[file_idx][:12]}...)")
+            elif pages is not None:
+                print(f"    📊 방식: pdfplumber (프로세스 풀 병렬)")
             else:
-                raise ValueError(f"파일 정보 부족: bytes 또는 path 필요")
-
-            with pdf_file as pdf:
-                full_text = ""
-                page_texts = {}
-                all_tables = []
-
-                for page_num, page in enumerate(pdf.pages):
-                    # 텍스트 추출
-                    text = page.extract_text() or ""
-                    text = _normalize_page_text(text)
-                    full_text += f"\n[페이지 {page_num + 1}]\n{text}"
-                    page_texts[page_num + 1] = text
-
-                    # 표 추출
-                    tables = page.extract_tables()
-                    if tables:
-                        for table_idx, table in enumerate(tables):
-                            all_tables.append({
-                                'page_number': page_num + 1,
-                                'table_index': table_idx,
-                                'data': table,
-                                'rows': len(table),
-                                'cols': len(table[0]) if table else 0
-                            })
+                if isinstance(sources[file_idx], (bytes, bytearray)):
+                    print(f"    📊 방식: pdfplumber (메모리 스트림)")
+                else:
+                    print(f"    📊 방식: pdfplumber (파일 경로)")
+                pages = _extract_pages(sources[file_idx])
+
+            if file_idx in file_hashes and file_idx not in cache_hits:
+                extraction_cache.put(
+                    _extraction_cache_key(file_hashes[file_idx]),
+                    {'pages': pages, 'page_count': len(pages)}
+                )
+
+            page_texts = {}
+            all_tables = []
+            for page in pages:
+                page_texts[page['page_number']] = page['text']
+                all_tables.extend(page['tables'])
+
+            # 반복 머리말/꼬리말 제거 (청킹/임베딩/LLM 컨텍스트에서 중복 제거)
+            removed_boilerplate = []
+            if STRIP_REPEATED_PAGE_LINES:
+                page_texts, removed_boilerplate = strip_repeated_page_lines(page_texts)
+                if removed_boilerplate:
+                    removed_lines = sum(item['pages'] for item in removed_boilerplate)
+                    print(f"    🧹 반복 머리말/꼬리말 {len(removed_boilerplate)}종 제거 ({removed_lines}줄)")
+
+            # page_texts/full_text는 버퍼 1개를 공유 (PageTexts: 페이지별 위치만 보관)
+            page_texts = PageTexts(page_texts)
+            full_text = page_texts.full_text
 
             documents.append({
                 'document_id': doc_id,
                 'file_name': filename,
                 'file_path': file_path if file_path else None,  # 경로가 있으면 저장, 없으면 None
+                'file_hash': file_hashes.get(file_idx),  # SHA-256 (캐시/증분 분석 키)
                 'document_type': doc_type,
                 'folder': folder,
                 'full_text': full_text,
                 'page_texts': page_texts,
                 'page_count': len(page_texts),
                 'attachment_number': extract_attachment_number(filename),
-                'tables': all_tables
+                'tables': all_tables,
+                'removed_boilerplate': removed_boilerplate
             })
 
             print(f"    ✓ 추출 완료: {len(full_text):,}자, {len(page_texts)}페이지, {len(all_tables)}개 표")
@@ -196,7 +515,25 @@ def extract_all_texts(state: BatchState) -> BatchState:
 
     print(f"\n  ✅ 총 {len(documents)}개 문서, {total_chars:,}자, {total_pages}페이지, {total_tables}개 표")
 
-    if documents:
-        export_documents_to_txt(documents)
+    # 디버그 덤프는 artifact sink로 넘기고 바로 다음 노드 진행 (disabled면 생략)
+    if documents and artifact_sink is not None and artifact_sink.enabled:
+        artifact_sink.submit(analysis_artifact_id(state), document_artifacts(documents))
+        print(f"  📝 추출 텍스트 덤프: {artifact_sink.mode} 저장 요청")
 
     return state
+
+
+def release_file_payloads(state: BatchState) -> BatchState:
+    """
+    업로드 원본 해제 (원본을 쓰는 마지막 노드인 목차 추출 직후)
+
+    원본 사용 노드: extract_all_texts(pdfplumber), extract_features_rag(핵심 정보 Vision),
+    extract_toc_from_template(목차 Vision) → 이후 저장/응답 노드는 추출 결과만 사용
+
+    Returns:
+        state['files']: 'blob'/'bytes' 키가 제거된 파일 정보 (filename, folder 등은 유지)
+    """
+    released = release_file_blobs(state.get('files', []))
+    if released:
+        print(f"\n  🧹 업로드 원본 해제: {released}개 파일")
+    return state
@@ -9,27 +9,128 @@ Vision API 기반 메타 정보 추출 유틸리티
   - 제목/헤더 부분의 레이아웃 정보 활용
   - 정확도 향상을 위한 Vision API 전용 파이프라인
   - 첫 10페이지까지 분석하여 핵심 정보가 여러 페이지에 분산된 경우도 처리
+  - 통합 모드: 핵심 정보 Feature 전체를 Vision API 1회 호출로 추출
+    (found=false 항목만 Feature별 단일 추출로 재시도)
 """
 
-import io
-import base64
 import json
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
 
+from ..page_images import get_page_images, to_image_contents
+from ..utils import call_with_backoff
+
 # OpenAI 클라이언트 초기화
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
+def _feature_instructions(feature_type: str, feature_key: Optional[str]) -> Dict[str, str]:
+    """
+    Feature 타입별 프롬프트 지시문 (단일/통합 Vision 추출 공용)
+
+    Returns:
+        {"content_instruction", "date_emphasis", "user_examples", "user_emphasis"}
+    """
+    # 날짜/기간이 필요한 Feature인지 판단
+    date_required_features = ['announcement_date', 'application_period', 'project_period']
+    requires_date = feature_key in date_required_features if feature_key else False
+
+    # 평가기준인지 판단
+    is_evaluation_criteria = feature_key == 'evaluation_criteria' if feature_key else False
+
+    # 시스템 프롬프트: Feature 타입에 따라 조건부 작성
+    if is_evaluation_criteria:
+        # 평가기준: 항목별 배점 + 세부평가기준 추출
+        content_instruction = f"""실제 {feature_type} 항목과 배점 - **대분류, 중분류, 세부평가기준, 배점을 계층적으로 모두 포함**"""
+        date_emphasis = """
+**⚠️ 매우 중요 (평가기준 및 배점 - 세부기준 포함):**
+- content 필드에는 **대분류 → 중분류 → 세부평가기준**의 계층 구조를 모두 포함하세요
+- 총점은 100점이어야 합니다
+- 각 항목의 배점뿐만 아니라 **세부 평가기준 내용**도 반드시 포함하세요
+- 표 형태로 제시된 경우, 표의 **모든 행(대분류, 중분류, 세부기준)**을 빠짐없이 읽어서 추출하세요
+- 예시 형식:
+  * "사업 타당성(25점): 목적 부합성(10점) - [세부기준: 사업목적의 명확성, 정책 부합도 등], 사업수행 역량(15점) - [세부기준: 조직구성의 적절성, 유사사업 수행경험 등]"
+  * "사업 경쟁력(40점): 사업 전략·우수성(15점) - [세부기준: 차별화된 전략, 기술적 우수성], 기술개발 우수성(25점) - [세부기준: 기술의 창의성, 기술개발 계획의 구체성]"
+- **대분류(배점) / 중분류(배점) - [세부평가기준: 구체적 내용]** 형식으로 작성하세요
+- 세부평가기준이 없는 항목도 있을 수 있으니, 있는 경우만 포함하세요
+- 모든 계층의 배점을 정확히 포함하세요 (대분류 배점 = 하위 항목 배점의 합)"""
+    elif requires_date:
+        # 날짜/기간 정보가 필요한 Feature (공고일, 접수기간, 사업기간)
+        content_instruction = f"""실제 {feature_type} 값 - **구체적인 날짜/기간을 반드시 포함** (예: '2025년 9월 9일', '2025년 10월 1일 ~ 2026년 12월 31일')"""
+        date_emphasis = """
+**⚠️ 매우 중요 (날짜/기간 정보):**
+- content 필드에는 **구체적인 날짜나 기간**을 반드시 포함하세요
+- 요약하지 말고, 공고문에 명시된 **정확한 날짜/기간**을 그대로 추출하세요
+- 예시: "2025년 9월 9일", "2025년 10월 1일 ~ 2026년 12월 31일", "2025.09.30(화) 14:00까지" 등"""
+    elif feature_key == 'support_scale':
+        # 지원규모: 숫자/금액만 필요
+        content_instruction = f"""실제 {feature_type} 값 - **구체적인 숫자/금액을 반드시 포함** (예: '연간 최대 20억원 이내', '7.35억원 이내')"""
+        date_emphasis = """
+**⚠️ 매우 중요 (지원규모):**
+- content 필드에는 **구체적인 숫자/금액**을 반드시 포함하세요
+- 요약하지 말고, 공고문에 명시된 **정확한 금액/규모**를 그대로 추출하세요
+- 예시: "연간 최대 20억원 이내", "7.35억원 이내", "100억원" 등
+- **날짜나 기간 정보는 포함하지 마세요**"""
+    else:
+        # 사업명, 공고기관 등: 순수하게 해당 값만 (날짜/기간/숫자 불필요)
+        content_instruction = f"""실제 {feature_type} 값만 추출 (예: '2025년 공공AX 프로젝트 사업', '과학기술정보통신부')"""
+        date_emphasis = f"""
+**⚠️ 매우 중요:**
+- content 필드에는 **{feature_type} 값만** 추출하세요
+- **다른 정보(날짜, 기간, 금액 등)를 섞지 마세요**
+- 요약하지 말고, 공고문에 명시된 **정확한 {feature_type} 값**만 그대로 추출하세요
+- 예시:
+  * 사업명: "2025년 공공AX 프로젝트 사업" (날짜나 기간 정보 포함 금지)
+  * 공고기관: "과학기술정보통신부" (날짜나 기간 정보 포함 금지)"""
+
+    # 사용자 프롬프트: Feature 타입에 따라 조건부
+    if is_evaluation_criteria:
+        user_examples = f"""
+  * {feature_type} 추출 형식 (계층 구조 포함):
+    - "사업 타당성(25점): 목적 부합성(10점) - [세부기준: 사업목적의 명확성, 정책연계성, 지역발전 기여도], 사업수행 역량(15점) - [세부기준: 조직구성의 적절성, 수행인력의 전문성, 유사사업 수행경험]"
+    - "사업 경쟁력(40점): 사업 전략·우수성(15점) - [세부기준: 차별화된 사업전략, 기술적 우수성, 혁신성], 기술개발 우수성(25점) - [세부기준: 기술의 창의성, 기술개발 계획의 구체성 및 실현가능성]"
+  * 표 형태인 경우 처리 방법:
+    1. 대분류 행: "사업 타당성(25점)"과 같이 대분류명과 배점 확인
+    2. 중분류 행: "목적 부합성(10점)", "사업수행 역량(15점)"과 같이 하위 항목 확인
+    3. 세부기준 행 또는 열: "사업목적의 명확성", "정책연계성" 등의 구체적 평가기준 확인
+    4. 모든 행을 빠짐없이 읽어서 계층 구조 완성
+  * 총점이 100점이 되도록 모든 배점을 확인하세요"""
+        user_emphasis = "content 필드에는 대분류, 중분류, 세부평가기준을 계층적으로 모두 포함하세요. 총점은 100점이어야 합니다."
+    elif requires_date:
+        user_examples = f"""
+  * {feature_type}: "2025년 9월 9일" 또는 "2025.09.09" (요약하지 말고 정확한 날짜)
+  * 또는 "2025년 10월 1일 ~ 2026년 12월 31일" (기간인 경우 시작일과 종료일 모두 포함)
+  * 또는 "2025.09.30(화) 14:00까지" (시간까지 포함된 경우)"""
+        user_emphasis = "content 필드에는 구체적인 날짜/기간을 반드시 포함하세요."
+    elif feature_key == 'support_scale':
+        user_examples = f"""
+  * {feature_type}: "연간 최대 20억원 이내" 또는 "7.35억원 이내" (정확한 숫자/금액)
+  * **날짜나 기간 정보는 포함하지 마세요**"""
+        user_emphasis = "content 필드에는 구체적인 숫자/금액만 포함하세요. 날짜/기간은 포함하지 마세요."
+    else:
+        user_examples = f"""
+  * {feature_type}: "{feature_type} 값만" (예: 사업명이면 "2025년 공공AX 프로젝트 사업"만, 공고기관이면 "과학기술정보통신부"만)
+  * **다른 정보(날짜, 기간, 금액 등)를 섞지 마세요**"""
+        user_emphasis = f"content 필드에는 {feature_type} 값만 추출하세요. 다른 정보를 섞지 마세요."
+
+    return {
+        "content_instruction": content_instruction,
+        "date_emphasis": date_emphasis,
+        "user_examples": user_examples,
+        "user_emphasis": user_emphasis,
+    }
+
+
 def extract_metadata_with_vision(
     file_bytes: bytes,
     file_name: str,
     feature_type: str,
     feature_description: str,
-    feature_key: str = None  # Feature 키 (날짜 포함 여부 판단용)
+    feature_key: str = None,  # Feature 키 (날짜 포함 여부 판단용)
+    doc_key: Optional[str] = None  # 페이지 이미지 캐시 키 (문서 SHA-256)
 ) -> Optional[Dict[str, Any]]:
     """
     Vision API를 사용하여 공고문 첫 10페이지에서 메타 정보 추출
@@ -39,6 +140,7 @@ def extract_metadata_with_vision(
         file_name: 파일명 (로깅용)
         feature_type: 추출할 Feature 타입 (예: "사업명", "공고번호")
         feature_description: Feature 설명
+        doc_key: 페이지 이미지 캐시 키 (없으면 file_bytes의 SHA-256)
     
     Returns:
         추출된 메타 정보 딕셔너리 또는 None
@@ -51,94 +153,32 @@ def extract_metadata_with_vision(
             "writing_strategy": {...}
         }
     """
-    try:
-        from pdf2image import convert_from_bytes
-    except ImportError:
-        print(f"    ⚠️  pdf2image 라이브러리가 설치되지 않았습니다.")
-        return None
-
     try:
         print(f"    👁️  Vision API로 {feature_type} 추출 중...")
 
         # 첫 10페이지까지 분석 (핵심 정보는 앞쪽 페이지에 분산될 수 있음)
-        images = convert_from_bytes(
+        # 페이지 이미지는 문서당 1회만 렌더링/인코딩하여 모든 핵심 Feature가 공유
+        image_urls = get_page_images(
             file_bytes,
-            dpi=150,  # 높은 해상도로 제목/헤더 부분 정확하게 인식
             first_page=1,
-            last_page=10
+            last_page=10,
+            dpi=150,  # 높은 해상도로 제목/헤더 부분 정확하게 인식
+            doc_key=doc_key
         )
 
-        if not images:
+        if not image_urls:
             print(f"    ⚠️  PDF 이미지 변환 실패")
             return None
 
-        # 이미지를 base64로 인코딩
-        image_contents = []
-        for idx, img in enumerate(images):
-            img_buffer = io.BytesIO()
-            img.save(img_buffer, format='PNG')
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-            image_contents.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/png;base64,{img_base64}",
-                    "detail": "high"  # 높은 디테일로 제목/헤더 정확히 인식
-                }
-            })
-
-        # 날짜/기간이 필요한 Feature인지 판단
-        date_required_features = ['announcement_date', 'application_period', 'project_period']
-        requires_date = feature_key in date_required_features if feature_key else False
-
-        # 평가기준인지 판단
-        is_evaluation_criteria = feature_key == 'evaluation_criteria' if feature_key else False
-
-        # 시스템 프롬프트: Feature 타입에 따라 조건부 작성
-        if is_evaluation_criteria:
-            # 평가기준: 항목별 배점 + 세부평가기준 추출
-            content_instruction = f"""실제 {feature_type} 항목과 배점 - **대분류, 중분류, 세부평가기준, 배점을 계층적으로 모두 포함**"""
-            date_emphasis = """
-**⚠️ 매우 중요 (평가기준 및 배점 - 세부기준 포함):**
-- content 필드에는 **대분류 → 중분류 → 세부평가기준**의 계층 구조를 모두 포함하세요
-- 총점은 100점이어야 합니다
-- 각 항목의 배점뿐만 아니라 **세부 평가기준 내용**도 반드시 포함하세요
-- 표 형태로 제시된 경우, 표의 **모든 행(대분류, 중분류, 세부기준)**을 빠짐없이 읽어서 추출하세요
-- 예시 형식:
-  * "사업 타당성(25점): 목적 부합성(10점) - [세부기준: 사업목적의 명확성, 정책 부합도 등], 사업수행 역량(15점) - [세부기준: 조직구성의 적절성, 유사사업 수행경험 등]"
-  * "사업 경쟁력(40점): 사업 전략·우수성(15점) - [세부기준: 차별화된 전략, 기술적 우수성], 기술개발 우수성(25점) - [세부기준: 기술의 창의성, 기술개발 계획의 구체성]"
-- **대분류(배점) / 중분류(배점) - [세부평가기준: 구체적 내용]** 형식으로 작성하세요
-- 세부평가기준이 없는 항목도 있을 수 있으니, 있는 경우만 포함하세요
-- 모든 계층의 배점을 정확히 포함하세요 (대분류 배점 = 하위 항목 배점의 합)"""
-        elif requires_date:
-            # 날짜/기간 정보가 필요한 Feature (공고일, 접수기간, 사업기간)
-            content_instruction = f"""실제 {feature_type} 값 - **구체적인 날짜/기간을 반드시 포함** (예: '2025년 9월 9일', '2025년 10월 1일 ~ 2026년 12월 31일')"""
-            date_emphasis = """
-**⚠️ 매우 중요 (날짜/기간 정보):**
-- content 필드에는 **구체적인 날짜나 기간**을 반드시 포함하세요
-- 요약하지 말고, 공고문에 명시된 **정확한 날짜/기간**을 그대로 추출하세요
-- 예시: "2025년 9월 9일", "2025년 10월 1일 ~ 2026년 12월 31일", "2025.09.30(화) 14:00까지" 등"""
-        elif feature_key == 'support_scale':
-            # 지원규모: 숫자/금액만 필요
-            content_instruction = f"""실제 {feature_type} 값 - **구체적인 숫자/금액을 반드시 포함** (예: '연간 최대 20억원 이내', '7.35억원 이내')"""
-            date_emphasis = """
-**⚠️ 매우 중요 (지원규모):**
-- content 필드에는 **구체적인 숫자/금액**을 반드시 포함하세요
-- 요약하지 말고, 공고문에 명시된 **정확한 금액/규모**를 그대로 추출하세요
-- 예시: "연간 최대 20억원 이내", "7.35억원 이내", "100억원" 등
-- **날짜나 기간 정보는 포함하지 마세요**"""
-        else:
-            # 사업명, 공고기관 등: 순수하게 해당 값만 (날짜/기간/숫자 불필요)
-            content_instruction = f"""실제 {feature_type} 값만 추출 (예: '2025년 공공AX 프로젝트 사업', '과학기술정보통신부')"""
-            date_emphasis = """
-**⚠️ 매우 중요:**
-- content 필드에는 **{feature_type} 값만** 추출하세요
-- **다른 정보(날짜, 기간, 금액 등)를 섞지 마세요**
-- 요약하지 말고, 공고문에 명시된 **정확한 {feature_type} 값**만 그대로 추출하세요
-- 예시:
-  * 사업명: "2025년 공공AX 프로젝트 사업" (날짜나 기간 정보 포함 금지)
-  * 공고기관: "과학기술정보통신부" (날짜나 기간 정보 포함 금지)"""
-        
+        # 높은 디테일로 제목/헤더 정확히 인식
+        image_contents = to_image_contents(image_urls, detail="high")
+
+        instructions = _feature_instructions(feature_type, feature_key)
+        content_instruction = instructions['content_instruction']
+        date_emphasis = instructions['date_emphasis']
+        user_examples = instructions['user_examples']
+        user_emphasis = instructions['user_emphasis']
+
         system_prompt = f"""당신은 정부 R&D 공고문을 분석하는 전문가입니다.
 공고문의 첫 10페이지 (또는 그 이하)에서 '{feature_type}'의 **실제 값**을 추출해야 합니다.
 
@@ -170,37 +210,7 @@ JSON 형식으로 반환:
 
 **실제 값을 찾을 수 없으면 found를 false로 반환하세요.**"""
 
-        # 사용자 프롬프트: Feature 타입에 따라 조건부
-        if is_evaluation_criteria:
-            user_examples = f"""
-  * {feature_type} 추출 형식 (계층 구조 포함):
-    - "사업 타당성(25점): 목적 부합성(10점) - [세부기준: 사업목적의 명확성, 정책연계성, 지역발전 기여도], 사업수행 역량(15점) - [세부기준: 조직구성의 적절성, 수행인력의 전문성, 유사사업 수행경험]"
-    - "사업 경쟁력(40점): 사업 전략·우수성(15점) - [세부기준: 차별화된 사업전략, 기술적 우수성, 혁신성], 기술개발 우수성(25점) - [세부기준: 기술의 창의성, 기술개발 계획의 구체성 및 실현가능성]"
-  * 표 형태인 경우 처리 방법:
-    1. 대분류 행: "사업 타당성(25점)"과 같이 대분류명과 배점 확인
-    2. 중분류 행: "목적 부합성(10점)", "사업수행 역량(15점)"과 같이 하위 항목 확인
-    3. 세부기준 행 또는 열: "사업목적의 명확성", "정책연계성" 등의 구체적 평가기준 확인
-    4. 모든 행을 빠짐없이 읽어서 계층 구조 완성
-  * 총점이 100점이 되도록 모든 배점을 확인하세요"""
-            user_emphasis = "content 필드에는 대분류, 중분류, 세부평가기준을 계층적으로 모두 포함하세요. 총점은 100점이어야 합니다."
-        elif requires_date:
-            user_examples = f"""
-  * {feature_type}: "2025년 9월 9일" 또는 "2025.09.09" (요약하지 말고 정확한 날짜)
-  * 또는 "2025년 10월 1일 ~ 2026년 12월 31일" (기간인 경우 시작일과 종료일 모두 포함)
-  * 또는 "2025.09.30(화) 14:00까지" (시간까지 포함된 경우)"""
-            user_emphasis = "content 필드에는 구체적인 날짜/기간을 반드시 포함하세요."
-        elif feature_key == 'support_scale':
-            user_examples = f"""
-  * {feature_type}: "연간 최대 20억원 이내" 또는 "7.35억원 이내" (정확한 숫자/금액)
-  * **날짜나 기간 정보는 포함하지 마세요**"""
-            user_emphasis = "content 필드에는 구체적인 숫자/금액만 포함하세요. 날짜/기간은 포함하지 마세요."
-        else:
-            user_examples = f"""
-  * {feature_type}: "{feature_type} 값만" (예: 사업명이면 "2025년 공공AX 프로젝트 사업"만, 공고기관이면 "과학기술정보통신부"만)
-  * **다른 정보(날짜, 기간, 금액 등)를 섞지 마세요**"""
-            user_emphasis = f"content 필드에는 {feature_type} 값만 추출하세요. 다른 정보를 섞지 마세요."
-        
-        user_prompt = f"""첨부된 이미지는 '{file_name}' 파일의 첫 {len(images)}페이지 (최대 10페이지)입니다.
+        user_prompt = f"""첨부된 이미지는 '{file_name}' 파일의 첫 {len(image_urls)}페이지 (최대 10페이지)입니다.
 
 위 페이지에서 '{feature_type}'의 **실제 값**을 찾아서 추출하세요.
 
@@ -215,7 +225,8 @@ JSON 형식으로 반환해주세요. {user_emphasis}"""
         messages_content.extend(image_contents)
 
         # Vision API 호출
-        response = client.chat.completions.create(
+        response = call_with_backoff(
+            client.chat.completions.create,
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -238,7 +249,146 @@ JSON 형식으로 반환해주세요. {user_emphasis}"""
 
         return result
 
+    except ImportError:
+        print(f"    ⚠️  pdf2image 라이브러리가 설치되지 않았습니다.")
+        return None
     except Exception as e:
         print(f"    ⚠️  Vision API 실패: {e}")
         return None
 
+
+
+def extract_core_metadata_with_vision(
+    file_bytes: bytes,
+    file_name: str,
+    feature_defs: List[Dict[str, Any]],
+    doc_key: Optional[str] = None  # 페이지 이미지 캐시 키 (문서 SHA-256)
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Vision API 1회 호출로 핵심 정보 Feature 전체를 한 번에 추출 (통합 모드)
+
+    Feature마다 같은 10페이지 이미지를 반복 업로드하던 것을
+    이미지 1세트 + Feature별 지시문으로 묶어 하나의 구조화된 JSON으로 받는다.
+    found=false인 Feature는 호출 측에서 extract_metadata_with_vision으로 개별 재시도.
+
+    Args:
+        file_bytes: PDF 파일의 바이트 데이터
+        file_name: 파일명 (로깅용)
+        feature_defs: 추출할 핵심 정보 Feature 정의 리스트 (config.FEATURES 항목)
+        doc_key: 페이지 이미지 캐시 키 (없으면 file_bytes의 SHA-256)
+
+    Returns:
+        {feature_key: extract_metadata_with_vision과 같은 형식의 결과} 또는 None (호출 실패)
+        - 응답에 없는 Feature는 {"found": false}로 채움
+    """
+    if not feature_defs:
+        return {}
+
+    try:
+        print(f"    👁️  Vision API로 핵심 정보 {len(feature_defs)}개 통합 추출 중...")
+
+        # 단일 추출과 같은 페이지 이미지 사용 (캐시 공유)
+        image_urls = get_page_images(
+            file_bytes,
+            first_page=1,
+            last_page=10,
+            dpi=150,
+            doc_key=doc_key
+        )
+
+        if not image_urls:
+            print(f"    ⚠️  PDF 이미지 변환 실패")
+            return None
+
+        image_contents = to_image_contents(image_urls, detail="high")
+
+        # Feature별 지시문 (단일 추출과 동일한 기준)
+        feature_sections = []
+        for feature_def in feature_defs:
+            feature_key = feature_def['feature_key']
+            feature_type = feature_def['feature_type']
+            instructions = _feature_instructions(feature_type, feature_key)
+            feature_sections.append(f"""### {feature_key} ({feature_type})
+- 설명: {feature_def['description']}
+- content: {instructions['content_instruction']}
+{instructions['date_emphasis']}
+- 예를 들어:{instructions['user_examples']}
+- {instructions['user_emphasis']}""")
+
+        feature_keys = [feature_def['feature_key'] for feature_def in feature_defs]
+
+        system_prompt = f"""당신은 정부 R&D 공고문을 분석하는 전문가입니다.
+공고문의 첫 10페이지 (또는 그 이하)에서 아래 {len(feature_defs)}개 항목의 **실제 값**을 한 번에 추출해야 합니다.
+
+⚠️ 매우 중요:
+- 각 항목의 작성 방법이나 가이드가 **절대 아닙니다**
+- 공고문에 **실제로 명시된 구체적인 값**을 찾으세요
+- 제목, 헤더, 상단 부분을 우선 확인하세요
+- 항목마다 해당 항목의 값만 추출하고, 다른 항목의 정보를 섞지 마세요
+
+[분석 대상]
+{chr(10).join(feature_sections)}
+
+JSON 형식으로 반환 (features의 키는 위 항목 키 {feature_keys}를 그대로 사용):
+{{
+  "features": {{
+    "항목 키": {{
+      "found": true/false,
+      "title": "추출된 실제 값",
+      "content": "항목별 content 지시에 맞춘 실제 값",
+      "full_content": "해당 값이 나타난 전체 문맥",
+      "key_points": ["추출된 값의 특징이나 중요 사항"],
+      "writing_strategy": {{
+        "overview": "이 값의 의미 및 사업계획서 작성 시 활용 방법",
+        "writing_tips": ["이 값을 사업계획서에 어떻게 반영할지 팁"],
+        "common_mistakes": ["자주 발생하는 실수"],
+        "example_phrases": ["사업계획서에서 사용할 수 있는 예시 문구"]
+      }}
+    }}
+  }}
+}}
+
+**실제 값을 찾을 수 없는 항목은 found를 false로 반환하세요.**"""
+
+        user_prompt = f"""첨부된 이미지는 '{file_name}' 파일의 첫 {len(image_urls)}페이지 (최대 10페이지)입니다.
+
+위 페이지에서 다음 항목들의 **실제 값**을 찾아서 추출하세요: {', '.join(f"{d['feature_key']}({d['feature_type']})" for d in feature_defs)}
+
+JSON 형식으로 반환해주세요. 모든 항목 키를 features에 포함하세요."""
+
+        messages_content = [{"type": "text", "text": user_prompt}]
+        messages_content.extend(image_contents)
+
+        # Vision API 호출 (이미지 1세트로 전체 핵심 정보 추출)
+        response = call_with_backoff(
+            client.chat.completions.create,
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": messages_content}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0
+        )
+
+        if not response.choices or not response.choices[0].message.content:
+            print(f"    ⚠️  Vision API 응답 없음")
+            return None
+
+        extracted = json.loads(response.choices[0].message.content).get('features') or {}
+
+        results = {}
+        for feature_key in feature_keys:
+            result = extracted.get(feature_key)
+            results[feature_key] = result if isinstance(result, dict) else {"found": False}
+
+        found_count = sum(1 for result in results.values() if result.get("found"))
+        print(f"    ✅ Vision API 통합 추출 완료: {found_count}/{len(feature_keys)}개 발견")
+        return results
+
+    except ImportError:
+        print(f"    ⚠️  pdf2image 라이브러리가 설치되지 않았습니다.")
+        return None
+    except Exception as e:
+        print(f"    ⚠️  Vision API 통합 추출 실패: {e}")
+        return None
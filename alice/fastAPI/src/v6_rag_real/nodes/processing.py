@@ -3,17 +3,18 @@
 
 ✅ 핵심 노드들:
   1. chunk_all_documents: 섹션 기반 청킹 (□, ■, ● 마커 인식)
-  2. embed_all_chunks: OpenAI Embedding API로 벡터 변환
+  2. embed_all_chunks: OpenAI Embedding API로 벡터 변환 (임베딩 캐시 우선)
   3. init_and_store_vectordb: Chroma VectorDB 저장
   4. extract_features_rag: RAG 기반 Feature 추출 (LLM 분석)
   5. save_to_csv: 로컬 파일 저장 (개발/테스트용)
 """
 
+import hashlib
 import json
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 
 # OpenAI
 from openai import OpenAI
@@ -21,19 +22,62 @@ import os
 from dotenv import load_dotenv
 
 # 임베딩 & VectorDB
-import chromadb
 import numpy as np
 
 from ..state_types import BatchState
-from ..config import FEATURES, CSV_OUTPUT_DIR
-from ..utils import chunk_by_sections
-from .metadata_vision import extract_metadata_with_vision
+from ..config import (
+    FEATURES,
+    CSV_OUTPUT_DIR,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIM,
+    EMBEDDING_BATCH_SIZE,
+    FEATURE_EXTRACTION_CONCURRENCY,
+    VECTOR_STORE,
+    VECTOR_DB_MODE,
+    VECTOR_DB_DIR,
+    CORE_FEATURE_KEYS,
+    VISION_COMBINED_CORE_EXTRACTION,
+    FEATURE_SEARCH_N_RESULTS,
+)
+from ..embeddings import (
+    embed_texts,
+    get_feature_keywords,
+    build_feature_query_text,
+    get_query_embedding,
+    get_query_embeddings,
+)
+from ..utils import get_section_chunker, call_with_backoff
+from ..progress import emit_progress
+from ..vectordb import (
+    get_chroma_client,
+    collection_lock,
+    project_collection_name,
+    open_project_collection,
+    stored_chunk_ids,
+)
+from ..vector_index import NumpyVectorIndex, query_batch
+from ..blobs import file_source
+from ..artifacts import ArtifactSink, analysis_artifact_id
+from .metadata_vision import extract_metadata_with_vision, extract_core_metadata_with_vision
 
 # OpenAI 클라이언트 초기화
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
+def _document_chunk_prefix(doc: Dict[str, Any]) -> str:
+    """
+    문서 청크 ID 접두사: (파일 SHA-256, 문서 타입, 파일명) 해시 16자리
+
+    파일 내용/분류/이름이 같으면 재분석해도 같은 값 → 증분 재분석 시 기존 청크와 비교
+    (청크 ID에는 청크 텍스트 해시도 붙이므로 추출/정규화 결과가 바뀐 청크는 새 청크로 다시 저장됨)
+    """
+    if not doc.get('file_hash'):
+        return doc['document_id']
+    key = f"{doc['file_hash']}|{doc['document_type']}|{doc['file_name']}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
 def chunk_all_documents(state: BatchState) -> BatchState:
     """
     모든 문서를 섹션 기반으로 청킹 (공고문 + 첨부서류)
@@ -43,10 +87,12 @@ def chunk_all_documents(state: BatchState) -> BatchState:
       - 섹션 마커 감지 (□, ■, ● 등)
       - 섹션이 없으면 고정 길이 청킹 (fallback)
       - MIN_CHUNK_LENGTH(50) 미만은 제외
+      - CHUNK_SCOPE=document: 페이지를 이어 붙여 섹션 감지 (페이지 경계를 넘는 섹션 유지,
+        짧은 조각은 제외하지 않고 이웃 청크에 병합)
 
     Returns:
         state['all_chunks']: 모든 청크 리스트
-        - 청크마다 문서 메타데이터, 섹션 정보, 페이지 번호 포함
+        - 청크마다 문서 메타데이터, 섹션 정보, 페이지 번호(page, page_start, page_end) 포함
     """
     documents = state['documents']
     all_chunks = []
@@ -56,11 +102,24 @@ def chunk_all_documents(state: BatchState) -> BatchState:
     print(f"📦 섹션 기반 청킹 시작")
     print(f"{'='*60}")
 
+    seen_chunk_prefixes = {}
+
+    # 헤더 패턴/스플리터는 모든 문서·페이지에서 공용 청커 1개를 재사용
+    chunker = get_section_chunker()
+    print(f"  ✂️  청크 기준: {chunker.chunk_size} {'토큰' if chunker.length_unit == 'tokens' else '자'} (오버랩 {chunker.chunk_overlap})")
+
     for doc in documents:
         print(f"\n  📄 {doc['file_name']} 청킹 중...")
 
         doc_chunk_start = chunk_global_id
 
+        # 문서 내용 기반 청크 ID 접두사 (같은 파일이면 재분석해도 같은 ID → 증분 저장 가능)
+        chunk_prefix = _document_chunk_prefix(doc)
+        duplicate_count = seen_chunk_prefixes.get(chunk_prefix, 0)
+        seen_chunk_prefixes[chunk_prefix] = duplicate_count + 1
+        if duplicate_count:
+            chunk_prefix = f"{chunk_prefix}-{duplicate_count + 1}"
+
         # [2025-01-10 suyeon] page_texts 타입 체크 추가
         # 변경 이유:
         # 1. 타입 안정성: dict/list 모두 처리하여 AttributeError 방지
@@ -72,8 +131,8 @@ def chunk_all_documents(state: BatchState) -> BatchState:
             print(f"    ⚠️  page_texts가 없음 - 건너뜀")
             continue
 
-        # 타입에 따라 순회 방식 분기
-        if isinstance(page_texts, dict):
+        # 타입에 따라 순회 방식 분기 (PageTexts 포함 Mapping)
+        if isinstance(page_texts, Mapping):
             page_items = page_texts.items()
         elif isinstance(page_texts, list):
             page_items = enumerate(page_texts, start=1)
@@ -81,37 +140,40 @@ def chunk_all_documents(state: BatchState) -> BatchState:
             print(f"    ⚠️  잘못된 page_texts 타입: {type(page_texts)} - 건너뜀")
             continue
 
-        # 페이지별로 청킹
-        empty_page_count = 0
-        for page_num, page_text in page_items:
-            page_chunks = chunk_by_sections(page_text, page_num)
-
-            # [2025-01-10 suyeon] 빈 페이지 처리 개선
-            # 변경 이유:
-            # 1. 가시성: 청크 생성 안된 페이지 명시적 로깅
-            # 2. 디버깅: 왜 청크 수가 적은지 사용자가 파악 가능
-            # 근거: 빈 페이지/짧은 페이지는 MIN_CHUNK_LENGTH(50)로 필터링됨
-            if not page_chunks:
-                empty_page_count += 1
-                continue
-
-            for chunk_data in page_chunks:
-                all_chunks.append({
-                    'chunk_id': f"{doc['document_id']}_chunk_{chunk_global_id}",
-                    'text': chunk_data['text'],
-                    # 문서 메타데이터
-                    'project_idx': state['project_idx'],
-                    'document_id': doc['document_id'],
-                    'document_type': doc['document_type'],
-                    'file_name': doc['file_name'],
-                    # 섹션 정보
-                    'section': chunk_data['section'],
-                    'page': chunk_data['page'],
-                    'is_sectioned': chunk_data['is_sectioned'],
-                    # 첨부서류 번호
-                    'attachment_number': doc.get('attachment_number'),
-                })
-                chunk_global_id += 1
+        # 페이지별로 청킹 (CHUNK_SCOPE=document면 페이지를 이어 붙여 문서 단위로 청킹)
+        page_items = list(page_items)
+        doc_chunks = chunker.chunk_pages(page_items)
+
+        # [2025-01-10 suyeon] 빈 페이지 처리 개선
+        # 변경 이유:
+        # 1. 가시성: 청크 생성 안된 페이지 명시적 로깅
+        # 2. 디버깅: 왜 청크 수가 적은지 사용자가 파악 가능
+        # 근거: 빈 페이지/짧은 페이지는 MIN_CHUNK_LENGTH(50)로 필터링됨
+        covered_pages = set()
+        for chunk_data in doc_chunks:
+            covered_pages.update(range(chunk_data['page_start'], chunk_data['page_end'] + 1))
+        empty_page_count = sum(1 for page_num, _ in page_items if page_num not in covered_pages)
+
+        for chunk_data in doc_chunks:
+            text_hash = hashlib.sha256(chunk_data['text'].encode('utf-8')).hexdigest()[:8]
+            all_chunks.append({
+                'chunk_id': f"{chunk_prefix}_chunk_{chunk_global_id - doc_chunk_start}_{text_hash}",
+                'text': chunk_data['text'],
+                # 문서 메타데이터
+                'project_idx': state['project_idx'],
+                'document_id': doc['document_id'],
+                'document_type': doc['document_type'],
+                'file_name': doc['file_name'],
+                # 섹션 정보 (page = page_start, 문서 단위 청킹이면 여러 페이지에 걸칠 수 있음)
+                'section': chunk_data['section'],
+                'page': chunk_data['page'],
+                'page_start': chunk_data['page_start'],
+                'page_end': chunk_data['page_end'],
+                'is_sectioned': chunk_data['is_sectioned'],
+                # 첨부서류 번호
+                'attachment_number': doc.get('attachment_number'),
+            })
+            chunk_global_id += 1
 
         doc_chunk_count = chunk_global_id - doc_chunk_start
         print(f"    ✓ {doc_chunk_count}개 청크 생성", end="")
@@ -146,10 +208,13 @@ def embed_all_chunks(state: BatchState) -> BatchState:
     ✅ 핵심 기능: 텍스트를 벡터로 변환하여 의미 검색 가능하게 만듦
     📌 사용 모델: text-embedding-3-small (1536 차원, $0.02/1M tokens)
     📌 배치 처리: 최대 2048개/요청으로 효율적 처리
+    📌 임베딩 캐시: (모델, 정규화 텍스트 해시)로 조회하여 캐시 miss 청크만 API 호출
 
     Returns:
-        state['all_embeddings']: numpy array (shape: [N, 1536])
+        state['all_embeddings']: float32 numpy array (shape: [N, 1536], C-contiguous)
         state['embedding_model']: 'text-embedding-3-small'
+        state['embedding_cache_stats']: {'hits', 'misses', 'api_calls', 'skipped'}
+        - 증분 재분석 시 VectorDB에 이미 있는 청크는 임베딩하지 않음 (해당 행은 0 벡터)
     """
     all_chunks = state['all_chunks']
 
@@ -157,45 +222,32 @@ def embed_all_chunks(state: BatchState) -> BatchState:
     print(f"🧠 OpenAI 임베딩 생성 시작")
     print(f"{'='*60}")
 
-    # 청크 텍스트 추출
-    chunk_texts = [chunk['text'] for chunk in all_chunks]
-
-    # OpenAI API 배치 임베딩 (최대 2048개/요청)
-    batch_size = 2048
-    total_chunks = len(chunk_texts)
-    total_batches = (total_chunks + batch_size - 1) // batch_size
-
-    print(f"\n  🔢 {total_chunks}개 청크 임베딩 중... (배치 크기: {batch_size}, 총 {total_batches}개 배치)")
-    print(f"  📡 모델: text-embedding-3-small (1536 차원)")
-
-    all_embeddings = []
-
-    for i in range(0, total_chunks, batch_size):
-        batch_num = i // batch_size + 1
-        batch = chunk_texts[i:i+batch_size]
+    # 증분 재분석: VectorDB에 이미 저장된 청크(변경 없는 문서)는 임베딩 생략
+    stored_ids = stored_chunk_ids(state['project_idx'])
+    pending_indices = [i for i, chunk in enumerate(all_chunks) if chunk['chunk_id'] not in stored_ids]
 
-        print(f"    ⏳ 배치 {batch_num}/{total_batches} 처리 중... ({i+1}-{min(i+len(batch), total_chunks)}/{total_chunks} 청크)")
-
-        try:
-            response = client.embeddings.create(
-                model="text-embedding-3-small",  # 1536 차원, $0.02/1M tokens
-                input=batch
-            )
+    # 청크 텍스트 추출
+    chunk_texts = [all_chunks[i]['text'] for i in pending_indices]
+    total_chunks = len(all_chunks)
 
-            # 임베딩 추출
-            batch_embeddings = [item.embedding for item in response.data]
-            all_embeddings.extend(batch_embeddings)
+    print(f"\n  🔢 {len(chunk_texts)}개 청크 임베딩 중... (배치 크기: {EMBEDDING_BATCH_SIZE})")
+    if stored_ids:
+        print(f"  ♻️  증분 재분석: {total_chunks - len(chunk_texts)}개 청크는 VectorDB에 저장됨 → 임베딩 생략")
+    print(f"  📡 모델: {EMBEDDING_MODEL} ({EMBEDDING_DIM} 차원)")
 
-        except Exception as e:
-            print(f"    ❌ 배치 {batch_num} 임베딩 실패: {str(e)}")
-            state['errors'].append(f"임베딩 배치 {batch_num} 실패: {str(e)}")
-            # 실패한 배치는 0 벡터로 채움
-            all_embeddings.extend([[0.0] * 1536 for _ in batch])
+    vectors, cache_stats = embed_texts(chunk_texts, model=EMBEDDING_MODEL, errors=state['errors'])
+    cache_stats['skipped'] = total_chunks - len(chunk_texts)
 
-    embeddings = np.array(all_embeddings)
+    # 생략된 청크 행은 0 벡터 (init_and_store_vectordb에서 다시 저장하지 않음)
+    if len(pending_indices) == total_chunks:
+        embeddings = vectors
+    else:
+        embeddings = np.zeros((total_chunks, EMBEDDING_DIM), dtype=np.float32)
+        embeddings[pending_indices] = vectors
 
     state['all_embeddings'] = embeddings
-    state['embedding_model'] = 'text-embedding-3-small'  # API 모델명 저장
+    state['embedding_model'] = EMBEDDING_MODEL  # API 모델명 저장
+    state['embedding_cache_stats'] = cache_stats
     state['status'] = 'all_embedded'
 
     print(f"\n  ✅ 임베딩 완료: {embeddings.shape}")
@@ -204,353 +256,374 @@ def embed_all_chunks(state: BatchState) -> BatchState:
         print(f"    - 차원: {embeddings.shape[1]}")
     else:
         print(f"    - 청크 수: {embeddings.shape[0] if embeddings.shape else 0}")
+    print(f"    - 임베딩 캐시: hit {cache_stats['hits']} / miss {cache_stats['misses']} (API 호출 {cache_stats['api_calls']}회)")
     return state
 
 
-def init_and_store_vectordb(state: BatchState) -> BatchState:
+def _chunk_metadata(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """VectorDB 저장용 청크 메타데이터"""
+    return {
+        'document_id': chunk['document_id'],
+        'document_type': chunk['document_type'],
+        'file_name': chunk['file_name'],
+        'section': chunk['section'],
+        'page': chunk['page'],
+        'page_start': chunk.get('page_start', chunk['page']),
+        'page_end': chunk.get('page_end', chunk['page']),
+        'attachment_number': chunk.get('attachment_number') or 0
+    }
+
+
+def _init_numpy_vector_index(state: BatchState) -> BatchState:
     """
-    Chroma VectorDB 초기화 및 청크 저장
+    state['all_embeddings']로 NumPy 벡터 인덱스 생성 (Chroma 저장 생략)
 
-    ✅ 핵심 기능: RAG 검색을 위한 벡터 DB 생성 및 저장 (필수)
+    query() 결과 형식이 Chroma 컬렉션과 같으므로 state['chroma_collection']에 그대로 저장
     """
     all_chunks = state['all_chunks']
-    embeddings = state['all_embeddings']
 
     print(f"\n{'='*60}")
-    print(f"💾 Chroma VectorDB 초기화 및 저장")
+    print(f"💾 NumPy 벡터 인덱스 생성 (Chroma 저장 생략)")
     print(f"{'='*60}")
 
-    # Chroma DB 경로 설정
-    # TODO: 운영 환경에서는 config.VECTOR_DB_DIR 또는 환경변수 사용 권장
-    db_path = Path("./chroma_db")
-    db_path.mkdir(exist_ok=True)
+    index = NumpyVectorIndex(
+        name=f"project_{state['project_idx']}",
+        ids=[chunk['chunk_id'] for chunk in all_chunks],
+        embeddings=state['all_embeddings'],
+        documents=[chunk['text'] for chunk in all_chunks],
+        metadatas=[_chunk_metadata(chunk) for chunk in all_chunks]
+    )
 
-    # Chroma Client 생성
-    print(f"\n  📂 VectorDB 경로: {db_path.absolute()}")
-    client = chromadb.PersistentClient(path=str(db_path))
+    state['chroma_client'] = None
+    state['chroma_collection'] = index
+    state['vector_db_path'] = ':numpy:'
+    state['status'] = 'vectordb_ready'
 
-    # 컬렉션 이름
-    collection_name = f"project_{state['project_idx']}"
+    print(f"  ✅ 인덱스 생성 완료")
+    print(f"    - 청크 수: {index.count()}")
 
-    # 기존 컬렉션 삭제 (재실행 시 중복 방지)
-    try:
-        client.delete_collection(name=collection_name)
-        print(f"  🗑️  기존 컬렉션 삭제: {collection_name}")
-    except:
-        pass
-
-    # 새 컬렉션 생성
-    collection = client.create_collection(
-        name=collection_name,
-        metadata={
-            "description": "공고문 + 첨부서류 통합 RAG DB",
-            "project_idx": state['project_idx'],
-            "created_at": datetime.now().isoformat(),
-            "hnsw:space": "cosine"  # Cosine distance for text similarity
-        }
-    )
+    return state
 
-    print(f"  ✓ 컬렉션 생성: {collection_name}")
 
-    # 청크 + 임베딩 저장
-    print(f"\n  💾 {len(all_chunks)}개 청크 저장 중...")
+def init_and_store_vectordb(state: BatchState) -> BatchState:
+    """
+    Chroma VectorDB 초기화 및 청크 저장
 
-    collection.add(
-        ids=[chunk['chunk_id'] for chunk in all_chunks],
-        embeddings=embeddings.tolist(),
-        documents=[chunk['text'] for chunk in all_chunks],
-        metadatas=[
-            {
-                'document_id': chunk['document_id'],
-                'document_type': chunk['document_type'],
-                'file_name': chunk['file_name'],
-                'section': chunk['section'],
-                'page': chunk['page'],
-                'attachment_number': chunk.get('attachment_number') or 0
+    ✅ 핵심 기능: RAG 검색을 위한 벡터 DB 생성 및 저장 (필수)
+    📌 VECTOR_STORE=numpy: Chroma 대신 프로세스 내 NumPy 인덱스 사용 (저장 생략)
+    """
+    all_chunks = state['all_chunks']
+    embeddings = state['all_embeddings']
+
+    if VECTOR_STORE == 'numpy':
+        return _init_numpy_vector_index(state)
+
+    print(f"\n{'='*60}")
+    print(f"💾 Chroma VectorDB 초기화 및 저장")
+    print(f"{'='*60}")
+
+    # Chroma Client (프로세스 단위 재사용)
+    if VECTOR_DB_MODE == 'memory':
+        print(f"\n  📂 VectorDB: 메모리 (EphemeralClient)")
+    else:
+        print(f"\n  📂 VectorDB 경로: {VECTOR_DB_DIR.absolute()}")
+    client = get_chroma_client()
+
+    # 컬렉션 이름 (memory 모드는 분석 시작 시 정한 고유 이름 → 실패해도 요청 종료 시 이름으로 삭제)
+    collection_name = state.get('vector_collection_name') or project_collection_name(state['project_idx'])
+
+    chunk_ids = [chunk['chunk_id'] for chunk in all_chunks]
+    chunk_metadatas = [_chunk_metadata(chunk) for chunk in all_chunks]
+
+    # 같은 프로젝트 동시 분석 시 삭제/생성/저장이 섞이지 않도록 컬렉션 락
+    with collection_lock(collection_name):
+        # 증분 모드: 기존 컬렉션 재사용 / 아니면 기존 컬렉션 삭제 후 새로 생성 (재실행 시 중복 방지)
+        collection, reused = open_project_collection(
+            client,
+            collection_name,
+            metadata={
+                "description": "공고문 + 첨부서류 통합 RAG DB",
+                "project_idx": state['project_idx'],
+                "created_at": datetime.now().isoformat(),
+                "hnsw:space": "cosine"  # Cosine distance for text similarity
             }
-            for chunk in all_chunks
-        ]
-    )
+        )
+
+        if reused:
+            # 저장된 청크와 비교: 사라진 청크 삭제, 메타데이터만 바뀐 청크 갱신, 새 청크만 추가
+            stored = collection.get(include=['metadatas'])
+            stored_metadatas = dict(zip(stored['ids'], stored['metadatas']))
+            current_ids = set(chunk_ids)
+
+            stale_ids = [chunk_id for chunk_id in stored_metadatas if chunk_id not in current_ids]
+            add_indices = [i for i, chunk_id in enumerate(chunk_ids) if chunk_id not in stored_metadatas]
+            update_indices = [
+                i for i, chunk_id in enumerate(chunk_ids)
+                if chunk_id in stored_metadatas and stored_metadatas[chunk_id] != chunk_metadatas[i]
+            ]
+
+            print(f"  ♻️  기존 컬렉션 재사용: {collection_name} (저장된 청크 {len(stored_metadatas)}개)")
+            print(f"    - 추가: {len(add_indices)}개, 삭제: {len(stale_ids)}개, 메타데이터 갱신: {len(update_indices)}개")
+
+            if stale_ids:
+                collection.delete(ids=stale_ids)
+            if update_indices:
+                collection.update(
+                    ids=[chunk_ids[i] for i in update_indices],
+                    metadatas=[chunk_metadatas[i] for i in update_indices]
+                )
+        else:
+            add_indices = list(range(len(all_chunks)))
+            print(f"  ✓ 컬렉션 생성: {collection_name}")
+
+        # 0 벡터 행 다시 임베딩: 증분으로 생략했는데 그 사이 컬렉션이 재구축/삭제된 청크, 임베딩 배치 실패 청크
+        # 그래도 0 벡터인 청크는 저장하지 않음 (저장하면 다음 재분석에서도 임베딩하지 않으므로)
+        zero_indices = [i for i in add_indices if not embeddings[i].any()]
+        if zero_indices:
+            vectors, _ = embed_texts(
+                [all_chunks[i]['text'] for i in zero_indices],
+                model=EMBEDDING_MODEL,
+                errors=state['errors']
+            )
+            embeddings[zero_indices] = vectors
+            failed_indices = {i for i in zero_indices if not embeddings[i].any()}
+            if failed_indices:
+                print(f"  ⚠️  임베딩 실패 청크 {len(failed_indices)}개는 저장하지 않음 (다음 분석에서 다시 임베딩)")
+                add_indices = [i for i in add_indices if i not in failed_indices]
+
+        # 청크 + 임베딩 저장
+        print(f"\n  💾 {len(add_indices)}개 청크 저장 중...")
+
+        if add_indices:
+            # float32 행렬을 그대로 전달 (파이썬 float 리스트 변환 없음)
+            collection.add(
+                ids=[chunk_ids[i] for i in add_indices],
+                embeddings=embeddings if len(add_indices) == len(all_chunks) else embeddings[add_indices],
+                documents=[all_chunks[i]['text'] for i in add_indices],
+                metadatas=[chunk_metadatas[i] for i in add_indices]
+            )
 
     state['chroma_client'] = client
     state['chroma_collection'] = collection
-    state['vector_db_path'] = str(db_path)
+    state['vector_db_path'] = ':memory:' if VECTOR_DB_MODE == 'memory' else str(VECTOR_DB_DIR)
     state['status'] = 'vectordb_ready'
 
     print(f"  ✅ VectorDB 저장 완료")
     print(f"    - 컬렉션: {collection_name}")
     print(f"    - 청크 수: {len(all_chunks)}")
-    print(f"    - 경로: {db_path.absolute()}")
+    print(f"    - 경로: {state['vector_db_path']}")
 
     return state
 
 
-def extract_features_rag(state: BatchState) -> BatchState:
+def _extract_single_feature(
+    feature_def: Dict[str, Any],
+    state: BatchState,
+    announcement_doc: Optional[Dict[str, Any]],
+    announcement_file_bytes: Optional[bytes],
+    core_vision_results: Optional[Dict[str, Dict[str, Any]]] = None,
+    search_results: Optional[Dict[str, List[List[Any]]]] = None
+) -> Tuple[Optional[Dict[str, Any]], str]:
     """
-    RAG 기반 Feature 추출 (크로스 문서 검색)
+    단일 Feature 추출 (RAG 검색 → Vision API/LLM 분석)
 
-    ✅ 핵심 기능: 공고문과 첨부서류를 종합적으로 분석하여 핵심 정보 추출
-    📌 RAG 프로세스:
-      1. Feature 키워드로 쿼리 임베딩 생성
-      2. VectorDB 유사도 검색 (공고 + 첨부 통합, 상위 7개)
-      3. 검색된 청크만 LLM에 전달 (토큰 절약)
-      4. LLM이 구조화된 JSON으로 분석 결과 반환
+    Feature 간 의존성이 없으므로 extract_features_rag에서 스레드 풀로 동시 실행된다.
+    진행 로그는 다른 Feature 로그와 섞이지 않도록 한 줄로 모아서 반환한다.
 
-    📋 추출 정보:
-      - 핵심 내용 요약
-      - key_points (요점 리스트)
-      - writing_strategy (작성 전략 - 평가 포인트, 작성 팁, 주의사항)
+    Args:
+        core_vision_results: 핵심 정보 통합 Vision 추출 결과 {feature_key: 결과}
+            (found=true면 그대로 사용, 없거나 found=false면 Feature별 Vision 호출)
+        search_results: extract_features_rag에서 배치 검색한 이 Feature의 결과
+            (없으면 여기서 단일 검색)
 
     Returns:
-        state['extracted_features']: 추출된 Feature 리스트
-        - feature_code, feature_name, summary, full_content
-        - key_points, writing_strategy
-        - RAG 메타데이터 (사용된 청크, 유사도 등)
+        (추출된 Feature 또는 None, 진행 로그)
     """
     collection = state['chroma_collection']
-    model = state['embedding_model']
-    documents = state['documents']
-    
-    print(f"\n{'='*60}")
-    print(f"🤖 RAG 기반 Feature 추출")
-    print(f"{'='*60}")
+    chunk_duplicates = state.get('chunk_duplicates') or {}
+    log = []
+
+    # 1️⃣ Feature 쿼리 임베딩 (고정 쿼리 → 프로세스 내 메모이즈, 첫 호출 시 1회 배치)
+    # 키워드 우선순위: primary → secondary → related
+    all_keywords = get_feature_keywords(feature_def)
+    query_text = build_feature_query_text(feature_def)
+
+    # 2️⃣ VectorDB 유사도 검색 (보통 extract_features_rag에서 전체 Feature 배치 검색 완료)
+    results = search_results
+    if results is None:
+        results = collection.query(
+            query_embeddings=[get_query_embedding(query_text)],
+            n_results=FEATURE_SEARCH_N_RESULTS,  # 상위 10개 (공고 + 첨부 포함)
+            # where 조건 없음 → 모든 문서 검색 (공고 + 첨부)
+        )
+
+    # 결과 없음
+    if not results['ids'][0]:
+        log.append("✗ (검색 결과 없음)")
+        return None, " ".join(log)
+
+    # 3️⃣ 유사도 임계값 체크
+    top_distance = results['distances'][0][0]
+
+    # [2025-11-19 수정] 임계값 1.2 → 1.4로 완화
+    # 텍스트 추출 방식 변경으로 인해 청킹이 달라져서
+    # "사업명" 같은 메타 정보가 제목이나 본문에 분산됨
+    # → 유사도가 낮아져도 검색되도록 임계값 완화
+    if top_distance > 1.4:  # ChromaDB cosine: 0.0-2.0 range
+        log.append(f"✗ (거리 멀음: {top_distance:.3f}, 쿼리: '{query_text}')")
+        return None, " ".join(log)
+
+    # [디버깅] 검색 성공 시 거리 출력 (임계값 조정 참고용)
+    log.append(f"✓ (거리: {top_distance:.3f})")
+
+    # 4️⃣ 검색된 chunk 정리
+    retrieved_chunks = []
+    for j in range(len(results['ids'][0])):
+        retrieved_chunks.append({
+            'chunk_id': results['ids'][0][j],
+            'text': results['documents'][0][j],
+            'metadata': results['metadatas'][0][j],
+            'distance': results['distances'][0][j]
+        })
+
+    # 5️⃣ 공고 vs 첨부 분리
+    announcement_chunks = [c for c in retrieved_chunks if c['metadata']['document_type'] == 'ANNOUNCEMENT']
+    attachment_chunks = [c for c in retrieved_chunks if c['metadata']['document_type'] == 'ATTACHMENT']
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 5-1️⃣ 핵심 정보 Feature의 경우: Vision API 우선 사용
+    # 사용자에게 우선적으로 보여줄 핵심 정보를 Vision API로 정확하게 추출
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    is_core_feature = feature_def['feature_key'] in CORE_FEATURE_KEYS
+
+    vision_result = None
+
+    # 핵심 정보 feature인 경우 Vision API를 먼저 시도 (사용자 우선 표시 정보)
+    if is_core_feature:
+        # Vision API로 메타 정보 추출 시도
+        combined_result = (core_vision_results or {}).get(feature_def['feature_key'])
+        if combined_result and combined_result.get("found"):
+            log.append("(Vision API 통합 추출 결과 사용)")
+            vision_result = combined_result
+        elif announcement_file_bytes and announcement_doc:
+            log.append("(Vision API 시도 중...)")
+            vision_result = extract_metadata_with_vision(
+                file_bytes=announcement_file_bytes,
+                file_name=announcement_doc.get('file_name', ''),
+                feature_type=feature_def['feature_type'],
+                feature_description=feature_def['description'],
+                feature_key=feature_def['feature_key'],  # 날짜 포함 여부 판단용
+                doc_key=announcement_doc.get('file_hash')  # 페이지 이미지 캐시 공유
+            )
 
-    # 전체 프로젝트에서 Feature 추출 (공고 + 첨부 통합 RAG 검색)
-    # RAG는 VectorDB에서 모든 문서를 통합 검색하므로 Feature는 프로젝트당 1번만 추출
-    all_features = []
-
-    print(f"\n  📋 전체 프로젝트에서 Feature 추출 중... (총 {len(FEATURES)}개)")
-
-    for i, feature_def in enumerate(FEATURES):
-        print(f"\n    [{i+1}/{len(FEATURES)}] {feature_def['feature_type']}...", end=" ")
-
-        try:
-            # 1️⃣ Feature 쿼리 임베딩
-            # 키워드 우선순위: primary → secondary → related
-            keywords = feature_def['keywords']
-            if isinstance(keywords, dict):
-                # 새로운 구조: primary/secondary/related
-                all_keywords = []
-                all_keywords.extend(keywords.get('primary', []))
-                all_keywords.extend(keywords.get('secondary', []))
-                all_keywords.extend(keywords.get('related', []))
-                keywords_str = " ".join(all_keywords[:5])  # 상위 5개
-            else:
-                # 이전 구조 호환 (리스트)
-                keywords_str = " ".join(keywords[:5])
-
-            query_text = f"{feature_def['feature_type']} {keywords_str}"
-
-            # OpenAI API로 쿼리 임베딩
-            query_response = client.embeddings.create(
-                model="text-embedding-3-small",
-                input=[query_text]
+        # Vision API로 값을 찾은 경우, RAG 방식 건너뛰기
+        if vision_result and vision_result.get("found"):
+            log.append("✓ Vision API 성공 → RAG 건너뛰기")
+            result = vision_result
+
+            # 결과 저장
+            return {
+                'feature_code': feature_def['feature_key'],
+                'feature_name': feature_def['feature_type'],
+                'title': result.get('title', ''),
+                'summary': result.get('content', ''),
+                'full_content': result.get('full_content', ''),
+                'key_points': result.get('key_points', []),
+                'writing_strategy': result.get('writing_strategy', {}),
+
+                # Vision API 메타데이터
+                'extraction_method': 'vision_api',
+                'chunks_from_announcement': 0,
+                'chunks_from_attachments': 0,
+                'vector_similarity': None,
+
+                # 프로젝트 정보
+                'project_idx': state['project_idx'],
+                'extracted_at': datetime.now().isoformat()
+            }, " ".join(log)
+        elif announcement_file_bytes and announcement_doc:
+            log.append("→ RAG로 fallback")
+
+        # Vision API 실패 시 텍스트 기반 fallback: 공고문 첫 페이지 우선 확인
+        if announcement_doc and announcement_doc.get('page_texts'):
+            # 첫 3페이지 우선 추가
+            first_pages_text = []
+            for page_num in sorted(announcement_doc['page_texts'].keys())[:3]:
+                page_text = announcement_doc['page_texts'][page_num]
+                if page_text:
+                    first_pages_text.append(f"[공고문 첫 페이지 {page_num}]\n{page_text[:2000]}")
+
+            if first_pages_text:
+                # 첫 페이지 내용을 맨 앞에 추가
+                announcement_chunks.insert(0, {
+                    'chunk_id': 'first_pages',
+                    'text': '\n\n'.join(first_pages_text),
+                    'metadata': {
+                        'document_type': 'ANNOUNCEMENT',
+                        'page': 1,
+                        'section': '제목/서두',
+                        'file_name': announcement_doc.get('file_name', '')
+                    },
+                    'distance': 0.0  # 우선순위가 높음
+                })
+
+    # 6️⃣ LLM 컨텍스트 구성
+    context_parts = []
+
+    if announcement_chunks:
+        context_parts.append("=== 📄 공고문 관련 섹션 ===")
+        for chunk in announcement_chunks:
+            meta = chunk['metadata']
+            context_parts.append(
+                f"\n[섹션: {meta['section']}, 페이지: {_format_pages(meta)}]\n{chunk['text']}"
             )
-            query_embedding = [query_response.data[0].embedding]
-
-            # 2️⃣ VectorDB 유사도 검색
-            # [2025-11-19 수정] n_results 7 → 10으로 증가
-            # 텍스트 추출 방식 변경으로 청킹이 더 세분화되어
-            # 관련 정보가 더 많은 청크에 분산될 수 있음
-            results = collection.query(
-                query_embeddings=query_embedding,
-                n_results=10,  # 상위 10개 (공고 + 첨부 포함)
-                # where 조건 없음 → 모든 문서 검색 (공고 + 첨부)
+
+    if attachment_chunks:
+        context_parts.append("\n=== 📎 첨부서류 관련 섹션 ===")
+        for chunk in attachment_chunks:
+            meta = chunk['metadata']
+            context_parts.append(
+                f"\n[파일: {meta['file_name']}, 섹션: {meta['section']}, 페이지: {_format_pages(meta)}]\n{chunk['text']}"
             )
 
-            # 결과 없음
-            if not results['ids'][0]:
-                print("✗ (검색 결과 없음)")
-                continue
-
-            # 3️⃣ 유사도 임계값 체크
-            top_distance = results['distances'][0][0]
-
-            # [2025-11-19 수정] 임계값 1.2 → 1.4로 완화
-            # 텍스트 추출 방식 변경으로 인해 청킹이 달라져서
-            # "사업명" 같은 메타 정보가 제목이나 본문에 분산됨
-            # → 유사도가 낮아져도 검색되도록 임계값 완화
-            if top_distance > 1.4:  # ChromaDB cosine: 0.0-2.0 range
-                print(f"✗ (거리 멀음: {top_distance:.3f}, 쿼리: '{query_text}')")
-                continue
-
-            # [디버깅] 검색 성공 시 거리 출력 (임계값 조정 참고용)
-            print(f"✓ (거리: {top_distance:.3f})", end=" ")
-
-            # 4️⃣ 검색된 chunk 정리
-            retrieved_chunks = []
-            for j in range(len(results['ids'][0])):
-                retrieved_chunks.append({
-                    'chunk_id': results['ids'][0][j],
-                    'text': results['documents'][0][j],
-                    'metadata': results['metadatas'][0][j],
-                    'distance': results['distances'][0][j]
-                })
+    context_text = "\n\n---\n".join(context_parts)
 
-            # 5️⃣ 공고 vs 첨부 분리
-            announcement_chunks = [c for c in retrieved_chunks if c['metadata']['document_type'] == 'ANNOUNCEMENT']
-            attachment_chunks = [c for c in retrieved_chunks if c['metadata']['document_type'] == 'ATTACHMENT']
-
-            # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-            # 5-1️⃣ 핵심 정보 Feature의 경우: Vision API 우선 사용
-            # 사용자에게 우선적으로 보여줄 핵심 정보를 Vision API로 정확하게 추출
-            # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-            # Frontend AnalyzeView.jsx의 coreFeatures와 일치시킴
-            # 사용자가 첫 화면에서 보는 핵심 정보들
-            core_features = [
-                'project_name',           # 사업명
-                'announcement_date',      # 공고일
-                'application_period',     # 접수기간
-                'project_period',         # 사업기간
-                'support_scale',          # 지원규모
-                'announcing_agency',      # 공고기관 (핵심 정보)
-                'evaluation_criteria',    # 평가기준 (항목별 배점 포함)
-            ]
-            is_core_feature = feature_def['feature_key'] in core_features
-            
-            vision_result = None
-            
-            # 핵심 정보 feature인 경우 Vision API를 먼저 시도 (사용자 우선 표시 정보)
-            if is_core_feature:
-                announcement_doc = None
-                announcement_file_bytes = None
-                
-                # 공고문 문서 찾기
-                for doc in documents:
-                    if doc.get('document_type') == 'ANNOUNCEMENT':
-                        announcement_doc = doc
-                        break
-                
-                # 공고문 파일의 bytes 찾기
-                if announcement_doc:
-                    announcement_file_name = announcement_doc.get('file_name', '')
-                    for file_info in state.get('files', []):
-                        file_name = file_info.get('filename') or file_info.get('file_name', '')
-                        if file_name == announcement_file_name:
-                            announcement_file_bytes = file_info.get('bytes')
-                            break
-                
-                # Vision API로 메타 정보 추출 시도
-                if announcement_file_bytes and announcement_doc:
-                    print(f"      (Vision API 시도 중...) ", end="")
-                    vision_result = extract_metadata_with_vision(
-                        file_bytes=announcement_file_bytes,
-                        file_name=announcement_doc.get('file_name', ''),
-                        feature_type=feature_def['feature_type'],
-                        feature_description=feature_def['description'],
-                        feature_key=feature_def['feature_key']  # 날짜 포함 여부 판단용
-                    )
-                    
-                    # Vision API로 값을 찾은 경우, RAG 방식 건너뛰기
-                    if vision_result and vision_result.get("found"):
-                        print(f"✓ Vision API 성공 → RAG 건너뛰기")
-                        result = vision_result
-                        
-                        # 결과 저장
-                        all_features.append({
-                            'feature_code': feature_def['feature_key'],
-                            'feature_name': feature_def['feature_type'],
-                            'title': result.get('title', ''),
-                            'summary': result.get('content', ''),
-                            'full_content': result.get('full_content', ''),
-                            'key_points': result.get('key_points', []),
-                            'writing_strategy': result.get('writing_strategy', {}),
-                            
-                            # Vision API 메타데이터
-                            'extraction_method': 'vision_api',
-                            'chunks_from_announcement': 0,
-                            'chunks_from_attachments': 0,
-                            'vector_similarity': None,
-                            
-                            # 프로젝트 정보
-                            'project_idx': state['project_idx'],
-                            'extracted_at': datetime.now().isoformat()
-                        })
-                        
-                        continue  # RAG 방식 건너뛰기
-                    else:
-                        print(f"→ RAG로 fallback")
-                
-                # Vision API 실패 시 텍스트 기반 fallback: 공고문 첫 페이지 우선 확인
-                if announcement_doc and announcement_doc.get('page_texts'):
-                    # 첫 3페이지 우선 추가
-                    first_pages_text = []
-                    for page_num in sorted(announcement_doc['page_texts'].keys())[:3]:
-                        page_text = announcement_doc['page_texts'][page_num]
-                        if page_text:
-                            first_pages_text.append(f"[공고문 첫 페이지 {page_num}]\n{page_text[:2000]}")
-                    
-                    if first_pages_text:
-                        # 첫 페이지 내용을 맨 앞에 추가
-                        announcement_chunks.insert(0, {
-                            'chunk_id': 'first_pages',
-                            'text': '\n\n'.join(first_pages_text),
-                            'metadata': {
-                                'document_type': 'ANNOUNCEMENT',
-                                'page': 1,
-                                'section': '제목/서두',
-                                'file_name': announcement_doc.get('file_name', '')
-                            },
-                            'distance': 0.0  # 우선순위가 높음
-                        })
-
-            # 6️⃣ LLM 컨텍스트 구성
-            context_parts = []
-
-            if announcement_chunks:
-                context_parts.append("=== 📄 공고문 관련 섹션 ===")
-                for chunk in announcement_chunks:
-                    meta = chunk['metadata']
-                    context_parts.append(
-                        f"\n[섹션: {meta['section']}, 페이지: {meta['page']}]\n{chunk['text']}"
-                    )
-
-            if attachment_chunks:
-                context_parts.append("\n=== 📎 첨부서류 관련 섹션 ===")
-                for chunk in attachment_chunks:
-                    meta = chunk['metadata']
-                    context_parts.append(
-                        f"\n[파일: {meta['file_name']}, 섹션: {meta['section']}, 페이지: {meta['page']}]\n{chunk['text']}"
-                    )
-
-            context_text = "\n\n---\n".join(context_parts)
-
-            # 7️⃣ LLM 호출 - 핵심 정보 vs 작성 전략 구분
-            if is_core_feature:
-                # 날짜/기간이 필요한 Feature인지 판단
-                date_required_features = ['announcement_date', 'application_period', 'project_period']
-                requires_date = feature_def['feature_key'] in date_required_features
-                
-                # Feature 타입에 따라 프롬프트 조건부 작성
-                if requires_date:
-                    # 날짜/기간 정보가 필요한 Feature
-                    content_instruction = f"""실제 {feature_def['feature_type']} 값 - **구체적인 날짜/기간을 반드시 포함** (예: '2025년 9월 9일', '2025년 10월 1일 ~ 2026년 12월 31일')"""
-                    date_emphasis = """
+    # 7️⃣ LLM 호출 - 핵심 정보 vs 작성 전략 구분
+    if is_core_feature:
+        # 날짜/기간이 필요한 Feature인지 판단
+        date_required_features = ['announcement_date', 'application_period', 'project_period']
+        requires_date = feature_def['feature_key'] in date_required_features
+
+        # Feature 타입에 따라 프롬프트 조건부 작성
+        if requires_date:
+            # 날짜/기간 정보가 필요한 Feature
+            content_instruction = f"""실제 {feature_def['feature_type']} 값 - **구체적인 날짜/기간을 반드시 포함** (예: '2025년 9월 9일', '2025년 10월 1일 ~ 2026년 12월 31일')"""
+            date_emphasis = """
 **⚠️ 매우 중요 (날짜/기간 정보):**
 - content 필드에는 **구체적인 날짜나 기간**을 반드시 포함하세요
 - 요약하지 말고, 공고문에 명시된 **정확한 날짜/기간**을 그대로 추출하세요
 - 예시: "2025년 9월 9일", "2025년 10월 1일 ~ 2026년 12월 31일", "2025.09.30(화) 14:00까지" 등"""
-                    user_examples = f"""
+            user_examples = f"""
   - {feature_def['feature_type']}: "2025년 9월 9일" 또는 "2025.09.09" (요약하지 말고 정확한 날짜)
   - 또는 "2025년 10월 1일 ~ 2026년 12월 31일" (기간인 경우 시작일과 종료일 모두 포함)"""
-                    user_emphasis = "content 필드에는 구체적인 날짜/기간을 반드시 포함하세요."
-                elif feature_def['feature_key'] == 'support_scale':
-                    # 지원규모: 숫자/금액만 필요
-                    content_instruction = f"""실제 {feature_def['feature_type']} 값 - **구체적인 숫자/금액을 반드시 포함** (예: '연간 최대 20억원 이내', '7.35억원 이내')"""
-                    date_emphasis = """
+            user_emphasis = "content 필드에는 구체적인 날짜/기간을 반드시 포함하세요."
+        elif feature_def['feature_key'] == 'support_scale':
+            # 지원규모: 숫자/금액만 필요
+            content_instruction = f"""실제 {feature_def['feature_type']} 값 - **구체적인 숫자/금액을 반드시 포함** (예: '연간 최대 20억원 이내', '7.35억원 이내')"""
+            date_emphasis = """
 **⚠️ 매우 중요 (지원규모):**
 - content 필드에는 **구체적인 숫자/금액**을 반드시 포함하세요
 - 요약하지 말고, 공고문에 명시된 **정확한 금액/규모**를 그대로 추출하세요
 - 예시: "연간 최대 20억원 이내", "7.35억원 이내", "100억원" 등
 - **날짜나 기간 정보는 포함하지 마세요**"""
-                    user_examples = f"""
+            user_examples = f"""
   - {feature_def['feature_type']}: "연간 최대 20억원 이내" 또는 "7.35억원 이내" (정확한 숫자/금액)
   - **날짜나 기간 정보는 포함하지 마세요**"""
-                    user_emphasis = "content 필드에는 구체적인 숫자/금액만 포함하세요. 날짜/기간은 포함하지 마세요."
-                else:
-                    # 사업명, 공고기관 등: 순수하게 해당 값만
-                    content_instruction = f"""실제 {feature_def['feature_type']} 값만 추출 (예: '2025년 공공AX 프로젝트 사업', '과학기술정보통신부')"""
-                    date_emphasis = f"""
+            user_emphasis = "content 필드에는 구체적인 숫자/금액만 포함하세요. 날짜/기간은 포함하지 마세요."
+        else:
+            # 사업명, 공고기관 등: 순수하게 해당 값만
+            content_instruction = f"""실제 {feature_def['feature_type']} 값만 추출 (예: '2025년 공공AX 프로젝트 사업', '과학기술정보통신부')"""
+            date_emphasis = f"""
 **⚠️ 매우 중요:**
 - content 필드에는 **{feature_def['feature_type']} 값만** 추출하세요
 - **다른 정보(날짜, 기간, 금액 등)를 섞지 마세요**
@@ -558,13 +631,13 @@ def extract_features_rag(state: BatchState) -> BatchState:
 - 예시:
   * 사업명: "2025년 공공AX 프로젝트 사업" (날짜나 기간 정보 포함 금지)
   * 공고기관: "과학기술정보통신부" (날짜나 기간 정보 포함 금지)"""
-                    user_examples = f"""
+            user_examples = f"""
   - {feature_def['feature_type']}: "{feature_def['feature_type']} 값만" (예: 사업명이면 "2025년 공공AX 프로젝트 사업"만, 공고기관이면 "과학기술정보통신부"만)
   - **다른 정보(날짜, 기간, 금액 등)를 섞지 마세요**"""
-                    user_emphasis = f"content 필드에는 {feature_def['feature_type']} 값만 추출하세요. 다른 정보를 섞지 마세요."
-                
-                # 메타 정보: 실제 값 추출에 집중
-                system_prompt = f"""당신은 정부 R&D 공고문을 분석하는 전문가입니다.
+            user_emphasis = f"content 필드에는 {feature_def['feature_type']} 값만 추출하세요. 다른 정보를 섞지 마세요."
+
+        # 메타 정보: 실제 값 추출에 집중
+        system_prompt = f"""당신은 정부 R&D 공고문을 분석하는 전문가입니다.
 공고문에서 '{feature_def['feature_type']}'의 **실제 값**을 추출해야 합니다.
 
 ⚠️ 중요:
@@ -595,7 +668,7 @@ def extract_features_rag(state: BatchState) -> BatchState:
 
 **실제 값을 찾을 수 없으면 found를 false로 반환하세요.**"""
 
-                user_prompt = f"""공고문 내용:
+        user_prompt = f"""공고문 내용:
 
 {context_text}
 
@@ -607,9 +680,9 @@ def extract_features_rag(state: BatchState) -> BatchState:
 
 작성 방법이나 가이드가 아니라, 공고문에 실제로 명시된 값을 찾으세요.
 {user_emphasis}"""
-            else:
-                # 일반 Feature: 작성 전략 추출
-                system_prompt = f"""당신은 정부 R&D 사업계획서 작성 컨설턴트입니다.
+    else:
+        # 일반 Feature: 작성 전략 추출
+        system_prompt = f"""당신은 정부 R&D 사업계획서 작성 컨설턴트입니다.
 공고문 및 첨부서류를 분석하여 '{feature_def['feature_type']}'에 대한 실질적인 작성 전략을 제시해야 합니다.
 
 [분석 대상]
@@ -633,65 +706,194 @@ def extract_features_rag(state: BatchState) -> BatchState:
 
 **해당 내용을 찾을 수 없으면 found를 false로 반환하세요.**"""
 
-                user_prompt = f"""검색된 관련 섹션:
+        user_prompt = f"""검색된 관련 섹션:
 
 {context_text}
 
 '{feature_def['feature_type']}' 정보를 찾아 JSON으로 반환해주세요."""
 
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0
-            )
+    response = call_with_backoff(
+        client.chat.completions.create,
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        response_format={"type": "json_object"},
+        temperature=0
+    )
 
-            result = json.loads(response.choices[0].message.content)
-
-            # 8️⃣ 결과 저장
-            if result.get("found"):
-                all_features.append({
-                    'feature_code': feature_def['feature_key'],
-                    'feature_name': feature_def['feature_type'],
-                    'title': result.get('title', ''),
-                    'summary': result.get('content', ''),
-                    'full_content': result.get('full_content', ''),
-                    'key_points': result.get('key_points', []),
-                    'writing_strategy': result.get('writing_strategy', {}),  # ✅ 작성 전략 추가
-
-                    # RAG 메타데이터
-                    'chunks_used': [
-                        {
-                            'file': c['metadata']['file_name'],
-                            'section': c['metadata']['section'],
-                            'page': c['metadata']['page']
-                        }
-                        for c in retrieved_chunks
-                    ],
-                    'keywords_detected': all_keywords if isinstance(keywords, dict) else keywords,
-                    'vector_similarity': float(top_distance) if top_distance is not None else None,
-                    'chunks_from_announcement': len(announcement_chunks),
-                    'chunks_from_attachments': len(attachment_chunks),
-                    'referenced_attachments': list(set(
-                        c['metadata']['file_name'] for c in attachment_chunks
-                    )),
-
-                    # 프로젝트 정보
-                    'project_idx': state['project_idx'],
-                    'extracted_at': datetime.now().isoformat()
-                })
+    result = json.loads(response.choices[0].message.content)
+
+    # 8️⃣ 결과 저장
+    if not result.get("found"):
+        log.append("✗ (LLM: found=false)")
+        return None, " ".join(log)
+
+    log.append(f"✓ (공고:{len(announcement_chunks)} + 첨부:{len(attachment_chunks)}, 유사도:{top_distance:.2f})")
+    return {
+        'feature_code': feature_def['feature_key'],
+        'feature_name': feature_def['feature_type'],
+        'title': result.get('title', ''),
+        'summary': result.get('content', ''),
+        'full_content': result.get('full_content', ''),
+        'key_points': result.get('key_points', []),
+        'writing_strategy': result.get('writing_strategy', {}),  # ✅ 작성 전략 추가
+
+        # RAG 메타데이터
+        'chunks_used': [
+            {
+                'file': c['metadata']['file_name'],
+                'section': c['metadata']['section'],
+                'page': c['metadata']['page'],
+                'page_end': c['metadata'].get('page_end', c['metadata']['page']),
+                # 같은 내용의 다른 출처 (deduplicate_chunks: 문서 내 제거된 중복 + 다른 문서의 같은 청크)
+                'duplicate_sources': [
+                    {key: source[key] for key in ('file_name', 'section', 'page', 'page_end')}
+                    for source in chunk_duplicates.get(c['chunk_id'], [])
+                ]
+            }
+            for c in retrieved_chunks
+        ],
+        'keywords_detected': all_keywords,
+        'vector_similarity': float(top_distance) if top_distance is not None else None,
+        'chunks_from_announcement': len(announcement_chunks),
+        'chunks_from_attachments': len(attachment_chunks),
+        'referenced_attachments': list(set(
+            c['metadata']['file_name'] for c in attachment_chunks
+        )),
+
+        # 프로젝트 정보
+        'project_idx': state['project_idx'],
+        'extracted_at': datetime.now().isoformat()
+    }, " ".join(log)
+
+
+def _format_pages(metadata: Dict[str, Any]) -> str:
+    """청크 페이지 표시 (여러 페이지에 걸치면 "3-4")"""
+    page_end = metadata.get('page_end', metadata['page'])
+    if page_end != metadata['page']:
+        return f"{metadata['page']}-{page_end}"
+    return f"{metadata['page']}"
+
+
+def _find_announcement_source(state: BatchState) -> Tuple[Optional[Dict[str, Any]], Optional[Any]]:
+    """공고문 문서와 원본 파일(업로드 저장소 경로 또는 bytes) 찾기 (핵심 정보 Vision API용)"""
+    announcement_doc = None
+    announcement_file_bytes = None
+
+    # 공고문 문서 찾기
+    for doc in state['documents']:
+        if doc.get('document_type') == 'ANNOUNCEMENT':
+            announcement_doc = doc
+            break
+
+    # 공고문 파일의 원본 찾기
+    if announcement_doc:
+        announcement_file_name = announcement_doc.get('file_name', '')
+        for file_info in state.get('files', []):
+            file_name = file_info.get('filename') or file_info.get('file_name', '')
+            if file_name == announcement_file_name:
+                announcement_file_bytes = file_source(file_info)
+                break
+
+    return announcement_doc, announcement_file_bytes
 
-                print(f"✓ (공고:{len(announcement_chunks)} + 첨부:{len(attachment_chunks)}, 유사도:{top_distance:.2f})")
-            else:
-                print("✗ (LLM: found=false)")
 
-        except Exception as e:
-            print(f"✗ (에러: {e})")
-            state['errors'].append(f"Feature '{feature_def['feature_type']}' 추출 실패: {str(e)}")
-    
+def extract_features_rag(state: BatchState) -> BatchState:
+    """
+    RAG 기반 Feature 추출 (크로스 문서 검색)
+
+    ✅ 핵심 기능: 공고문과 첨부서류를 종합적으로 분석하여 핵심 정보 추출
+    📌 RAG 프로세스:
+      1. Feature 키워드로 쿼리 임베딩 조회 (프로세스 내 메모이즈)
+      2. VectorDB 유사도 검색 (공고 + 첨부 통합, 상위 10개, 전체 Feature 배치 검색 1회)
+      3. 검색된 청크만 LLM에 전달 (토큰 절약)
+      4. LLM이 구조화된 JSON으로 분석 결과 반환
+    📌 동시 실행: Feature끼리 독립적이므로 스레드 풀로 병렬 처리
+      (FEATURE_EXTRACTION_CONCURRENCY로 동시 요청 수 제한, 429 응답은 지수 백오프 재시도)
+      결과 순서는 FEATURES 정의 순서를 유지
+
+    📋 추출 정보:
+      - 핵심 내용 요약
+      - key_points (요점 리스트)
+      - writing_strategy (작성 전략 - 평가 포인트, 작성 팁, 주의사항)
+
+    Returns:
+        state['extracted_features']: 추출된 Feature 리스트
+        - feature_code, feature_name, summary, full_content
+        - key_points, writing_strategy
+        - RAG 메타데이터 (사용된 청크, 유사도 등)
+    """
+    print(f"\n{'='*60}")
+    print(f"🤖 RAG 기반 Feature 추출")
+    print(f"{'='*60}")
+
+    # 전체 프로젝트에서 Feature 추출 (공고 + 첨부 통합 RAG 검색)
+    # RAG는 VectorDB에서 모든 문서를 통합 검색하므로 Feature는 프로젝트당 1번만 추출
+    announcement_doc, announcement_file_bytes = _find_announcement_source(state)
+
+    # 핵심 정보 Feature는 Vision API 1회 호출로 먼저 통합 추출 (이미지 업로드 1회)
+    core_vision_results = None
+    if VISION_COMBINED_CORE_EXTRACTION and announcement_file_bytes and announcement_doc:
+        core_feature_defs = [f for f in FEATURES if f['feature_key'] in CORE_FEATURE_KEYS]
+        core_vision_results = extract_core_metadata_with_vision(
+            file_bytes=announcement_file_bytes,
+            file_name=announcement_doc.get('file_name', ''),
+            feature_defs=core_feature_defs,
+            doc_key=announcement_doc.get('file_hash')
+        )
+
+    # 전체 Feature RAG 검색을 한 번에 (쿼리 × 청크 배치 검색, 실패 시 Feature별 단일 검색)
+    search_results: List[Optional[Dict[str, List[List[Any]]]]] = [None] * len(FEATURES)
+    try:
+        query_embeddings = get_query_embeddings([build_feature_query_text(f) for f in FEATURES])
+        search_results = query_batch(
+            state['chroma_collection'],
+            query_embeddings,
+            n_results=FEATURE_SEARCH_N_RESULTS
+        )
+        print(f"\n  🔍 Feature {len(FEATURES)}개 배치 검색 완료 (검색 호출 1회)")
+    except Exception as e:
+        print(f"\n  ⚠️  배치 검색 실패 → Feature별 검색: {e}")
+
+    workers = max(1, min(FEATURE_EXTRACTION_CONCURRENCY, len(FEATURES)))
+    print(f"\n  📋 전체 프로젝트에서 Feature 추출 중... (총 {len(FEATURES)}개, 동시 실행 {workers}개)")
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(FEATURES)
+    errors: List[Optional[str]] = [None] * len(FEATURES)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _extract_single_feature,
+                feature_def, state, announcement_doc, announcement_file_bytes, core_vision_results,
+                search_results[i]
+            ): i
+            for i, feature_def in enumerate(FEATURES)
+        }
+
+        for done_count, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            feature_def = FEATURES[i]
+            try:
+                results[i], log = future.result()
+            except Exception as e:
+                log = f"✗ (에러: {e})"
+                errors[i] = f"Feature '{feature_def['feature_type']}' 추출 실패: {str(e)}"
+            print(f"    [{done_count}/{len(FEATURES)}] {feature_def['feature_type']}... {log}")
+            emit_progress(
+                'extract_features_rag',
+                completed=done_count,
+                total=len(FEATURES),
+                feature=feature_def['feature_key'],
+                found=results[i] is not None
+            )
+
+    # FEATURES 정의 순서대로 결과/에러 정리
+    all_features = [feature for feature in results if feature]
+    state['errors'].extend(error for error in errors if error)
+
     state['extracted_features'] = all_features
     state['status'] = 'features_extracted'
 
@@ -700,6 +902,7 @@ def extract_features_rag(state: BatchState) -> BatchState:
     return state
 
 
+
 # ========================================
 # [2025-01-10 suyeon] match_cross_references 함수 삭제
 # 삭제 이유:
@@ -709,31 +912,34 @@ def extract_features_rag(state: BatchState) -> BatchState:
 # 근거: MVP2에서 분석 대시보드 구현 시 새로운 구조로 재작성 예정
 
 
-def save_to_csv(state: BatchState) -> BatchState:
+def save_to_csv(state: BatchState, artifact_sink: Optional[ArtifactSink] = None) -> BatchState:
     """
     분석 결과를 로컬 파일로 저장 (개발/테스트용)
 
     ⚠️ 운영 환경: Backend API 호출(build_response)이 Oracle DB 저장을 담당
     📁 로컬 저장: 개발 중 디버깅, 테스트 결과 확인용
+    📌 파일 내용만 만들어 artifact sink에 넘기고 바로 반환 (쓰기는 백그라운드, 응답을 막지 않음)
 
     저장 파일:
     1. ANALYSIS_RESULT_{timestamp}.csv - Feature 추출 결과 (RAG + LLM 분석)
     2. ANALYSIS_RESULT_{timestamp}.json - Feature 추출 결과 (JSON)
     3. table_of_contents_{timestamp}.json - 목차 정보 (JSON)
     """
+    if artifact_sink is None or not artifact_sink.enabled:
+        return state
 
     print(f"\n{'='*60}")
-    print(f"💾 분석 결과 로컬 저장 (개발/테스트용)")
+    print(f"💾 분석 결과 로컬 저장 (개발/테스트용, {artifact_sink.mode})")
     print(f"{'='*60}")
 
-    # 저장 디렉토리 생성
-    output_folder = Path("./parsed_results/v6_rag")
-    output_folder.mkdir(parents=True, exist_ok=True)
+    # 저장 디렉토리 (artifact sink 기준 상대 경로)
+    output_folder = "parsed_results/v6_rag"
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     project_idx = state['project_idx']
 
-    output_paths = {}
+    artifacts = []
+    artifact_keys = {}
 
     try:
         # ========================================
@@ -778,47 +984,41 @@ def save_to_csv(state: BatchState) -> BatchState:
             })
 
         df_analysis = pd.DataFrame(analysis_data)
-        csv_path = output_folder / f"ANALYSIS_RESULT_{project_idx}_{timestamp}.csv"
-        df_analysis.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        output_paths['csv'] = str(csv_path)
+        csv_name = f"{output_folder}/ANALYSIS_RESULT_{project_idx}_{timestamp}.csv"
+        # utf-8-sig: 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        artifacts.append((csv_name, '\ufeff' + df_analysis.to_csv(index=False)))
+        artifact_keys['csv'] = csv_name
         print(f"\n  ✅ ANALYSIS_RESULT.csv: {len(analysis_data)}행")
-        print(f"     → {csv_path.name}")
 
         # ========================================
         # 2. ANALYSIS_RESULT.json (Feature 추출 결과)
         # ========================================
-        json_result_path = output_folder / f"ANALYSIS_RESULT_{project_idx}_{timestamp}.json"
-        with open(json_result_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis_json, f, ensure_ascii=False, indent=2)
-        output_paths['analysis_json'] = str(json_result_path)
+        json_result_name = f"{output_folder}/ANALYSIS_RESULT_{project_idx}_{timestamp}.json"
+        artifacts.append((json_result_name, json.dumps(analysis_json, ensure_ascii=False, indent=2)))
+        artifact_keys['analysis_json'] = json_result_name
         print(f"\n  ✅ ANALYSIS_RESULT.json: {len(analysis_json)}개 항목")
-        print(f"     → {json_result_path.name}")
-        
+
         # ========================================
         # 3. table_of_contents.json (목차 정보)
         # ========================================
         toc = state.get('table_of_contents')
         if toc:
-            json_path = output_folder / f"table_of_contents_{project_idx}_{timestamp}.json"
-
-            # JSON 저장 (들여쓰기 포함)
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(toc, f, ensure_ascii=False, indent=2)
-
-            output_paths['json'] = str(json_path)
+            json_name = f"{output_folder}/table_of_contents_{project_idx}_{timestamp}.json"
+            artifacts.append((json_name, json.dumps(toc, ensure_ascii=False, indent=2)))
+            artifact_keys['json'] = json_name
             print(f"\n  ✅ table_of_contents.json: {toc.get('total_sections', 0)}개 섹션")
-            print(f"     → {json_path.name}")
             print(f"     출처: {toc.get('source', 'unknown')}")
         else:
             print(f"\n  ⚠️  table_of_contents.json: 목차 없음, 생성 스킵")
 
-        # State 업데이트
-        state['csv_paths'] = output_paths
+        locations = artifact_sink.submit(analysis_artifact_id(state), artifacts)
+
+        # State 업데이트 (저장 예정 위치)
+        state['csv_paths'] = {key: locations[name] for key, name in artifact_keys.items()}
         state['status'] = 'csv_saved'
 
-        print(f"\n  💾 저장 위치: {output_folder.absolute()}")
-        print(f"  📊 총 {len(output_paths)}개 파일 생성")
-        
+        print(f"\n  📊 총 {len(artifacts)}개 파일 저장 요청")
+
     except Exception as e:
         error_msg = f"파일 저장 실패: {str(e)}"
         print(f"\n  ❌ {error_msg}")
@@ -12,6 +12,8 @@ import unicodedata
 import numpy as np
 
 from ..state_types import BatchState
+from ..config import TEMPLATE_DETECTION_QUERY
+from ..embeddings import get_query_embedding
 
 
 def detect_proposal_templates(state: BatchState) -> BatchState:
@@ -104,20 +106,8 @@ def detect_proposal_templates(state: BatchState) -> BatchState:
 
         # 신호 3: RAG로 첨부파일 자체에서 "양식" 관련 키워드 검색
         try:
-            # OpenAI API로 쿼리 임베딩 생성 (processing.py의 extract_features_rag와 동일한 방식)
-            from openai import OpenAI
-            import os
-            from dotenv import load_dotenv
-            
-            load_dotenv()
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            
-            query_text = "양식 서식 작성예시 작성방법 입력칸"
-            query_response = client.embeddings.create(
-                model="text-embedding-3-small",
-                input=[query_text]
-            )
-            query_embedding = [query_response.data[0].embedding]
+            # 고정 쿼리 임베딩 (프로세스 내 메모이즈 → API 호출 없음)
+            query_embedding = [get_query_embedding(TEMPLATE_DETECTION_QUERY)]
 
             results = collection.query(
                 query_embeddings=query_embedding,
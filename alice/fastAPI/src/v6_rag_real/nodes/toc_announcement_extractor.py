@@ -8,6 +8,8 @@ from typing import List, Dict, Tuple
 from datetime import datetime
 
 from .toc_util import client
+from ..config import TOC_CONTEXT_QUERY
+from ..embeddings import get_query_embedding
 
 
 def prepare_announcement_context(state: Dict, collection) -> Tuple[str, List[Dict]]:
@@ -34,12 +36,7 @@ def prepare_announcement_context(state: Dict, collection) -> Tuple[str, List[Dic
 
     # 2️⃣ RAG 검색
     try:
-        query_text = "제출서류 작성항목 구성 목차 제안서 계획서 사업계획서 운영계획"
-        query_response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=[query_text]
-        )
-        query_embedding = [query_response.data[0].embedding]
+        query_embedding = [get_query_embedding(TOC_CONTEXT_QUERY)]
 
         results = collection.query(
             query_embeddings=query_embedding,
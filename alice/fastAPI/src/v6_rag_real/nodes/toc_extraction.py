@@ -9,8 +9,12 @@ import json
 import re
 import unicodedata
 from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
 
 from ..state_types import BatchState
+from ..blobs import file_source
+from ..config import TOC_SPECULATIVE_PREFETCH, SPECULATIVE_TEMPLATE_KEYWORDS, TOC_PROMPT_VERSION
+from ..cache import toc_cache
 from .toc_util import (
     find_proposal_template,
     create_default_toc,
@@ -39,14 +43,118 @@ def route_toc_extraction(state: BatchState) -> str:
         return "extract_toc_from_announcement_and_attachments"
 
 
+def _toc_cache_key(file_hash: str) -> str:
+    """양식 목차 캐시 키 (프롬프트 버전 포함)"""
+    return f"toc_v{TOC_PROMPT_VERSION}_{file_hash}"
+
+
+def _extract_template_toc_sections(
+    file_bytes: Any,
+    file_name: str,
+    file_hash: Optional[str],
+    page_texts: Optional[Mapping[int, str]] = None
+) -> Optional[List[Dict]]:
+    """
+    양식 목차 섹션 추출 (목차 캐시 우선, 없으면 전체 문서 Vision 추출 후 캐시 저장)
+
+    Args:
+        file_bytes: 양식 원본 (업로드 저장소 경로 또는 bytes)
+        file_name: 양식 파일명 (로깅용)
+        file_hash: 양식 파일 SHA-256 (없으면 캐시 사용 안 함)
+        page_texts: 양식 페이지별 텍스트 (목차 페이지 범위 텍스트 1차 판별용)
+
+    Returns:
+        섹션 리스트 (description 포함), 실패 시 None
+    """
+    if file_hash:
+        cached = toc_cache.get(_toc_cache_key(file_hash))
+        if cached is not None:
+            print(f"    ⚡ 목차 캐시 적중 (sha256 {file_hash[:12]}...): {len(cached['sections'])}개 섹션, Vision API 생략")
+            return cached['sections']
+
+    toc_sections = extract_toc_from_full_document_vision(
+        file_bytes, file_name, page_texts=page_texts, file_hash=file_hash
+    )
+
+    # 성공한 결과만 저장 (실패/섹션 부족은 일시적 오류일 수 있으므로 다음 요청에서 재시도)
+    if file_hash and toc_sections and len(toc_sections) >= 3:
+        toc_cache.put(_toc_cache_key(file_hash), {'file_name': file_name, 'sections': toc_sections})
+
+    return toc_sections
+
+
+def _speculative_template_candidate(state: BatchState) -> Optional[Dict[str, Any]]:
+    """
+    Feature 추출 전에 알 수 있는 신호만으로 고른 양식 후보 (선행 목차 추출용)
+
+    detect_proposal_templates에서 파일명 키워드(계획서/제안서/신청서) + 표 구조만으로
+    임계값(0.6)을 넘는 첨부 → 거의 항상 양식으로 감지되므로 추측이 빗나갈 가능성이 낮음
+    """
+    candidates = []
+    for doc in state.get('documents', []):
+        if doc.get('folder') != 2:
+            continue
+        file_name = unicodedata.normalize('NFC', doc.get('file_name', ''))
+        has_table_structure = any(t.get('rows', 0) >= 2 for t in doc.get('tables', []))
+        if has_table_structure and any(kw in file_name for kw in SPECULATIVE_TEMPLATE_KEYWORDS):
+            candidates.append({
+                'file_name': file_name,
+                'file_hash': doc.get('file_hash'),
+                'page_texts': doc.get('page_texts'),
+                'attachment_number': doc.get('attachment_number'),
+                'has_template': True,
+                'confidence_score': 0.7
+            })
+    return find_proposal_template(candidates)
+
+
+def prefetch_template_toc(state: BatchState) -> Dict[str, Any]:
+    """
+    양식 목차 선행 추출 (extract_features_rag와 병렬 실행)
+
+    목차 Vision 추출은 양식 원본만 필요하고 Feature 결과와 무관하므로,
+    양식 후보를 미리 골라 Feature 추출과 동시에 진행한다.
+    extract_toc_from_template은 감지된 양식이 후보와 같으면 이 결과를 재사용한다.
+
+    ⚠️ 병렬 노드이므로 state 전체가 아니라 변경 키만 반환 (동시 업데이트 충돌 방지)
+
+    Returns:
+        {'speculative_toc': {'file_name': 양식 파일명(NFC), 'sections': 섹션 리스트 또는 None}}
+        (후보가 없거나 비활성화 시 빈 dict)
+    """
+    if not TOC_SPECULATIVE_PREFETCH:
+        return {}
+
+    candidate = _speculative_template_candidate(state)
+    if not candidate:
+        return {}
+
+    file_bytes = None
+    for file_info in state.get('files', []):
+        if unicodedata.normalize('NFC', str(file_info.get('filename', ''))) == candidate['file_name']:
+            file_bytes = file_source(file_info)
+            break
+    if not file_bytes:
+        return {}
+
+    print(f"\n  ⚡ 양식 목차 선행 추출 시작 (Feature 추출과 병렬): {candidate['file_name']}")
+    toc_sections = _extract_template_toc_sections(
+        file_bytes, candidate['file_name'], candidate['file_hash'], candidate['page_texts']
+    )
+    print(f"  ⚡ 양식 목차 선행 추출 완료: {len(toc_sections) if toc_sections else 0}개 섹션")
+
+    return {'speculative_toc': {'file_name': candidate['file_name'], 'sections': toc_sections}}
+
+
 def extract_toc_from_template(state: BatchState) -> BatchState:
     """
     제안서 양식에서 목차 추출
 
     처리 흐름:
     1. 양식 찾기 (detect_templates 결과 또는 파일명 기반)
-    2. Vision API로 전체 문서 분석 (우선)
-    3. 실패 시 기본 템플릿 반환
+    2. 선행 추출(prefetch_template_toc) 결과가 같은 양식이면 재사용
+    3. 아니면 목차 캐시(양식 SHA-256 + 프롬프트 버전) 조회, 없으면 Vision API로 전체 문서 분석
+    4. 실패 시 기본 템플릿 반환
     """
     print(f"\n{'='*60}")
     print(f"📑 양식에서 목차 추출 (Vision API 전용)")
@@ -118,29 +226,44 @@ def extract_toc_from_template(state: BatchState) -> BatchState:
     # 🎯 Vision API로만 목차 추출 (텍스트 기반 fallback 제거)
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-    # file_bytes 찾기 - Unicode 정규화 적용
-    file_bytes = None
     target_filename = template['file_name']
     target_filename_normalized = unicodedata.normalize('NFC', str(target_filename))
 
-    for file_info in state.get('files', []):
-        current_filename = unicodedata.normalize('NFC', str(file_info.get('filename', '')))
-        if current_filename == target_filename_normalized:
-            file_bytes = file_info.get('bytes')
-            if file_bytes:
-                print(f"  ✓ 양식 파일 발견: {target_filename} ({len(file_bytes):,} bytes)")
-                break
-
-    if not file_bytes:
-        print(f"    ⚠️  file_bytes 없음 → 기본 템플릿 사용")
-        state['table_of_contents'] = create_default_toc()
-        state['status'] = 'toc_extracted'
-        return state
+    # Feature 추출과 병렬로 미리 추출한 결과가 같은 양식이고 섹션이 있으면 그대로 사용
+    # (같은 양식인데 선행 추출이 실패했으면 아래에서 다시 추출)
+    speculative = state.get('speculative_toc') or {}
+    same_template = speculative.get('file_name') == target_filename_normalized
+    if same_template and speculative.get('sections'):
+        print(f"    ⚡ 선행 추출 결과 사용 (prefetch_template_toc): {target_filename}")
+        toc_sections = speculative['sections']
+    else:
+        if same_template:
+            print(f"    ↪️  선행 추출 실패 ({target_filename}) → 다시 추출")
+        elif speculative:
+            print(f"    ↪️  선행 추출 양식({speculative.get('file_name')})과 다름 → 다시 추출")
+
+        # 양식 원본 찾기 (업로드 저장소 경로 또는 bytes) - Unicode 정규화 적용
+        file_bytes = None
+        for file_info in state.get('files', []):
+            current_filename = unicodedata.normalize('NFC', str(file_info.get('filename', '')))
+            if current_filename == target_filename_normalized:
+                file_bytes = file_source(file_info)
+                if file_bytes:
+                    print(f"  ✓ 양식 파일 발견: {target_filename}")
+                    break
+
+        if not file_bytes:
+            print(f"    ⚠️  file_bytes 없음 → 기본 템플릿 사용")
+            state['table_of_contents'] = create_default_toc()
+            state['status'] = 'toc_extracted'
+            return state
 
-    print(f"    🎯 양식 전체 문서 Vision API 분석 시도...")
+        print(f"    🎯 양식 전체 문서 Vision API 분석 시도...")
 
-    # 전체 문서 Vision API로 목차 추출
-    toc_sections = extract_toc_from_full_document_vision(file_bytes, template['file_name'])
+        # 전체 문서 Vision API로 목차 추출 (같은 양식 파일이면 목차 캐시 재사용)
+        toc_sections = _extract_template_toc_sections(
+            file_bytes, template['file_name'], template_doc.get('file_hash'), template_doc.get('page_texts')
+        )
 
     if toc_sections and len(toc_sections) >= 3:
         print(f"    ✅ 전체 문서 Vision API 성공: {len(toc_sections)}개 섹션 추출")
@@ -7,14 +7,14 @@ import re
 import json
 import unicodedata
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Mapping, Optional, Tuple
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
-import base64
-import io
 
 from ..state_types import BatchState
+from ..config import TOC_TEXT_FIRST_DETECTION, TOC_DESCRIPTION_TEXT_FILTER
+from ..page_images import get_page_images, iter_page_image_batches, to_image_contents
 
 # OpenAI 클라이언트 초기화
 load_dotenv()
@@ -171,45 +171,33 @@ def extract_toc_from_toc_page(toc_page_info: Dict) -> List[Dict]:
     return sections
 
 
-def convert_pdf_page_to_image(file_bytes: bytes, page_number: int) -> Optional[str]:
+def convert_pdf_page_to_image(file_bytes: bytes, page_number: int, doc_key: Optional[str] = None) -> Optional[str]:
     """
     PDF의 특정 페이지를 이미지로 변환하여 base64 인코딩
 
     Args:
         file_bytes: PDF 파일의 바이트 데이터
         page_number: 변환할 페이지 번호 (1-based)
+        doc_key: 페이지 이미지 캐시 키 (문서 file_hash, 없으면 file_bytes 해시 계산)
 
     Returns:
         Optional[str]: base64로 인코딩된 이미지 문자열 (data URL 형식)
                       실패 시 None
     """
     try:
-        # pdf2image 라이브러리 사용
-        from pdf2image import convert_from_bytes
-
-        # 특정 페이지만 변환 (first_page, last_page는 1-based)
-        images = convert_from_bytes(
+        # 특정 페이지만 변환 (페이지 이미지 캐시 공유)
+        images = get_page_images(
             file_bytes,
             first_page=page_number,
             last_page=page_number,
-            dpi=100  # 해상도 (150 DPI면 충분히 읽기 좋음)
+            dpi=100,  # 해상도 (150 DPI면 충분히 읽기 좋음)
+            doc_key=doc_key
         )
 
         if not images:
             return None
 
-        # 첫 번째 (유일한) 이미지를 PNG로 변환
-        img = images[0]
-
-        # BytesIO 버퍼에 PNG로 저장
-        img_buffer = io.BytesIO()
-        img.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
-
-        # base64 인코딩
-        img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-
-        return f"data:image/png;base64,{img_base64}"
+        return images[0]
 
     except ImportError:
         print("    ⚠️  pdf2image 라이브러리가 설치되지 않았습니다.")
@@ -322,7 +310,131 @@ def extract_toc_from_image_with_vision(image_base64: str, file_name: str) -> Opt
         return None
 
 
-def find_toc_page_range_with_vision(file_bytes: bytes, file_name: str, max_pages: int = 100) -> Optional[Tuple[int, int]]:
+# ========================================
+# 텍스트 기반 목차 페이지 판별 (Vision 호출 전 1차 판별)
+# ========================================
+TOC_SEARCH_PAGES = 10  # 목차 탐색 범위 (앞쪽 페이지, Vision 탐색과 동일)
+TOC_TITLE_KEYWORDS = ['목 차', '목차', 'TABLE OF CONTENTS', 'CONTENTS']
+TOC_END_KEYWORDS = ['사업비 소요명세', '소요명세']
+_TOC_ENTRY_RE = re.compile(r'^\s*([IVX]{1,5}|[1-9]\d?)\.\s+[가-힣\w]{2,}')
+_TOC_LEADER_RE = re.compile(r'(\.{3,}|·{3,}|…+|-{3,})\s*\d{1,3}\s*$')
+TOC_TEXT_MIN_CHARS = 200  # 이보다 텍스트가 적은 페이지는 텍스트 레이어가 없을 수 있으므로 판별 보류
+
+# 페이지 판별 결과
+TOC_PAGE = 'toc'
+NOT_TOC_PAGE = 'not_toc'
+AMBIGUOUS_PAGE = 'ambiguous'
+
+
+def _has_toc_entry(page_text: str) -> bool:
+    """번호 목차 항목(I. / 1. 제목) 줄이 하나라도 있는지"""
+    return any(_TOC_ENTRY_RE.match(line.strip()) for line in (page_text or '').split('\n'))
+
+
+def classify_toc_page_text(page_text: str) -> str:
+    """
+    페이지 텍스트만으로 목차 페이지 여부 판별
+
+    - toc: 상단에 목차 제목 + 이어지는 번호 항목 (find_toc_page와 같은 규칙),
+           또는 번호 항목 3개 이상 + 점선/쪽 번호 줄 3개 이상
+    - not_toc: 텍스트가 충분한데 목차 제목/번호 항목이 거의 없음
+    - ambiguous: 그 외 (번호 항목만 있는 본문/양식, 텍스트 레이어가 없는 스캔 페이지 등) → Vision으로 판별
+    """
+    text = page_text or ''
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+
+    for idx, line in enumerate(lines[:50]):
+        if any(keyword in line for keyword in TOC_TITLE_KEYWORDS):
+            if any(_TOC_ENTRY_RE.match(lookahead) for lookahead in lines[idx + 1:idx + 16]):
+                return TOC_PAGE
+
+    entry_lines = sum(1 for line in lines if _TOC_ENTRY_RE.match(line))
+    leader_lines = sum(1 for line in lines if _TOC_LEADER_RE.search(line))
+    if entry_lines >= 3 and leader_lines >= 3:
+        return TOC_PAGE
+
+    if len(text.strip()) >= TOC_TEXT_MIN_CHARS and entry_lines < 2 and leader_lines < 2:
+        return NOT_TOC_PAGE
+    return AMBIGUOUS_PAGE
+
+
+def find_toc_page_range_by_text(page_texts: Mapping[int, str], search_pages: int = TOC_SEARCH_PAGES) -> Tuple[Optional[Tuple[int, int]], List[int]]:
+    """
+    텍스트 기반 목차 페이지 범위 탐지 (1차 판별)
+
+    Args:
+        page_texts: {페이지 번호: 텍스트} (extract_all_texts 결과)
+        search_pages: 앞에서부터 검사할 페이지 수
+
+    Returns:
+        ((시작 페이지, 종료 페이지) 또는 None, 판별 보류 페이지 리스트)
+        - 범위를 찾으면 판별 보류 페이지는 무시해도 됨
+        - 범위가 None이고 보류 페이지도 없으면 앞쪽 페이지에 목차가 없음
+    """
+    pages = sorted(page_num for page_num in page_texts if page_num <= search_pages)
+    labels = {page_num: classify_toc_page_text(page_texts[page_num]) for page_num in pages}
+
+    toc_pages = [page_num for page_num in pages if labels[page_num] == TOC_PAGE]
+    if not toc_pages:
+        return None, [page_num for page_num in pages if labels[page_num] == AMBIGUOUS_PAGE]
+
+    # 시작 페이지부터 목차/보류 페이지가 이어지는 동안 확장, 종료 키워드가 나오면 그 페이지에서 종료
+    toc_start = toc_pages[0]
+    toc_end = toc_start
+    for page_num in pages[pages.index(toc_start):]:
+        if page_num != toc_start and (labels[page_num] == NOT_TOC_PAGE or page_num != toc_end + 1):
+            break
+        if page_num != toc_start and labels[page_num] == AMBIGUOUS_PAGE and not _has_toc_entry(page_texts[page_num]):
+            break
+        toc_end = page_num
+        if any(keyword in (page_texts[page_num] or '') for keyword in TOC_END_KEYWORDS):
+            break
+
+    return (toc_start, toc_end), []
+
+
+def find_toc_page_range(
+    file_bytes: bytes,
+    file_name: str,
+    page_texts: Optional[Mapping[int, str]] = None,
+    max_pages: int = 100,
+    doc_key: Optional[str] = None
+) -> Optional[Tuple[int, int]]:
+    """
+    목차 페이지 범위 찾기 (텍스트 1차 판별 → 판별 보류 페이지만 Vision)
+
+    1. page_texts로 앞쪽 페이지를 toc / not_toc / ambiguous로 분류
+    2. 목차 페이지가 확인되면 이미지 변환/Vision 호출 없이 범위 반환
+    3. 확인되지 않으면 보류 페이지를 포함하는 구간만 Vision으로 탐색
+       (보류 페이지가 없으면 목차 없음으로 판단, page_texts가 없으면 기존 Vision 전체 탐색)
+    """
+    if not TOC_TEXT_FIRST_DETECTION or not page_texts:
+        return find_toc_page_range_with_vision(file_bytes, file_name, max_pages, doc_key=doc_key)
+
+    page_range, ambiguous_pages = find_toc_page_range_by_text(page_texts)
+    if page_range:
+        print(f"    ✅ 텍스트 기반 목차 페이지 범위: {page_range[0]}-{page_range[1]} (Vision 생략)")
+        return page_range
+
+    if not ambiguous_pages:
+        print(f"    ⚠️  텍스트 기반 판별: 첫 {TOC_SEARCH_PAGES}페이지에 목차 없음 (Vision 생략)")
+        return None
+
+    first_page, last_page = ambiguous_pages[0], ambiguous_pages[-1]
+    print(f"    🔍 텍스트로 판별 보류 {len(ambiguous_pages)}페이지 → Vision 탐색: {first_page}-{last_page}페이지")
+    return find_toc_page_range_with_vision(
+        file_bytes, file_name, max_pages, first_page=first_page, last_page=last_page, doc_key=doc_key
+    )
+
+
+def find_toc_page_range_with_vision(
+    file_bytes: bytes,
+    file_name: str,
+    max_pages: int = 100,
+    first_page: int = 1,
+    last_page: int = TOC_SEARCH_PAGES,
+    doc_key: Optional[str] = None
+) -> Optional[Tuple[int, int]]:
     """
     Vision API를 사용하여 목차가 시작하고 끝나는 페이지 범위 찾기
 
@@ -336,22 +448,25 @@ def find_toc_page_range_with_vision(file_bytes: bytes, file_name: str, max_pages
         file_bytes: PDF 파일의 바이트 데이터
         file_name: 파일명 (로깅용)
         max_pages: 최대 검색 페이지 수 (사용하지 않음, 항상 10페이지만 검색)
+        first_page, last_page: 검색 구간 (기본 1-10페이지, 텍스트 판별 후에는 보류 페이지 구간만)
+        doc_key: 페이지 이미지 캐시 키 (양식 file_hash, 없으면 file_bytes 해시 계산)
 
     Returns:
         Optional[Tuple[int, int]]: (시작 페이지, 종료 페이지) 또는 None
                                   페이지 번호는 1-based
     """
     try:
-        from pdf2image import convert_from_bytes
-
-        print(f"    🔍 목차 페이지 범위 찾기 시작 (첫 10페이지 검색)...")
+        print(f"    🔍 목차 페이지 범위 찾기 시작 ({first_page}-{last_page}페이지 검색)...")
 
-        # 첫 10페이지만 검사
-        search_pages = 10
-        images = convert_from_bytes(
+        # 검색 구간만 이미지 변환 (base64 data URL, 3단계 배치에서 재사용)
+        # 아래 toc_start/toc_end는 images 기준 상대 페이지 → 반환 시 page_offset 더함
+        page_offset = first_page - 1
+        images = get_page_images(
             file_bytes,
+            first_page=first_page,
+            last_page=last_page,
             dpi=100,
-            last_page=search_pages
+            doc_key=doc_key
         )
 
         if not images:
@@ -367,19 +482,7 @@ def find_toc_page_range_with_vision(file_bytes: bytes, file_name: str, max_pages
             end_idx = min(start_idx + 5, len(images))
             batch_images = images[start_idx:end_idx]
 
-            image_contents = []
-            for img in batch_images:
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format='PNG')
-                img_buffer.seek(0)
-                img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-                image_contents.append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/png;base64,{img_base64}",
-                        "detail": "high"
-                    }
-                })
+            image_contents = to_image_contents(batch_images)
 
             system_prompt = """당신은 PDF 문서를 분석하여 목차 페이지 범위를 찾는 전문가입니다.
 
@@ -410,8 +513,8 @@ JSON 형식으로 반환:
 - 첫 번째 이미지 = 1, 두 번째 이미지 = 2, 세 번째 이미지 = 3 ...
 - 절대 페이지 번호가 아닙니다!"""
 
-            batch_start_page = start_idx + 1
-            batch_end_page = end_idx
+            batch_start_page = page_offset + start_idx + 1
+            batch_end_page = page_offset + end_idx
             batch_size = len(batch_images)
             
             user_prompt = f"""첨부된 이미지들은 '{file_name}' 파일의 **{batch_size}개 페이지**입니다.
@@ -494,19 +597,7 @@ JSON 형식으로 반환:
                 end_idx = min(start_idx + 3, len(images))
                 batch_images = images[start_idx:end_idx]
 
-                image_contents = []
-                for img in batch_images:
-                    img_buffer = io.BytesIO()
-                    img.save(img_buffer, format='PNG')
-                    img_buffer.seek(0)
-                    img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-                    image_contents.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{img_base64}",
-                            "detail": "high"
-                        }
-                    })
+                image_contents = to_image_contents(batch_images)
 
                 pattern_system_prompt = """당신은 PDF 문서를 분석하여 번호 패턴으로 나열된 목차를 찾는 전문가입니다.
 
@@ -530,8 +621,8 @@ JSON 형식으로 반환:
 - 첫 번째 이미지 = 1, 두 번째 이미지 = 2, 세 번째 이미지 = 3 ...
 - 절대 페이지 번호가 아닙니다!"""
 
-                batch_start_page = start_idx + 1
-                batch_end_page = end_idx
+                batch_start_page = page_offset + start_idx + 1
+                batch_end_page = page_offset + end_idx
                 batch_size = len(batch_images)
                 
                 pattern_user_prompt = f"""첨부된 이미지들은 '{file_name}' 파일의 **{batch_size}개 페이지**입니다.
@@ -614,23 +705,11 @@ JSON 형식으로 반환:
                 end_idx = min(start_idx + 3, search_end)
                 batch_images = images[start_idx:end_idx]
 
-                image_contents = []
-                for img in batch_images:
-                    img_buffer = io.BytesIO()
-                    img.save(img_buffer, format='PNG')
-                    img_buffer.seek(0)
-                    img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-                    image_contents.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{img_base64}",
-                            "detail": "high"
-                        }
-                    })
+                image_contents = to_image_contents(batch_images)
 
                 end_system_prompt = """목차 종료 지점을 찾으세요. "사업비 소요명세" 또는 번호 패턴이 끝나는 지점을 찾으세요."""
 
-                end_user_prompt = f"""첨부된 이미지들은 '{file_name}' 파일의 페이지 {start_idx + 1}-{end_idx}입니다.
+                end_user_prompt = f"""첨부된 이미지들은 '{file_name}' 파일의 페이지 {page_offset + start_idx + 1}-{page_offset + end_idx}입니다.
 목차가 끝나는 페이지를 찾으세요."""
 
                 messages_content = [{"type": "text", "text": end_user_prompt}]
@@ -662,11 +741,11 @@ JSON 형식으로 반환:
             # 종료 페이지를 못 찾은 경우, 시작 페이지 + 10 페이지를 종료로 설정
             if not toc_end:
                 toc_end = min(toc_start + 10, len(images))
-                print(f"    ⚠️  목차 종료 페이지를 찾지 못함 → 시작 페이지 + 10으로 설정: {toc_end}")
+                print(f"    ⚠️  목차 종료 페이지를 찾지 못함 → 시작 페이지 + 10으로 설정: {page_offset + toc_end}")
             
-            return (toc_start, toc_end)
+            return (page_offset + toc_start, page_offset + toc_end)
         else:
-            print(f"    ⚠️  목차 페이지 범위를 찾지 못함 (첫 10페이지 내에서)")
+            print(f"    ⚠️  목차 페이지 범위를 찾지 못함 ({first_page}-{last_page}페이지 내에서)")
             return None
 
     except Exception as e:
@@ -676,7 +755,13 @@ JSON 형식으로 반환:
         return None
 
 
-def extract_toc_from_page_range_with_vision(file_bytes: bytes, file_name: str, start_page: int, end_page: int) -> Optional[List[Dict]]:
+def extract_toc_from_page_range_with_vision(
+    file_bytes: bytes,
+    file_name: str,
+    start_page: int,
+    end_page: int,
+    doc_key: Optional[str] = None
+) -> Optional[List[Dict]]:
     """
     Vision API를 사용하여 특정 페이지 범위에서 목차 추출
 
@@ -685,21 +770,21 @@ def extract_toc_from_page_range_with_vision(file_bytes: bytes, file_name: str, s
         file_name: 파일명 (로깅용)
         start_page: 시작 페이지 (1-based)
         end_page: 종료 페이지 (1-based, 포함)
+        doc_key: 페이지 이미지 캐시 키 (양식 file_hash, 없으면 file_bytes 해시 계산)
 
     Returns:
         Optional[List[Dict]]: 추출된 섹션 리스트
     """
     try:
-        from pdf2image import convert_from_bytes
-
         print(f"    📋 목차 페이지 범위 분석: {start_page}-{end_page} 페이지")
 
-        # 해당 페이지 범위를 이미지로 변환
-        images = convert_from_bytes(
+        # 해당 페이지 범위를 이미지로 변환 (범위 탐색 단계에서 렌더링한 페이지는 재사용)
+        images = get_page_images(
             file_bytes,
-            dpi=100,
             first_page=start_page,
-            last_page=end_page
+            last_page=end_page,
+            dpi=100,
+            doc_key=doc_key
         )
 
         if not images:
@@ -708,20 +793,7 @@ def extract_toc_from_page_range_with_vision(file_bytes: bytes, file_name: str, s
 
         print(f"    📄 {len(images)}개 페이지를 이미지로 변환 완료")
 
-        # 이미지들을 base64로 인코딩
-        image_contents = []
-        for img in images:
-            img_buffer = io.BytesIO()
-            img.save(img_buffer, format='PNG')
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-            image_contents.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/png;base64,{img_base64}",
-                    "detail": "high"
-                }
-            })
+        image_contents = to_image_contents(images)
 
         system_prompt = """당신은 PDF 문서의 목차 페이지를 분석하는 전문가입니다.
 
@@ -802,74 +874,125 @@ def extract_toc_from_page_range_with_vision(file_bytes: bytes, file_name: str, s
         return None
 
 
+# ========================================
+# 텍스트 기반 작성요령 페이지 선택 (이미지 변환 전 필터)
+# ========================================
+DESCRIPTION_GUIDE_KEYWORDS = ['작성요령', '기재요령', '작성방법', '기재방법']  # 공백 제거 후 비교
+DESCRIPTION_TITLE_TOKEN_RATIO = 0.6  # 제목 단어 중 이 비율 이상이 페이지에 있으면 해당 항목 페이지로 판단
+DESCRIPTION_TEXT_MIN_CHARS = 30  # 이보다 텍스트가 적은 페이지는 텍스트 레이어가 없을 수 있으므로 포함
+_TITLE_NUMBER_RE = re.compile(r'^\s*([IVX]{1,5}|[Ⅰ-Ⅻ]|\d+(\.\d+)*|[가-하]|[①-⑳])[\.\)]?\s+')
+_MATCH_STRIP_RE = re.compile(r'[^가-힣A-Za-z0-9]')
+
+
+def _normalize_for_match(text: str) -> str:
+    """비교용 정규화 (NFC, 공백/기호 제거, 소문자)"""
+    return _MATCH_STRIP_RE.sub('', unicodedata.normalize('NFC', text or '')).lower()
+
+
+def _title_matches_page(title: str, normalized_page: str) -> bool:
+    """목차 항목 제목(번호 제외)이 페이지 텍스트에 나오는지 (전체 일치 또는 단어 대부분 일치)"""
+    title = _TITLE_NUMBER_RE.sub('', unicodedata.normalize('NFC', title or ''))
+    normalized_title = _normalize_for_match(title)
+    if len(normalized_title) < 2:
+        return False
+    if normalized_title in normalized_page:
+        return True
+
+    tokens = [_normalize_for_match(token) for token in re.findall(r'[가-힣A-Za-z0-9]{2,}', title)]
+    if not tokens:
+        return False
+    matched = sum(1 for token in tokens if token in normalized_page)
+    return matched / len(tokens) >= DESCRIPTION_TITLE_TOKEN_RATIO
+
+
+def select_description_pages(page_texts: Mapping[int, str], section_titles: List[str], pages: List[int]) -> List[int]:
+    """
+    작성요령이 있을 수 있는 페이지만 선택
+
+    - 목차 항목 제목이 나오거나 작성요령/기재요령 문구가 있는 페이지
+    - 텍스트가 없는(스캔) 페이지, page_texts에 없는 페이지는 판별할 수 없으므로 포함
+    """
+    selected = []
+    for page_num in pages:
+        text = page_texts.get(page_num)
+        if text is None or len(text.strip()) < DESCRIPTION_TEXT_MIN_CHARS:
+            selected.append(page_num)
+            continue
+
+        normalized_page = _normalize_for_match(text)
+        if any(keyword in normalized_page for keyword in DESCRIPTION_GUIDE_KEYWORDS) \
+                or any(_title_matches_page(title, normalized_page) for title in section_titles):
+            selected.append(page_num)
+    return selected
+
+
+def _format_pages(pages: List[int]) -> str:
+    """페이지 번호 표시 ([3, 4, 5] → 3-5, [3, 5, 8] → 3, 5, 8)"""
+    if pages == list(range(pages[0], pages[-1] + 1)):
+        return f"{pages[0]}-{pages[-1]}" if len(pages) > 1 else str(pages[0])
+    return ", ".join(str(page) for page in pages)
+
+
 def find_descriptions_for_toc_sections(
     file_bytes: bytes,
     file_name: str,
     toc_sections: List[Dict],
     toc_end_page: int,
-    max_search_pages: int = 50
+    max_search_pages: int = 50,
+    page_texts: Optional[Mapping[int, str]] = None,
+    doc_key: Optional[str] = None
 ) -> Dict[str, str]:
     """
     목차 이후 페이지들에서 각 목차 항목에 대한 작성요령/가이드 찾기
 
+    page_texts가 있으면 목차 항목 제목/작성요령 문구가 없는 페이지는 건너뛰고,
+    남은 페이지를 10페이지씩 렌더링하며 Vision API에 전달 (전체를 한 번에 변환하지 않음)
+
     Args:
         file_bytes: PDF 파일의 바이트 데이터
         file_name: 파일명 (로깅용)
         toc_sections: 추출된 목차 섹션 리스트
         toc_end_page: 목차가 끝나는 페이지
         max_search_pages: 최대 검색할 페이지 수
+        page_texts: 양식 페이지별 텍스트 (있으면 검색 페이지를 텍스트로 먼저 선별)
+        doc_key: 페이지 이미지 캐시 키 (양식 file_hash, 없으면 file_bytes 해시 계산)
 
     Returns:
         Dict[str, str]: {섹션 제목: description} 매핑
     """
     try:
-        from pdf2image import convert_from_bytes
-
         print(f"    🔍 각 목차 항목에 대한 작성요령 찾기 시작 (목차 종료 페이지: {toc_end_page})...")
 
         # 목차 종료 페이지 이후부터 검색
         search_start = toc_end_page + 1
         search_end = min(search_start + max_search_pages, 100)  # 최대 100페이지까지만
-
-        images = convert_from_bytes(
-            file_bytes,
-            dpi=100,
-            first_page=search_start,
-            last_page=search_end
-        )
-
-        if not images:
-            print(f"    ⚠️  페이지 {search_start}-{search_end} 변환 실패")
-            return {}
-
-        print(f"    📄 {len(images)}개 페이지를 이미지로 변환 완료 (검색 범위: {search_start}-{search_end} 페이지)")
+        if page_texts:
+            search_end = min(search_end, max(page_texts))
+        search_pages = list(range(search_start, search_end + 1))
 
         # 목차 섹션 제목 리스트 생성
         section_titles = [sec.get('title', '') for sec in toc_sections if sec.get('title')]
 
-        # 10페이지씩 배치로 처리
+        if TOC_DESCRIPTION_TEXT_FILTER and page_texts:
+            selected_pages = select_description_pages(page_texts, section_titles, search_pages)
+            print(f"    📝 텍스트 기반 페이지 선별: {len(search_pages)}페이지 중 {len(selected_pages)}페이지 "
+                  f"({len(search_pages) - len(selected_pages)}페이지 이미지 변환 생략)")
+            search_pages = selected_pages
+
+        if not search_pages:
+            print(f"    ⚠️  작성요령을 찾을 페이지 없음 (검색 범위: {search_start}-{search_end} 페이지)")
+            return {}
+
+        # 10페이지씩 배치로 처리 (배치마다 렌더링 → 이전 배치 이미지는 Vision 호출 후 해제)
         batch_size = 10
         all_descriptions = {}
+        rendered_pages = 0
 
-        for batch_start in range(0, len(images), batch_size):
-            batch_end = min(batch_start + batch_size, len(images))
-            batch_images = images[batch_start:batch_end]
-            actual_page_start = search_start + batch_start
-
-            # 이미지들을 base64로 인코딩
-            image_contents = []
-            for img in batch_images:
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format='PNG')
-                img_buffer.seek(0)
-                img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-                image_contents.append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/png;base64,{img_base64}",
-                        "detail": "high"
-                    }
-                })
+        for batch_index, (batch_pages, batch_images) in enumerate(
+            iter_page_image_batches(file_bytes, search_pages, batch_size, dpi=100, doc_key=doc_key)
+        ):
+            rendered_pages += len(batch_images)
+            image_contents = to_image_contents(batch_images)
 
             system_prompt = """당신은 제안서 양식 문서를 분석하여 각 목차 항목에 대한 작성요령과 가이드를 찾는 전문가입니다.
 
@@ -889,7 +1012,7 @@ def find_descriptions_for_toc_sections(
   }
 }"""
 
-            user_prompt = f"""첨부된 이미지들은 '{file_name}' 파일의 페이지 {actual_page_start}-{actual_page_start + len(batch_images) - 1}입니다.
+            user_prompt = f"""첨부된 이미지들은 '{file_name}' 파일의 페이지 {_format_pages(batch_pages)}입니다.
 
 이 페이지들에서 다음 목차 항목들에 대한 작성요령이나 가이드를 찾아서 JSON 형식으로 반환하세요:
 
@@ -928,7 +1051,12 @@ def find_descriptions_for_toc_sections(
                         all_descriptions[title] = desc
                         print(f"      ✅ '{title}'에 대한 작성요령 발견")
 
-            print(f"      ✅ 배치 {batch_start // batch_size + 1} 완료 (누적: {len(all_descriptions)}개 항목)")
+            print(f"      ✅ 배치 {batch_index + 1} 완료 (페이지 {_format_pages(batch_pages)}, 누적: {len(all_descriptions)}개 항목)")
+            del image_contents, batch_images
+
+        if not rendered_pages:
+            print(f"    ⚠️  페이지 {_format_pages(search_pages)} 변환 실패")
+            return {}
 
         print(f"    ✅ 총 {len(all_descriptions)}개 목차 항목에 대한 작성요령 발견")
         return all_descriptions
@@ -940,7 +1068,13 @@ def find_descriptions_for_toc_sections(
         return {}
 
 
-def extract_toc_from_full_document_vision(file_bytes: bytes, file_name: str, max_pages: int = 60) -> Optional[List[Dict]]:
+def extract_toc_from_full_document_vision(
+    file_bytes: bytes,
+    file_name: str,
+    max_pages: int = 60,
+    page_texts: Optional[Mapping[int, str]] = None,
+    file_hash: Optional[str] = None
+) -> Optional[List[Dict]]:
     """
     Vision API를 사용하여 양식 문서 전체에서 목차 추출 (개선된 전략)
 
@@ -954,6 +1088,8 @@ def extract_toc_from_full_document_vision(file_bytes: bytes, file_name: str, max
         file_bytes: PDF 파일의 바이트 데이터
         file_name: 파일명 (로깅용)
         max_pages: 최대 분석 페이지 수 (기본 60페이지)
+        page_texts: 양식 페이지별 텍스트 (있으면 목차 페이지 범위를 텍스트로 먼저 판별)
+        file_hash: 양식 파일 SHA-256 (페이지 이미지 캐시 키, 업로드 원본을 다시 해시하지 않음)
 
     Returns:
         Optional[List[Dict]]: 추출된 섹션 리스트 (description 포함)
@@ -964,7 +1100,7 @@ def extract_toc_from_full_document_vision(file_bytes: bytes, file_name: str, max
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 1단계: 목차 페이지 범위 찾기
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        page_range = find_toc_page_range_with_vision(file_bytes, file_name, max_pages)
+        page_range = find_toc_page_range(file_bytes, file_name, page_texts, max_pages, doc_key=file_hash)
 
         if not page_range:
             print(f"    ⚠️  목차 페이지 범위를 찾지 못함 → 기존 배치 방식으로 fallback")
@@ -978,7 +1114,7 @@ def extract_toc_from_full_document_vision(file_bytes: bytes, file_name: str, max
         # 2단계: 목차 페이지 범위만 먼저 분석하여 목차 구조 추출
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         toc_sections = extract_toc_from_page_range_with_vision(
-            file_bytes, file_name, toc_start_page, toc_end_page
+            file_bytes, file_name, toc_start_page, toc_end_page, doc_key=file_hash
         )
 
         if not toc_sections or len(toc_sections) < 3:
@@ -991,7 +1127,7 @@ def extract_toc_from_full_document_vision(file_bytes: bytes, file_name: str, max
         # 3단계: 목차 이후 페이지들에서 각 항목에 대한 작성요령 찾기
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         descriptions = find_descriptions_for_toc_sections(
-            file_bytes, file_name, toc_sections, toc_end_page
+            file_bytes, file_name, toc_sections, toc_end_page, page_texts=page_texts, doc_key=file_hash
         )
 
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -0,0 +1,266 @@
+"""
+PDF 페이지 이미지 캐시 (Vision API 입력용)
+
+✅ 핵심 기능: PDF 페이지를 한 번만 렌더링/PNG 인코딩하고 모든 Vision 호출이 재사용
+📌 특징:
+  - 캐시 키: (문서 SHA-256, DPI, 페이지 번호) → base64 data URL
+  - 핵심 정보 Feature 7개(metadata_vision)와 목차 추출(toc_util)이 같은 페이지를 공유
+  - 용량 상한 초과 시 가장 오래 사용되지 않은 페이지부터 삭제 (LRU)
+  - 같은 문서/DPI 렌더링은 문서 단위 락으로 직렬화 → 동시 Feature 추출 시 중복 렌더링 방지
+  - 분석이 끝나면 release_page_images()로 해당 문서 이미지 해제
+  - 입력은 PDF bytes 또는 파일 경로 (업로드 저장소 disk 모드는 경로에서 바로 렌더링)
+  - 렌더링은 RENDER_CHUNK_PAGES 페이지씩 → PIL 이미지는 청크 단위로 인코딩 직후 해제
+  - iter_page_image_batches(): 배치 단위로 렌더링하며 순차 반환 (필요한 페이지만, 연속하지 않아도 됨)
+"""
+
+import base64
+import io
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .cache import sha256_of
+from .config import PAGE_IMAGE_CACHE_MAX_BYTES, RENDER_CHUNK_PAGES
+
+PageKey = Tuple[str, int, int]  # (문서 키, DPI, 페이지 번호)
+PdfSource = Union[bytes, str, Path]  # PDF bytes 또는 파일 경로
+
+
+def _encode_png_data_url(image) -> str:
+    """PIL 이미지 → PNG base64 data URL"""
+    img_buffer = io.BytesIO()
+    image.save(img_buffer, format='PNG')
+    img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
+    return f"data:image/png;base64,{img_base64}"
+
+
+class PageImageCache:
+    """
+    용량 제한이 있는 페이지 이미지 메모리 캐시 (LRU)
+
+    Args:
+        max_bytes: 보관할 data URL 총 크기 상한 (바이트)
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._images: "OrderedDict[PageKey, str]" = OrderedDict()
+        self._total_bytes = 0
+        # 문서별 전체 페이지 수 (마지막 페이지 이후를 반복 렌더링하지 않도록)
+        self._page_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._render_locks: Dict[Tuple[str, int], threading.Lock] = {}
+
+    def _render_lock(self, doc_key: str, dpi: int) -> threading.Lock:
+        with self._lock:
+            return self._render_locks.setdefault((doc_key, dpi), threading.Lock())
+
+    def _lookup(self, doc_key: str, dpi: int, pages: List[int]) -> Dict[int, str]:
+        found = {}
+        with self._lock:
+            for page in pages:
+                key = (doc_key, dpi, page)
+                url = self._images.get(key)
+                if url is not None:
+                    self._images.move_to_end(key)
+                    found[page] = url
+        return found
+
+    def _store(self, doc_key: str, dpi: int, rendered: Dict[int, str]) -> None:
+        with self._lock:
+            for page, url in rendered.items():
+                key = (doc_key, dpi, page)
+                previous = self._images.pop(key, None)
+                if previous is not None:
+                    self._total_bytes -= len(previous)
+                self._images[key] = url
+                self._total_bytes += len(url)
+
+            while self._total_bytes > self.max_bytes and self._images:
+                _, evicted = self._images.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
+    def get_pages(
+        self,
+        file_bytes: PdfSource,
+        first_page: int,
+        last_page: int,
+        dpi: int,
+        doc_key: Optional[str] = None
+    ) -> List[str]:
+        """
+        페이지 범위의 data URL 리스트 (1-based, last_page 포함)
+
+        문서 페이지 수보다 큰 범위를 요청하면 존재하는 페이지까지만 반환한다.
+
+        Raises:
+            ImportError: pdf2image 미설치
+        """
+        return self.get_page_list(file_bytes, list(range(first_page, last_page + 1)), dpi, doc_key)
+
+    def get_page_list(
+        self,
+        file_bytes: PdfSource,
+        pages: List[int],
+        dpi: int,
+        doc_key: Optional[str] = None
+    ) -> List[str]:
+        """
+        지정한 페이지들의 data URL 리스트 (연속하지 않아도 됨, 캐시에 없는 페이지만 렌더링)
+
+        Raises:
+            ImportError: pdf2image 미설치
+        """
+        doc_key = doc_key or sha256_of(file_bytes)
+        page_count = self._page_counts.get(doc_key)
+        if page_count is not None:
+            pages = [page for page in pages if page <= page_count]
+        if not pages:
+            return []
+
+        found = self._lookup(doc_key, dpi, pages)
+        if len(found) < len(pages):
+            with self._render_lock(doc_key, dpi):
+                # 락 대기 중 다른 스레드가 렌더링했을 수 있음
+                found = self._lookup(doc_key, dpi, pages)
+                missing = sorted(set(page for page in pages if page not in found))
+                if missing:
+                    found.update(self._render(file_bytes, doc_key, dpi, missing))
+
+        return [found[page] for page in pages if page in found]
+
+    def _render(self, file_bytes: PdfSource, doc_key: str, dpi: int, pages: List[int]) -> Dict[int, str]:
+        """
+        pages를 연속 구간별로 RENDER_CHUNK_PAGES씩 변환
+
+        청크마다 PNG 인코딩 후 PIL 이미지를 바로 닫으므로 메모리에는 청크 1개 분량만 올라간다.
+        """
+        from pdf2image import convert_from_bytes, convert_from_path
+
+        convert = convert_from_bytes if isinstance(file_bytes, (bytes, bytearray)) else convert_from_path
+        rendered = {}
+        for first_page, last_page in _page_chunks(pages, RENDER_CHUNK_PAGES):
+            if doc_key in self._page_counts and first_page > self._page_counts[doc_key]:
+                break
+
+            images = convert(
+                file_bytes,
+                dpi=dpi,
+                first_page=first_page,
+                last_page=last_page
+            )
+
+            chunk = {}
+            for offset, image in enumerate(images):
+                chunk[first_page + offset] = _encode_png_data_url(image)
+                image.close()
+            del images
+
+            self._store(doc_key, dpi, chunk)
+            rendered.update(chunk)
+
+            if len(chunk) < last_page - first_page + 1:
+                # 요청 범위가 문서 끝을 넘음 → 실제 페이지 수 기록
+                self._page_counts[doc_key] = first_page + len(chunk) - 1
+                break
+
+        return rendered
+
+    def release(self, doc_keys: Iterable[str]) -> None:
+        """문서 이미지 전부 해제 (분석 종료 시)"""
+        doc_keys = set(doc_keys)
+        if not doc_keys:
+            return
+        with self._lock:
+            for key in [key for key in self._images if key[0] in doc_keys]:
+                self._total_bytes -= len(self._images.pop(key))
+            for doc_key in doc_keys:
+                self._page_counts.pop(doc_key, None)
+            for render_key in [key for key in self._render_locks if key[0] in doc_keys]:
+                del self._render_locks[render_key]
+
+
+def _page_chunks(pages: List[int], chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """정렬된 페이지 번호 → 연속 구간을 chunk_size 이하로 나눈 (시작, 끝) 목록"""
+    start = prev = None
+    for page in pages:
+        if start is not None and page == prev + 1 and page - start < chunk_size:
+            prev = page
+            continue
+        if start is not None:
+            yield start, prev
+        start = prev = page
+    if start is not None:
+        yield start, prev
+
+
+page_image_cache = PageImageCache(PAGE_IMAGE_CACHE_MAX_BYTES)
+
+
+def get_page_images(
+    file_bytes: PdfSource,
+    first_page: int,
+    last_page: int,
+    dpi: int = 100,
+    doc_key: Optional[str] = None
+) -> List[str]:
+    """
+    PDF 페이지 범위를 base64 PNG data URL로 반환 (캐시 우선)
+
+    Args:
+        file_bytes: PDF 파일의 바이트 데이터 또는 파일 경로
+        first_page: 시작 페이지 (1-based)
+        last_page: 종료 페이지 (1-based, 포함)
+        dpi: 렌더링 해상도
+        doc_key: 문서 키 (없으면 file_bytes의 SHA-256)
+
+    Returns:
+        List[str]: "data:image/png;base64,..." 리스트 (문서 끝을 넘는 페이지는 제외)
+    """
+    return page_image_cache.get_pages(file_bytes, first_page, last_page, dpi, doc_key)
+
+
+def iter_page_image_batches(
+    file_bytes: PdfSource,
+    pages: List[int],
+    batch_size: int,
+    dpi: int = 100,
+    doc_key: Optional[str] = None
+) -> Iterator[Tuple[List[int], List[str]]]:
+    """
+    페이지들을 batch_size개씩 렌더링하며 반환 (다음 배치는 이전 배치 처리 후 렌더링)
+
+    Args:
+        pages: 1-based 페이지 번호 (연속하지 않아도 됨)
+        batch_size: Vision 호출 1회에 보낼 페이지 수
+
+    Yields:
+        (배치 페이지 번호 리스트, data URL 리스트) - 문서 끝을 넘는 페이지는 제외, 빈 배치는 건너뜀
+    """
+    doc_key = doc_key or sha256_of(file_bytes)
+    for batch_start in range(0, len(pages), batch_size):
+        batch_pages = pages[batch_start:batch_start + batch_size]
+        urls = page_image_cache.get_page_list(file_bytes, batch_pages, dpi, doc_key)
+        if not urls:
+            break
+        yield batch_pages[:len(urls)], urls
+
+
+def to_image_contents(image_urls: List[str], detail: str = "high") -> List[Dict[str, Any]]:
+    """data URL 리스트 → Vision API 메시지 content 리스트"""
+    return [
+        {
+            "type": "image_url",
+            "image_url": {
+                "url": url,
+                "detail": detail
+            }
+        }
+        for url in image_urls
+    ]
+
+
+def release_page_images(doc_keys: Iterable[str]) -> None:
+    """분석이 끝난 문서의 페이지 이미지 해제"""
+    page_image_cache.release(doc_keys)
@@ -0,0 +1,77 @@
+"""
+분석 진행 상황 이벤트 (/analyze/stream SSE용)
+
+✅ 핵심 기능:
+  1. emit_progress: 노드 내부 진행 상황을 LangGraph custom 스트림으로 전송
+  2. summarize_node_update: 노드 완료(updates 스트림) → 프론트엔드용 요약 이벤트
+
+📌 특징:
+  - batch_app.invoke()로 실행하면 스트림 writer가 없으므로 emit_progress는 no-op
+  - 스트림 writer는 노드를 실행하는 스레드의 컨텍스트에 묶여 있으므로
+    스레드 풀 워커가 아닌 노드 본문(메인 스레드)에서 호출해야 함
+"""
+
+from typing import Any, Dict
+
+from langgraph.config import get_stream_writer
+
+
+def emit_progress(stage: str, **data: Any) -> None:
+    """노드 진행 상황 이벤트 전송 (스트리밍 실행이 아니면 무시)"""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        # 그래프 실행 컨텍스트 밖 (단독 노드 호출/테스트)
+        return
+    writer({'stage': stage, **data})
+
+
+def summarize_node_update(node: str, update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    노드 완료 시 상태 변경분을 JSON 직렬화 가능한 요약으로 변환
+
+    Args:
+        node: 완료된 노드 이름
+        update: 노드가 반환한 상태 (numpy 배열, ChromaDB 객체 포함 가능)
+
+    Returns:
+        {'stage': node, 'status': ..., 노드별 요약 필드}
+    """
+    update = update or {}
+    summary: Dict[str, Any] = {'stage': node, 'status': update.get('status')}
+
+    if node == 'extract_all_texts':
+        documents = update.get('documents', [])
+        summary['documents'] = len(documents)
+        summary['total_pages'] = sum(doc.get('page_count', 0) for doc in documents)
+    elif node == 'chunk_all_documents':
+        summary['chunks'] = len(update.get('all_chunks', []))
+    elif node == 'deduplicate_chunks':
+        summary['chunks'] = len(update.get('all_chunks', []))
+        summary['duplicates_removed'] = sum(
+            1 for sources in update.get('chunk_duplicates', {}).values() for source in sources if source.get('removed', True)
+        )
+    elif node == 'embed_all_chunks':
+        summary['embedding_model'] = update.get('embedding_model')
+        summary['cache'] = update.get('embedding_cache_stats', {})
+    elif node == 'init_and_store_vectordb':
+        summary['vectors'] = len(update.get('all_chunks', []))
+    elif node == 'extract_features_rag':
+        summary['features'] = len(update.get('extracted_features', []))
+    elif node == 'prefetch_template_toc':
+        speculative = update.get('speculative_toc') or {}
+        summary['template_candidate'] = speculative.get('file_name')
+        summary['toc_sections'] = len(speculative.get('sections') or [])
+    elif node == 'detect_templates':
+        templates = update.get('attachment_templates', [])
+        summary['templates'] = len([t for t in templates if t.get('has_template')])
+    elif node in ('extract_toc_from_template', 'extract_toc_from_announcement_and_attachments'):
+        toc = update.get('table_of_contents') or {}
+        summary['toc_source'] = toc.get('source')
+        summary['toc_sections'] = toc.get('total_sections', len(toc.get('sections', [])))
+
+    errors = update.get('errors')
+    if errors:
+        summary['errors'] = len(errors)
+
+    return summary
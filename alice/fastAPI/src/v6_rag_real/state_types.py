@@ -3,17 +3,24 @@
 BatchState 및 관련 타입들
 """
 
-from typing import TypedDict, List, Dict, Any, Optional, Literal
+from typing import TypedDict, List, Dict, Any, Optional, Literal, Annotated
 import numpy as np
 
 
+def keep_latest_value(current: Any, update: Any) -> Any:
+    """병렬 노드 공용 키 reducer: None이 아닌 최신 값 유지 (같은 단계에서 여러 노드가 갱신해도 충돌 없음)"""
+    return update if update is not None else current
+
+
 class BatchState(TypedDict):
     """통합 배치 처리용 State (공고문 + 첨부서류)"""
 
     # ========== 입력 ==========
     # files: 파일 정보 리스트
-    #   - bytes 기반 (권장): [{"bytes": b"...", "filename": "...", "folder": 1}]
+    #   - 업로드 저장소 핸들 (권장): [{"blob": "<sha256>", "filename": "...", "folder": 1}] (blobs.blob_store)
+    #   - bytes 기반: [{"bytes": b"...", "filename": "...", "folder": 1}]
     #   - path 기반 (하위 호환): [{"path": "...", "filename": "...", "folder": 1}]
+    #   blob/bytes는 목차 추출 후 release_file_payloads에서 제거됨
     files: List[Dict[str, Any]]
     user_id: str
     project_idx: int
@@ -23,13 +30,16 @@ class BatchState(TypedDict):
 
     # ========== RAG 통합 저장소 ==========
     all_chunks: List[Dict[str, Any]]  # 모든 문서의 청크 통합
+    chunk_duplicates: Dict[str, List[Dict[str, Any]]]  # chunk_id → 같은 내용 청크 출처 (문서 내 중복은 제거, 다른 문서는 유지)
     all_embeddings: Optional[np.ndarray] 
     embedding_model: Any  
+    embedding_cache_stats: Dict[str, int]  # 임베딩 캐시 hit/miss/api_calls
 
     # ========== VectorDB ==========
     chroma_client: Any  # ChromaDB 클라이언트
-    chroma_collection: Any  # ChromaDB 컬렉션
+    chroma_collection: Any  # ChromaDB 컬렉션 또는 NumpyVectorIndex (query() 형식 동일)
     vector_db_path: str  # VectorDB 저장 경로
+    vector_collection_name: str  # Chroma 컬렉션 이름 (분석 시작 전 결정, memory 모드는 분석마다 고유)
 
     # ========== Feature 추출 결과 ==========
     extracted_features: List[Dict[str, Any]]  # 추출된 모든 Feature
@@ -39,11 +49,15 @@ class BatchState(TypedDict):
 
     # ========== 목차 (✨ NEW: 제안서 목차 구조) ==========
     table_of_contents: Optional[Dict[str, Any]]  # 제안서 목차 구조
+    # 양식 목차 선행 추출 결과 (prefetch_template_toc, extract_features_rag와 병렬 실행)
+    # {'file_name': 양식 파일명(NFC), 'sections': 섹션 리스트 또는 None}
+    speculative_toc: Annotated[Optional[Dict[str, Any]], keep_latest_value]
 
     # ========== 출력 ==========
-    csv_paths: Optional[Dict[str, str]]  # CSV 저장 경로 (개발/테스트용)
+    csv_paths: Optional[Dict[str, str]]  # CSV 저장 경로 (개발/테스트용, artifact sink 저장 예정 위치)
     response_data: Dict[str, Any]  # FastAPI 응답용 데이터
 
     # ========== 메타 ==========
+    analysis_id: str  # 분석 1회 ID (artifact sink archive 파일명 등, 없으면 첫 저장 시 생성)
     status: str
     errors: List[str]
@@ -2,9 +2,29 @@
 유틸리티 함수들
 """
 
+import bisect
+import random
 import re
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple, TypeVar
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+import openai
+
+from .config import (
+    EMBEDDING_MODEL,
+    CHUNK_LENGTH_UNIT,
+    CHUNK_MAX_CHARS,
+    CHUNK_OVERLAP_CHARS,
+    CHUNK_TARGET_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    CHUNK_MIN_CHARS,
+    CHUNK_SCOPE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+)
+
+T = TypeVar('T')
 
 
 # ========================================
@@ -49,80 +69,379 @@ def extract_attachment_number(filename: str) -> Optional[int]:
     return None
 
 
-def detect_section_headers(text: str) -> List[Dict[str, Any]]:
+# ========================================
+# 섹션 기반 청킹
+# ========================================
+# [2025-01-10 suyeon] 패턴 확장 + 우선순위 최적화
+# 변경 이유:
+# 1. 패턴 우선순위 명확화: 구체적 패턴(대괄호, 로마숫자) → 일반적 패턴(숫자)
+# 2. 로마숫자 패턴 강화: 잘못된 조합 방지 (IIIII → 최대 4글자 제한)
+# 3. 한글 범위 명시: 가~하로 제한 (정부 공고문 표준)
+# 근거: 실제 공고문 분석 결과 다양한 번호 매김 방식 사용 확인
+# → 모듈 로드 시 1회 컴파일 (줄마다 재컴파일/캐시 조회 없음)
+SECTION_HEADER_PATTERNS = [
+    # 레벨 1: 대제목 (구체적 패턴 우선)
+    (re.compile(r'^【([^】]+)】\s*(.+)$'), 1),                      # 【공고】 제목
+    (re.compile(r'^\[([^\]]+)\]\s*(.+)$'), 1),                     # [별첨] 제목
+    (re.compile(r'^([IVX]{1,4})\.\s+(.+)$'), 1),                   # I. ~ XIV. (영문 로마숫자, 최대 14)
+    (re.compile(r'^([ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ])\.\s+(.+)$'), 1),              # Ⅰ. ~ Ⅹ. (한글 로마숫자, 최대 10)
+    (re.compile(r'^([0-9]{1,2})\.\s+(.+)$'), 1),                   # 1. ~ 99. 제목
+
+    # 레벨 2: 중제목
+    (re.compile(r'^([가-하])\.\s+(.+)$'), 2),                      # 가. ~ 하. (8개 제한)
+    (re.compile(r'^([가-하])\)\s+(.+)$'), 2),                      # 가) ~ 하)
+    (re.compile(r'^([0-9]{1,2})\)\s+(.+)$'), 2),                   # 1) ~ 99)
+    (re.compile(r'^[■●○]\s+(.+)$'), 2),                            # 불릿 포인트
+
+    # 레벨 3: 소제목
+    (re.compile(r'^\(([0-9]{1,2})\)\s+(.+)$'), 3),                 # (1) ~ (99)
+    (re.compile(r'^\(([가-하])\)\s+(.+)$'), 3),                    # (가) ~ (하)
+    (re.compile(r'^[▪▫]\s+(.+)$'), 3),                             # 작은 불릿
+]
+
+# 헤더가 될 수 있는 첫 글자 (나머지 줄은 패턴 12개를 시도하지 않고 바로 건너뜀)
+_SECTION_HEADER_FIRST_CHAR_RE = re.compile(r'[【\[IVXⅠ-Ⅹ0-9가-하■●○(▪▫]')
+
+# [2025-01-10 suyeon] 최소 제목 길이 상수 추가
+# 이유: "1. " (제목 없음) 같은 빈 헤더 방지
+MIN_TITLE_LENGTH = 2
+
+# Recursive Splitter separator 우선순위: 단락 > 줄바꿈 > 문장 > 단어
+# → 날짜(2024.12.31), 약어(Ph.D.)는 자연스럽게 보존됨
+CHUNK_SEPARATORS = [
+    "\n\n",    # 단락 (가장 안전)
+    "\n",      # 줄바꿈
+    ". ",      # 문장 끝
+    "? ",
+    "! ",
+    " ",       # 단어
+    ""         # 최후의 수단
+]
+
+
+def _token_length_function(model: str) -> Optional[Callable[[str], int]]:
+    """임베딩 모델 토크나이저 기준 길이 함수 (tiktoken 미설치 시 None)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+
+    def token_length(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return token_length
+
+
+class SectionChunker:
     """
-    텍스트에서 섹션 헤더 감지
+    섹션 감지 + Recursive 청킹 (문서 전체에서 재사용)
 
-    Args:
-        text: 분석할 텍스트
+    헤더 패턴은 모듈 로드 시 1회 컴파일, RecursiveCharacterTextSplitter는 인스턴스당 1개만 생성한다.
 
-    Returns:
-        섹션 헤더 목록 [{"level": 1, "title": "...", "position": ...}]
+    Args:
+        chunk_size: 최대 청크 크기 (length_unit 단위)
+        chunk_overlap: 오버랩 크기 (length_unit 단위, 문맥 보존용)
+        length_unit: "chars" (문자 수) 또는 "tokens" (임베딩 모델 토큰 수)
+        model: length_unit="tokens"일 때 토크나이저를 고를 임베딩 모델
+        min_chunk_chars: 이보다 짧은 청크는 버림 (문자 수, document 범위는 이웃 청크에 병합)
+        scope: "page" (페이지별 청킹) 또는 "document" (문서 전체를 이어 붙여 청킹)
     """
-    headers = []
-    lines = text.split('\n')
-
-    # [2025-01-10 suyeon] 패턴 확장 + 우선순위 최적화
-    # 변경 이유:
-    # 1. 패턴 우선순위 명확화: 구체적 패턴(대괄호, 로마숫자) → 일반적 패턴(숫자)
-    # 2. 로마숫자 패턴 강화: 잘못된 조합 방지 (IIIII → 최대 4글자 제한)
-    # 3. 한글 범위 명시: 가~하로 제한 (정부 공고문 표준)
-    # 근거: 실제 공고문 분석 결과 다양한 번호 매김 방식 사용 확인
-    patterns = [
-        # 레벨 1: 대제목 (구체적 패턴 우선)
-        (r'^【([^】]+)】\s*(.+)$', 1),                      # 【공고】 제목
-        (r'^\[([^\]]+)\]\s*(.+)$', 1),                     # [별첨] 제목
-        (r'^([IVX]{1,4})\.\s+(.+)$', 1),                   # I. ~ XIV. (영문 로마숫자, 최대 14)
-        (r'^([ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ])\.\s+(.+)$', 1),              # Ⅰ. ~ Ⅹ. (한글 로마숫자, 최대 10)
-        (r'^([0-9]{1,2})\.\s+(.+)$', 1),                   # 1. ~ 99. 제목
-
-        # 레벨 2: 중제목
-        (r'^([가-하])\.\s+(.+)$', 2),                      # 가. ~ 하. (8개 제한)
-        (r'^([가-하])\)\s+(.+)$', 2),                      # 가) ~ 하)
-        (r'^([0-9]{1,2})\)\s+(.+)$', 2),                   # 1) ~ 99)
-        (r'^[■●○]\s+(.+)$', 2),                            # 불릿 포인트
-
-        # 레벨 3: 소제목
-        (r'^\(([0-9]{1,2})\)\s+(.+)$', 3),                 # (1) ~ (99)
-        (r'^\(([가-하])\)\s+(.+)$', 3),                    # (가) ~ (하)
-        (r'^[▪▫]\s+(.+)$', 3),                             # 작은 불릿
-    ]
 
-    # [2025-01-10 suyeon] 최소 제목 길이 상수 추가
-    # 이유: "1. " (제목 없음) 같은 빈 헤더 방지
-    MIN_TITLE_LENGTH = 2
-
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if not line:
-            continue
-
-        for pattern, level in patterns:
-            match = re.match(pattern, line)
-            if match:
-                # [2025-01-10 suyeon] 제목 추출 로직 개선
-                # 이유: 불릿 포인트(■●○) 패턴은 그룹이 1개만 있어서 group(2) 호출 시 에러 발생
-                # 해결: 매칭 그룹 수에 따라 제목 추출 방식 분기
-                if len(match.groups()) == 2:
-                    title = match.group(2).strip()
-                else:
-                    title = match.group(1).strip()
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_MAX_CHARS,
+        chunk_overlap: int = CHUNK_OVERLAP_CHARS,
+        length_unit: str = "chars",
+        model: str = EMBEDDING_MODEL,
+        min_chunk_chars: int = CHUNK_MIN_CHARS,
+        scope: str = "page"
+    ):
+        length_function: Callable[[str], int] = len
+        if length_unit == "tokens":
+            token_length = _token_length_function(model)
+            if token_length is None:
+                print(f"⚠️ tiktoken 미설치 → 문자 수 기준 청킹 ({CHUNK_MAX_CHARS}자)")
+                length_unit = "chars"
+                chunk_size, chunk_overlap = CHUNK_MAX_CHARS, CHUNK_OVERLAP_CHARS
+            else:
+                length_function = token_length
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.length_unit = length_unit
+        self.min_chunk_chars = min_chunk_chars
+        self.scope = scope
+        self.length_function = length_function
+        # add_start_index: document 범위 청크의 문자 위치 → 페이지 범위 계산용 (split_text 결과는 동일)
+        self._splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=CHUNK_SEPARATORS,
+            length_function=length_function,
+            add_start_index=True,
+        )
+
+    @property
+    def signature(self) -> str:
+        """청킹 설정 식별자 (설정이 바뀌면 VectorDB 컬렉션 재구축)"""
+        return f"{self.scope}:{self.length_unit}:{self.chunk_size}:{self.chunk_overlap}:{self.min_chunk_chars}"
+
+    def detect_headers(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """
+        줄 리스트에서 섹션 헤더 감지
+
+        Returns:
+            섹션 헤더 목록 [{"level": 1, "title": "...", "position": ..., "raw": ...}]
+        """
+        headers = []
+
+        for i, line in enumerate(lines):
+            line = line.strip()
+            if not line or not _SECTION_HEADER_FIRST_CHAR_RE.match(line):
+                continue
+
+            for pattern, level in SECTION_HEADER_PATTERNS:
+                match = pattern.match(line)
+                if match:
+                    # [2025-01-10 suyeon] 제목 추출 로직 개선
+                    # 이유: 불릿 포인트(■●○) 패턴은 그룹이 1개만 있어서 group(2) 호출 시 에러 발생
+                    # 해결: 매칭 그룹 수에 따라 제목 추출 방식 분기
+                    if len(match.groups()) == 2:
+                        title = match.group(2).strip()
+                    else:
+                        title = match.group(1).strip()
+
+                    # [2025-01-10 suyeon] 빈 제목 검증 추가
+                    # 이유: "1. " (제목 없음) 같은 경우 섹션 헤더로 인식하면 안됨
+                    # 근거: 최소 2글자 이상의 의미있는 제목만 섹션으로 간주
+                    if len(title) < MIN_TITLE_LENGTH:
+                        continue
+
+                    headers.append({
+                        'level': level,
+                        'title': title,
+                        'position': i,
+                        'raw': line
+                    })
+                    break
+
+        return headers
+
+    def chunk(self, text: str, page_num: int) -> List[Dict[str, Any]]:
+        """
+        페이지 텍스트 청킹 (섹션이 있으면 섹션별, 없으면 페이지 전체를 Recursive 청킹)
+
+        Returns:
+            청크 리스트 [{"text": "...", "section": "...", "page": ..., "is_sectioned": bool}]
+        """
+        lines = text.split('\n')
+        headers = self.detect_headers(lines)
+        chunks = []
 
-                # [2025-01-10 suyeon] 빈 제목 검증 추가
-                # 이유: "1. " (제목 없음) 같은 경우 섹션 헤더로 인식하면 안됨
-                # 근거: 최소 2글자 이상의 의미있는 제목만 섹션으로 간주
-                if len(title) < MIN_TITLE_LENGTH:
+        if not headers:
+            # 섹션이 없으면 Recursive로 청킹
+            for chunk_text in self._splitter.split_text(text):
+                chunks.append({
+                    'text': chunk_text,
+                    'section': f'페이지 {page_num}',
+                    'page': page_num,
+                    'is_sectioned': False
+                })
+        else:
+            # 섹션별로 Recursive 청킹 적용
+            for i, header in enumerate(headers):
+                section_title = header['title']
+                start_pos = header['position']
+                end_pos = headers[i + 1]['position'] if i + 1 < len(headers) else len(lines)
+
+                # [2025-01-10 suyeon] 헤더 제외 로직 추가
+                # 변경 이유:
+                # 1. 정보 중복 방지: 헤더는 section_label에 이미 저장되므로 텍스트에서 제외
+                # 2. 임베딩 품질 향상: 순수 내용만 임베딩하여 RAG 검색 정확도 향상
+                # 3. 토큰 효율: OpenAI API 비용 절감 (중복 텍스트 제거)
+                # 근거: 헤더는 메타데이터로만 관리하고, 청크 텍스트는 순수 내용만 포함
+
+                # 섹션 내용 추출 (헤더 다음 줄부터 시작)
+                section_text = '\n'.join(lines[start_pos + 1:end_pos]).strip()
+
+                if not section_text:
                     continue
 
-                headers.append({
-                    'level': level,
-                    'title': title,
-                    'position': i,
-                    'raw': line
+                # 섹션을 Recursive로 청킹
+                section_chunks = self._splitter.split_text(section_text)
+
+                for idx, chunk_text in enumerate(section_chunks):
+                    # 섹션이 분할된 경우 part 번호 추가
+                    if len(section_chunks) > 1:
+                        section_label = f'{section_title} (part {idx+1})'
+                    else:
+                        section_label = section_title
+
+                    chunks.append({
+                        'text': chunk_text,
+                        'section': section_label,
+                        'page': page_num,
+                        'is_sectioned': True
+                    })
+
+        # 빈 청크 제거 + 최소 길이 체크
+        return [
+            {**c, 'page_start': page_num, 'page_end': page_num}
+            for c in chunks if len(c['text'].strip()) >= self.min_chunk_chars
+        ]
+
+    def chunk_pages(self, page_items: Iterable[Tuple[int, str]]) -> List[Dict[str, Any]]:
+        """
+        문서 페이지 전체 청킹 (scope에 따라 페이지별 또는 문서 단위)
+
+        Args:
+            page_items: (페이지 번호, 페이지 텍스트) 순회 가능 객체
+
+        Returns:
+            청크 리스트 [{"text", "section", "page", "page_start", "page_end", "is_sectioned"}]
+            (page = page_start)
+        """
+        if self.scope == "document":
+            return self.chunk_document(page_items)
+
+        chunks = []
+        for page_num, page_text in page_items:
+            chunks.extend(self.chunk(page_text, page_num))
+        return chunks
+
+    def chunk_document(self, page_items: Iterable[Tuple[int, str]]) -> List[Dict[str, Any]]:
+        """
+        페이지를 이어 붙인 문서 전체에서 섹션 감지 후 청킹 (페이지 경계를 넘는 섹션 유지)
+
+        - 페이지별 시작 문자 위치를 기록해 두고 청크 위치로 page_start/page_end 계산
+        - 첫 헤더 이전 텍스트도 '페이지 N' 섹션으로 청킹
+        - 최소 길이 미만 청크는 버리지 않고 앞 청크에 병합 (첫 청크면 다음 청크 앞에 붙임)
+        """
+        page_nums: List[int] = []
+        page_offsets: List[int] = []
+        parts: List[str] = []
+        offset = 0
+        for page_num, page_text in page_items:
+            page_text = page_text or ''
+            page_nums.append(page_num)
+            page_offsets.append(offset)
+            parts.append(page_text)
+            offset += len(page_text) + 1  # 페이지 사이 '\n'
+
+        if not parts:
+            return []
+
+        text = '\n'.join(parts)
+        lines = text.split('\n')
+        line_offsets = []
+        offset = 0
+        for line in lines:
+            line_offsets.append(offset)
+            offset += len(line) + 1
+
+        def page_at(char_offset: int) -> int:
+            return page_nums[bisect.bisect_right(page_offsets, char_offset) - 1]
+
+        # (섹션 제목 또는 None, 시작 줄, 끝 줄)
+        headers = self.detect_headers(lines)
+        first_header_line = headers[0]['position'] if headers else len(lines)
+        sections = [(None, 0, first_header_line)]
+        for i, header in enumerate(headers):
+            end_line = headers[i + 1]['position'] if i + 1 < len(headers) else len(lines)
+            sections.append((header['title'], header['position'] + 1, end_line))
+
+        chunks: List[Dict[str, Any]] = []
+        for section_title, start_line, end_line in sections:
+            if start_line >= end_line:
+                continue
+            raw_text = '\n'.join(lines[start_line:end_line])
+            section_text = raw_text.strip()
+            if not section_text:
+                continue
+            section_offset = line_offsets[start_line] + (len(raw_text) - len(raw_text.lstrip()))
+
+            documents = self._splitter.create_documents([section_text])
+            for idx, document in enumerate(documents):
+                chunk_start = section_offset + max(document.metadata.get('start_index', 0), 0)
+                chunk_end = chunk_start + max(len(document.page_content) - 1, 0)
+                page_start, page_end = page_at(chunk_start), page_at(chunk_end)
+
+                if section_title is None:
+                    section_label = f'페이지 {page_start}' if page_start == page_end else f'페이지 {page_start}-{page_end}'
+                elif len(documents) > 1:
+                    section_label = f'{section_title} (part {idx+1})'
+                else:
+                    section_label = section_title
+
+                chunks.append({
+                    'text': document.page_content,
+                    'section': section_label,
+                    'page': page_start,
+                    'page_start': page_start,
+                    'page_end': page_end,
+                    'is_sectioned': section_title is not None
                 })
-                break
 
-    return headers
+        # 짧은 청크(섹션 꼬리, 짧은 섹션)는 버리지 않고 이웃 청크에 병합
+        merged: List[Dict[str, Any]] = []
+        carry: Optional[Dict[str, Any]] = None
+        for chunk in chunks:
+            if carry is not None:
+                chunk = {
+                    **chunk,
+                    'text': f"{carry['text']}\n{chunk['text']}",
+                    'page': carry['page_start'],
+                    'page_start': carry['page_start'],
+                }
+                carry = None
+
+            if len(chunk['text'].strip()) >= self.min_chunk_chars:
+                merged.append(chunk)
+            elif merged:
+                previous = merged[-1]
+                previous['text'] = f"{previous['text']}\n{chunk['text']}"
+                previous['page_end'] = max(previous['page_end'], chunk['page_end'])
+            else:
+                carry = chunk
+
+        if carry is not None and len(carry['text'].strip()) >= self.min_chunk_chars:
+            merged.append(carry)
+
+        return merged
+
+
+_section_chunker: Optional[SectionChunker] = None
+
+
+def get_section_chunker() -> SectionChunker:
+    """config(CHUNK_LENGTH_UNIT, CHUNK_SCOPE 등) 기준 공용 청커 (첫 호출 시 생성)"""
+    global _section_chunker
+    if _section_chunker is None:
+        if CHUNK_LENGTH_UNIT == "tokens":
+            _section_chunker = SectionChunker(
+                CHUNK_TARGET_TOKENS, CHUNK_OVERLAP_TOKENS, length_unit="tokens", scope=CHUNK_SCOPE
+            )
+        else:
+            _section_chunker = SectionChunker(CHUNK_MAX_CHARS, CHUNK_OVERLAP_CHARS, scope=CHUNK_SCOPE)
+    return _section_chunker
+
+
+def detect_section_headers(text: str) -> List[Dict[str, Any]]:
+    """
+    텍스트에서 섹션 헤더 감지
+
+    Args:
+        text: 분석할 텍스트
+
+    Returns:
+        섹션 헤더 목록 [{"level": 1, "title": "...", "position": ...}]
+    """
+    return get_section_chunker().detect_headers(text.split('\n'))
 
 
 def chunk_by_sections(text: str, page_num: int, max_chunk_size: int = 1000, overlap_size: int = 200) -> List[Dict[str, Any]]:
@@ -139,6 +458,8 @@ def chunk_by_sections(text: str, page_num: int, max_chunk_size: int = 1000, over
     - 유지보수 용이
     - 날짜/약어 오분리 문제를 separator 우선순위로 자연스럽게 해결
 
+    기본 크기로 호출하면 공용 청커(get_section_chunker)를 재사용한다.
+
     Args:
         text: 청킹할 텍스트
         page_num: 페이지 번호
@@ -148,80 +469,61 @@ def chunk_by_sections(text: str, page_num: int, max_chunk_size: int = 1000, over
     Returns:
         청크 리스트 [{"text": "...", "section": "...", "page": ..., "is_sectioned": bool}]
     """
-    # Recursive Splitter 초기화
-    # separator 우선순위: 단락 > 줄바꿈 > 문장 > 단어
-    # → 날짜(2024.12.31), 약어(Ph.D.)는 자연스럽게 보존됨
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=max_chunk_size,
-        chunk_overlap=overlap_size,
-        separators=[
-            "\n\n",    # 단락 (가장 안전)
-            "\n",      # 줄바꿈
-            ". ",      # 문장 끝
-            "? ",
-            "! ",
-            " ",       # 단어
-            ""         # 최후의 수단
-        ],
-        length_function=len,
-    )
-
-    # 섹션 헤더 감지
-    headers = detect_section_headers(text)
-    chunks = []
-
-    if not headers:
-        # 섹션이 없으면 Recursive로 청킹
-        text_chunks = splitter.split_text(text)
-        for idx, chunk_text in enumerate(text_chunks):
-            chunks.append({
-                'text': chunk_text,
-                'section': f'페이지 {page_num}',
-                'page': page_num,
-                'is_sectioned': False
-            })
+    if (max_chunk_size, overlap_size) == (CHUNK_MAX_CHARS, CHUNK_OVERLAP_CHARS):
+        chunker = get_section_chunker()
     else:
-        # 섹션별로 Recursive 청킹 적용
-        lines = text.split('\n')
+        chunker = SectionChunker(max_chunk_size, overlap_size)
+    return chunker.chunk(text, page_num)
 
-        for i, header in enumerate(headers):
-            section_title = header['title']
-            start_pos = header['position']
-            end_pos = headers[i + 1]['position'] if i + 1 < len(headers) else len(lines)
 
-            # [2025-01-10 suyeon] 헤더 제외 로직 추가
-            # 변경 이유:
-            # 1. 정보 중복 방지: 헤더는 section_label에 이미 저장되므로 텍스트에서 제외
-            # 2. 임베딩 품질 향상: 순수 내용만 임베딩하여 RAG 검색 정확도 향상
-            # 3. 토큰 효율: OpenAI API 비용 절감 (중복 텍스트 제거)
-            # 근거: 헤더는 메타데이터로만 관리하고, 청크 텍스트는 순수 내용만 포함
+# ========================================
+# OpenAI 호출 재시도 (레이트 리밋 대응)
+# ========================================
 
-            # 섹션 내용 추출 (헤더 다음 줄부터 시작)
-            section_lines = lines[start_pos + 1:end_pos]
-            section_text = '\n'.join(section_lines).strip()
+# 재시도해도 되는 일시적 오류 (429, 타임아웃, 연결 오류, 5xx)
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
 
-            if not section_text:
-                continue
 
-            # 섹션을 Recursive로 청킹
-            section_chunks = splitter.split_text(section_text)
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """응답의 retry-after 헤더 (초) 또는 None"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
 
-            for idx, chunk_text in enumerate(section_chunks):
-                # 섹션이 분할된 경우 part 번호 추가
-                if len(section_chunks) > 1:
-                    section_label = f'{section_title} (part {idx+1})'
-                else:
-                    section_label = section_title
 
-                chunks.append({
-                    'text': chunk_text,
-                    'section': section_label,
-                    'page': page_num,
-                    'is_sectioned': True
-                })
+def call_with_backoff(fn: Callable[..., T], *args, max_retries: int = LLM_MAX_RETRIES, **kwargs) -> T:
+    """
+    OpenAI API 호출 + 일시적 오류 시 지수 백오프 재시도
+
+    Feature 추출을 동시에 실행하면 분당 요청/토큰 한도(429)에 걸릴 수 있으므로
+    retry-after 헤더가 있으면 그 값만큼, 없으면 1s, 2s, 4s ... (+jitter) 기다린 뒤 재시도한다.
 
-    # 빈 청크 제거 + 최소 길이 체크
-    MIN_CHUNK_LENGTH = 50
-    chunks = [c for c in chunks if len(c['text'].strip()) >= MIN_CHUNK_LENGTH]
+    Args:
+        fn: 호출할 함수 (예: client.chat.completions.create)
+        max_retries: 최대 재시도 횟수
 
-    return chunks
+    Raises:
+        마지막 시도의 예외 (재시도 불가 오류는 즉시 전파)
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except _RETRYABLE_ERRORS as e:
+            if attempt >= max_retries:
+                raise
+            delay = _retry_after_seconds(e)
+            if delay is None:
+                delay = LLM_BACKOFF_BASE_SECONDS * (2 ** attempt)
+            delay = min(delay, LLM_BACKOFF_MAX_SECONDS) + random.uniform(0, LLM_BACKOFF_BASE_SECONDS)
+            print(f"    ⏳ OpenAI 일시 오류 ({type(e).__name__}) → {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
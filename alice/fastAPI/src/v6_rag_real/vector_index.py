@@ -0,0 +1,207 @@
+"""
+프로세스 내 NumPy 벡터 인덱스 (VECTOR_STORE=numpy)
+
+✅ 핵심 기능: 분석 1회용 RAG 검색을 Chroma 없이 행렬 곱으로 처리
+📌 특징:
+  - state['all_embeddings']를 정규화한 행렬 1개 → 쿼리당 코사인 거리 계산은 행렬-벡터 곱 1회
+  - Chroma Collection.query()와 같은 결과 형식 ({'ids': [[...]], 'distances': [[...]], ...})
+    → extract_features_rag / detect_proposal_templates / prepare_announcement_context 수정 불필요
+  - 거리: 1 - 코사인 유사도 (Chroma "hnsw:space": "cosine"과 동일한 0.0-2.0 범위)
+  - where 필터: {'key': value}, {'key': {'$eq'|'$ne'|'$in'|'$nin': ...}}, {'$and'|'$or': [...]}
+  - 배치 검색: 쿼리 여러 개를 (쿼리 × 청크) 행렬 곱 1회 + 행별 argpartition으로 한 번에 처리
+    → query_batch()로 Feature 전체 검색을 호출 1회로 (Chroma 컬렉션도 동일 API)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def _match_condition(value: Any, condition: Any) -> bool:
+    """메타데이터 값 1개가 조건을 만족하는지"""
+    if not isinstance(condition, dict):
+        return value == condition
+
+    for op, operand in condition.items():
+        if op == '$eq':
+            ok = value == operand
+        elif op == '$ne':
+            ok = value != operand
+        elif op == '$in':
+            ok = value in operand
+        elif op == '$nin':
+            ok = value not in operand
+        else:
+            raise ValueError(f"지원하지 않는 where 연산자: {op}")
+        if not ok:
+            return False
+    return True
+
+
+def _match_where(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """메타데이터가 where 조건 전체를 만족하는지 (Chroma where 문법 부분 집합)"""
+    for key, condition in where.items():
+        if key == '$and':
+            if not all(_match_where(metadata, sub) for sub in condition):
+                return False
+        elif key == '$or':
+            if not any(_match_where(metadata, sub) for sub in condition):
+                return False
+        elif not _match_condition(metadata.get(key), condition):
+            return False
+    return True
+
+
+class NumpyVectorIndex:
+    """
+    정규화 임베딩 행렬 기반 코사인 검색 인덱스
+
+    Args:
+        name: 인덱스 이름 (컬렉션 이름과 같은 용도, 로그/정리용)
+        ids: 청크 ID 리스트
+        embeddings: (N, D) 임베딩 행렬
+        documents: 청크 텍스트 리스트
+        metadatas: 청크 메타데이터 리스트
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ids: Sequence[str],
+        embeddings: np.ndarray,
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]]
+    ):
+        self.name = name
+        self.metadata: Dict[str, Any] = {}
+        self._ids = list(ids)
+        self._documents = list(documents)
+        self._metadatas = list(metadatas)
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(self._ids), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._matrix = matrix / norms
+
+        # 자주 쓰는 필터 (파일명 / 문서 타입) → 행 번호 미리 계산
+        self._rows_by_field: Dict[str, Dict[Any, np.ndarray]] = {}
+        for field in ('file_name', 'document_type'):
+            rows: Dict[Any, List[int]] = {}
+            for i, metadata in enumerate(self._metadatas):
+                rows.setdefault(metadata.get(field), []).append(i)
+            self._rows_by_field[field] = {value: np.array(idx, dtype=np.intp) for value, idx in rows.items()}
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def _filter_rows(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """where 조건을 만족하는 행 번호 (조건 없으면 None = 전체)"""
+        if not where:
+            return None
+
+        if len(where) == 1:
+            (key, condition), = where.items()
+            if key in self._rows_by_field and not isinstance(condition, dict):
+                return self._rows_by_field[key].get(condition, np.empty(0, dtype=np.intp))
+
+        return np.array(
+            [i for i, metadata in enumerate(self._metadatas) if _match_where(metadata, where)],
+            dtype=np.intp
+        )
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ('documents', 'metadatas', 'distances')
+    ) -> Dict[str, List[List[Any]]]:
+        """
+        코사인 거리 기준 상위 n_results개 검색 (Chroma Collection.query와 같은 결과 형식)
+
+        Args:
+            query_embeddings: 쿼리 임베딩 리스트 (쿼리마다 결과 리스트 1개)
+            n_results: 쿼리당 결과 수
+            where: 메타데이터 필터
+
+        Returns:
+            {'ids': [[...]], 'distances': [[...]], 'documents': [[...]], 'metadatas': [[...]]}
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[np.newaxis, :]
+        query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        query_norms[query_norms == 0] = 1.0
+        queries = queries / query_norms
+
+        rows = self._filter_rows(where)
+        matrix = self._matrix if rows is None else self._matrix[rows]
+
+        results: Dict[str, List[List[Any]]] = {'ids': []}
+        for field in ('distances', 'documents', 'metadatas'):
+            if field in include:
+                results[field] = []
+
+        k = min(n_results, matrix.shape[0])
+        if k:
+            # (쿼리 × 청크) 거리 행렬 → 행별 상위 k개 (argpartition 후 k개만 정렬)
+            distances = 1.0 - queries @ matrix.T
+            if k < matrix.shape[0]:
+                top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(k), (len(queries), k))
+            top_distances = np.take_along_axis(distances, top, axis=1)
+            order = np.argsort(top_distances, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+            top_distances = np.take_along_axis(top_distances, order, axis=1)
+        else:
+            top = np.empty((len(queries), 0), dtype=np.intp)
+            top_distances = np.empty((len(queries), 0), dtype=np.float32)
+
+        for top_rows, query_distances in zip(top, top_distances):
+            chunk_rows = top_rows if rows is None else rows[top_rows]
+
+            results['ids'].append([self._ids[i] for i in chunk_rows])
+            if 'distances' in results:
+                results['distances'].append(query_distances.tolist())
+            if 'documents' in results:
+                results['documents'].append([self._documents[i] for i in chunk_rows])
+            if 'metadatas' in results:
+                results['metadatas'].append([self._metadatas[i] for i in chunk_rows])
+
+        return results
+
+
+def query_batch(
+    collection: Any,
+    query_embeddings: Sequence[Sequence[float]],
+    n_results: int = 10,
+    where: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, List[List[Any]]]]:
+    """
+    쿼리 여러 개를 검색 호출 1회로 처리하고 쿼리별 결과로 분리
+
+    Args:
+        collection: Chroma 컬렉션 또는 NumpyVectorIndex
+        query_embeddings: 쿼리 임베딩 리스트
+
+    Returns:
+        쿼리별 결과 리스트 (각각 단일 쿼리 Collection.query()와 같은 형식:
+        {'ids': [[...]], 'distances': [[...]], 'documents': [[...]], 'metadatas': [[...]]})
+    """
+    if len(query_embeddings) == 0:
+        return []
+
+    results = collection.query(
+        query_embeddings=np.asarray(query_embeddings, dtype=np.float32),
+        n_results=n_results,
+        where=where
+    )
+
+    fields = [field for field in ('ids', 'distances', 'documents', 'metadatas') if results.get(field) is not None]
+    return [
+        {field: [results[field][i]] for field in fields}
+        for i in range(len(query_embeddings))
+    ]
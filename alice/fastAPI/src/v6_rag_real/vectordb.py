@@ -0,0 +1,188 @@
+"""
+Chroma VectorDB 클라이언트 관리
+
+✅ 핵심 기능: 프로세스 단위 Chroma 클라이언트 재사용 + 컬렉션 생명주기 락
+📌 특징:
+  - 클라이언트 레지스트리: (모드, 경로)별 클라이언트 1개만 생성 (요청마다 SQLite 재오픈 방지)
+  - 컬렉션별 락: 같은 프로젝트를 동시에 분석해도 삭제/생성/저장이 섞이지 않음
+  - 프로젝트 분석 락 (persistent 모드): 같은 프로젝트 분석은 그래프 실행 전체를 직렬화
+    (컬렉션 저장 이후 Feature/양식/목차 노드가 검색하는 동안 다른 분석이 컬렉션을 재구축하거나 청크를 삭제하지 않음)
+  - VECTOR_DB_MODE
+      persistent: ./chroma_db에 저장 (기존 동작)
+      memory: EphemeralClient 사용, 분석마다 고유 컬렉션 생성 후 분석 종료 시 삭제
+              (컬렉션 이름은 분석 시작 전에 state['vector_collection_name']에 정해 두므로 실패해도 이름으로 삭제)
+  - 증분 재분석 (persistent + VECTOR_DB_INCREMENTAL): 기존 컬렉션을 재사용하고
+    청크 ID(문서 내용 기반) 차이만 추가/삭제, index_version(버전 + 청킹 설정)이 다르면 전체 재구축
+"""
+
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+import chromadb
+
+from .config import (
+    VECTOR_STORE,
+    VECTOR_DB_MODE,
+    VECTOR_DB_DIR,
+    VECTOR_DB_INCREMENTAL,
+    VECTOR_INDEX_VERSION,
+    STRIP_REPEATED_PAGE_LINES,
+)
+from .utils import get_section_chunker
+
+_clients: Dict[Tuple[str, str], Any] = {}
+_clients_lock = threading.Lock()
+
+_collection_locks: Dict[str, threading.Lock] = {}
+_collection_locks_lock = threading.Lock()
+
+_project_locks: Dict[str, threading.Lock] = {}
+
+
+def get_chroma_client(mode: str = VECTOR_DB_MODE, path: Path = VECTOR_DB_DIR):
+    """
+    Chroma 클라이언트 조회 (없으면 생성 후 레지스트리에 등록)
+
+    Args:
+        mode: "persistent" 또는 "memory"
+        path: persistent 모드 저장 경로
+    """
+    key = (mode, str(Path(path).absolute()) if mode == 'persistent' else '')
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if mode == 'memory':
+                client = chromadb.EphemeralClient()
+            else:
+                Path(path).mkdir(parents=True, exist_ok=True)
+                client = chromadb.PersistentClient(path=str(path))
+            _clients[key] = client
+        return client
+
+
+def collection_lock(name: str) -> threading.Lock:
+    """컬렉션 이름별 락 (삭제 → 생성 → 저장을 한 단위로 보호)"""
+    with _collection_locks_lock:
+        return _collection_locks.setdefault(name, threading.Lock())
+
+
+@contextmanager
+def project_analysis_lock(project_idx: int, mode: str = VECTOR_DB_MODE) -> Iterator[None]:
+    """
+    같은 프로젝트 분석 직렬화 (그래프 실행 전체를 감싸서 사용)
+
+    persistent 모드는 프로젝트 컬렉션 1개를 공유하므로, 앞선 분석이 마지막 검색 노드를 마칠 때까지
+    다음 분석의 컬렉션 재구축/stale 청크 삭제를 미룬다.
+    memory 모드와 NumPy 인덱스는 분석마다 고유 인덱스라서 잠그지 않음
+    """
+    if mode == 'memory' or VECTOR_STORE != 'chroma':
+        yield
+        return
+
+    name = project_collection_name(project_idx, mode)
+    with _collection_locks_lock:
+        lock = _project_locks.setdefault(name, threading.Lock())
+    with lock:
+        yield
+
+
+def project_collection_name(project_idx: int, mode: str = VECTOR_DB_MODE) -> str:
+    """프로젝트 컬렉션 이름 (memory 모드는 분석마다 고유 이름)"""
+    name = f"project_{project_idx}"
+    if mode == 'memory':
+        name = f"{name}_{uuid.uuid4().hex[:8]}"
+    return name
+
+
+def recreate_collection(client, name: str, metadata: Dict[str, Any]):
+    """
+    기존 컬렉션 삭제 후 새로 생성 (재실행 시 중복 방지)
+
+    호출 측에서 collection_lock(name)을 잡고 호출해야 함
+    """
+    try:
+        client.delete_collection(name=name)
+        print(f"  🗑️  기존 컬렉션 삭제: {name}")
+    except Exception:
+        pass
+
+    return client.create_collection(name=name, metadata=metadata)
+
+
+def incremental_enabled(mode: str = VECTOR_DB_MODE) -> bool:
+    """증분 재분석 사용 여부 (memory 모드/NumPy 인덱스는 분석마다 새로 만들므로 불가)"""
+    return VECTOR_DB_INCREMENTAL and mode != 'memory' and VECTOR_STORE == 'chroma'
+
+
+def current_index_version() -> str:
+    """컬렉션 index_version: VECTOR_INDEX_VERSION + 청킹/텍스트 정리 설정 (바뀌면 재구축)"""
+    strip = 'strip' if STRIP_REPEATED_PAGE_LINES else 'raw'
+    return f"{VECTOR_INDEX_VERSION}|{get_section_chunker().signature}|{strip}"
+
+
+def _get_current_collection(client, name: str):
+    """index_version이 현재 버전과 같은 기존 컬렉션 (없거나 버전이 다르면 None)"""
+    try:
+        collection = client.get_collection(name=name)
+    except Exception:
+        return None
+    if (collection.metadata or {}).get('index_version') != current_index_version():
+        return None
+    return collection
+
+
+def open_project_collection(client, name: str, metadata: Dict[str, Any]) -> Tuple[Any, bool]:
+    """
+    프로젝트 컬렉션 열기 (증분 모드면 기존 컬렉션 재사용, 아니면 재생성)
+
+    호출 측에서 collection_lock(name)을 잡고 호출해야 함
+
+    Returns:
+        (컬렉션, 기존 컬렉션 재사용 여부)
+    """
+    if incremental_enabled():
+        collection = _get_current_collection(client, name)
+        if collection is not None:
+            return collection, True
+
+    metadata = {**metadata, 'index_version': current_index_version()}
+    return recreate_collection(client, name, metadata), False
+
+
+def stored_chunk_ids(project_idx: int) -> Set[str]:
+    """
+    증분 모드에서 이미 저장된 프로젝트 청크 ID (임베딩 생략 대상)
+
+    증분 모드가 아니거나 컬렉션이 없거나 index_version이 다르면 빈 집합
+    """
+    if not incremental_enabled():
+        return set()
+
+    name = project_collection_name(project_idx)
+    with collection_lock(name):
+        collection = _get_current_collection(get_chroma_client(), name)
+        if collection is None:
+            return set()
+        return set(collection.get(include=[])['ids'])
+
+
+def release_collection(name: Optional[str], mode: str = VECTOR_DB_MODE) -> None:
+    """
+    memory 모드 컬렉션 삭제 (분석 종료 시, persistent 모드는 유지)
+
+    Args:
+        name: state['vector_collection_name'] (분석이 실패해 컬렉션 객체가 없어도 이름으로 삭제)
+    """
+    if mode != 'memory' or not name:
+        return
+
+    with collection_lock(name):
+        try:
+            get_chroma_client(mode).delete_collection(name=name)
+        except Exception:
+            pass
+    with _collection_locks_lock:
+        _collection_locks.pop(name, None)